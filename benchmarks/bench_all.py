@@ -0,0 +1,77 @@
+#!/usr/bin/python3
+"""Measures the console all command on a large store.
+
+Usage: python3 -m benchmarks.bench_all [number of objects]
+
+Compares the former all, which printed one list of every __str__(),
+with the streamed all: time to the first line, total time and peak
+memory (tracemalloc), for the whole of Review and for limit=10.
+"""
+import contextlib
+import io
+import sys
+import time
+import tracemalloc
+import models
+from benchmarks.dataset import populate
+from console import HBNBCommand
+from models.engine.file_storage import FileStorage
+
+
+class FirstLine(io.StringIO):
+    """A StringIO that keeps the time of its first write, and drops
+    what is written to keep the memory of the output out of the
+    measure."""
+
+    def __init__(self):
+        super().__init__()
+        self.first = None
+
+    def write(self, text):
+        if self.first is None:
+            self.first = time.perf_counter()
+        return len(text)
+
+
+def listed(arg):
+    """Prints the objects as all did before it was streamed."""
+    objs = models.storage.all(arg)
+    print([obj.__str__() for obj in objs.values()])
+
+
+def measure(func):
+    """Returns the first line, total seconds and peak MiB of func()."""
+    output = FirstLine()
+    tracemalloc.start()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(output):
+        func()
+    end = time.perf_counter()
+    peak = tracemalloc.get_traced_memory()[1] / 2 ** 20
+    tracemalloc.stop()
+    return output.first - start, end - start, peak
+
+
+def main(n):
+    """
+    Runs the benchmark with a dataset of about n objects.
+
+    :param n: The number of objects.
+    """
+    FileStorage._FileStorage__objects = {}
+    populate(n)
+    console = HBNBCommand()
+    print(f"{models.storage.count('Review')} reviews")
+    print(f"{'':22} {'first line (s)':>14} {'total (s)':>10} "
+          f"{'peak (MiB)':>10}")
+    for name, func in (("list", lambda: listed("Review")),
+                       ("all Review", lambda: console.onecmd("all Review")),
+                       ("all Review limit=10",
+                        lambda: console.onecmd("all Review limit=10"))):
+        first, total, peak = measure(func)
+        print(f"{name:22} {first:14.4f} {total:10.3f} {peak:10.2f}")
+    FileStorage._FileStorage__objects = {}
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
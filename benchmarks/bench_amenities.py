@@ -0,0 +1,52 @@
+#!/usr/bin/python3
+"""Compares amenity filters over lists with the bitmap index.
+
+Usage: python3 -m benchmarks.bench_amenities [number of places]
+
+Gives every place a random subset of 30 amenities and times "places
+having wifi AND tv AND pets" as a scan of amenity_ids and as an
+intersection of the bitmaps of AmenityIndex.
+"""
+import random
+import sys
+import models
+from benchmarks.dataset import timed
+from models.amenity import Amenity
+from models.engine.amenities import AmenityIndex
+from models.engine.file_storage import FileStorage
+from models.place import Place
+
+
+def main(n):
+    """
+    Runs the benchmark with n places.
+
+    :param n: The number of places.
+    """
+    rand = random.Random(0)
+    FileStorage._FileStorage__objects = {}
+    amenities = [Amenity().id for i in range(30)]
+    weights = [0.9 / (i + 1) for i in range(30)]
+    for i in range(n):
+        place = Place()
+        place.amenity_ids = [a for a, w in zip(amenities, weights)
+                             if rand.random() < w]
+    index = models.storage.index(AmenityIndex)
+    build = timed(index.refresh)
+    print(f"{n} places, index built in {build * 1000:.1f} ms")
+    places = list(models.storage.all(Place).values())
+    for wanted in (amenities[:2], amenities[:3], amenities[5:8]):
+        scan = []
+        scanned = timed(lambda: scan.extend(
+            p.id for p in places if all(a in p.amenity_ids for a in wanted)))
+        found = []
+        indexed = timed(lambda: found.extend(index.ids(*wanted)))
+        assert sorted(scan) == sorted(found)
+        print(f"{len(wanted)} amenities, {len(found):6} places: scan "
+              f"{scanned * 1000:8.2f} ms, bitmaps {indexed * 1000:8.2f} ms")
+    models.storage.remove_index(index)
+    FileStorage._FileStorage__objects = {}
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200000)
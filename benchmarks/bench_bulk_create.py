@@ -0,0 +1,53 @@
+#!/usr/bin/python3
+"""Measures the creation of many users in the console.
+
+Usage: python3 -m benchmarks.bench_bulk_create [number of users]
+
+Compares n "create User" commands followed by one save, and
+"create User count=<n> {...}", which builds the users in batches with
+new ids from models.engine.bulk, stores them with storage.bulk_new()
+and saves once.
+"""
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import models
+from benchmarks.dataset import timed
+from console import HBNBCommand
+from models.engine.file_storage import FileStorage
+
+
+def main(n):
+    """
+    Runs the benchmark with n users.
+
+    :param n: The number of users.
+    """
+    file_path = FileStorage._FileStorage__file_path
+    console = HBNBCommand()
+
+    def one_by_one():
+        for i in range(n):
+            console.onecmd("create User")
+        models.storage.save()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        FileStorage._FileStorage__file_path = os.path.join(tmpdir,
+                                                           "file.json")
+        with contextlib.redirect_stdout(io.StringIO()):
+            FileStorage._FileStorage__objects = {}
+            old = timed(one_by_one)
+            FileStorage._FileStorage__objects = {}
+            new = timed(lambda: console.onecmd(
+                f'create User count={n} {{"first_name": "x"}}'))
+    print(f"create User x {n}: {n / old:10,.0f} objects/s")
+    print(f"create User count={n}: {n / new:10,.0f} objects/s "
+          f"({old / new:.1f}x)")
+    FileStorage._FileStorage__file_path = file_path
+    FileStorage._FileStorage__objects = {}
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
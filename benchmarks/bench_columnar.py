@@ -0,0 +1,48 @@
+#!/usr/bin/python3
+"""Compares filtering places in Python with the columnar store.
+
+Usage: python3 -m benchmarks.bench_columnar [number of objects]
+
+Runs "price between 100 and 200 with at least 3 rooms" as a loop over
+the instances and as a ColumnStore query, after the store is built.
+"""
+import sys
+import models
+from benchmarks.dataset import populate, timed
+from models.engine.columnar import ColumnStore
+from models.engine.file_storage import FileStorage
+from models.place import Place
+
+
+def scan():
+    """Returns the ids of the matching places, with a Python loop."""
+    return [obj.id for obj in models.storage.all(Place).values()
+            if 100 <= obj.price_by_night <= 200 and obj.number_rooms >= 3]
+
+
+def main(n):
+    """
+    Runs the benchmark with a dataset of about n objects.
+
+    :param n: The number of objects.
+    """
+    FileStorage._FileStorage__objects = {}
+    populate(n)
+    columns = ColumnStore(models.storage)
+    models.storage.add_index(columns)
+    build = timed(columns.refresh)
+    found = []
+    loop = timed(lambda: found.append(scan()))
+    vector = timed(lambda: found.append(columns.ids(
+        price_by_night=(100, 200), number_rooms=(3, None))))
+    assert sorted(found[0]) == sorted(found[1])
+    print(f"{models.storage.count(Place)} places, {len(found[0])} matches")
+    print(f"build the store {build * 1000:10.1f} ms")
+    print(f"python loop     {loop * 1000:10.1f} ms")
+    print(f"column store    {vector * 1000:10.1f} ms")
+    models.storage.remove_index(columns)
+    FileStorage._FileStorage__objects = {}
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500000)
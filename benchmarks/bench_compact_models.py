@@ -0,0 +1,84 @@
+#!/usr/bin/python3
+"""Measures the memory taken by model instances and compact instances.
+
+Usage: python3 -m benchmarks.bench_compact_models [objects]
+
+Decodes the same JSON records into model instances and into the
+__slots__ classes of models.compact, as reload() does, and reports the
+bytes per object that remain allocated once the records are dropped,
+as traced by tracemalloc.
+"""
+import json
+import sys
+import tracemalloc
+from datetime import datetime
+from uuid import uuid4
+from models.compact import compact_classes
+from models.engine.file_storage import FileStorage
+
+samples = {"User": {"email": "user{}@hbnb.io", "password": "pwd",
+                    "first_name": "Betty", "last_name": "Holberton"},
+           "City": {"state_id": "{}", "name": "San Francisco"},
+           "Place": {"city_id": "{}", "user_id": "{}", "name": "Loft",
+                     "description": "A loft", "number_rooms": 2,
+                     "number_bathrooms": 1, "max_guest": 4,
+                     "price_by_night": 120, "latitude": 37.77,
+                     "longitude": -122.41, "amenity_ids": []},
+           "Review": {"place_id": "{}", "user_id": "{}",
+                      "text": "Great place"}}
+
+
+def records(cls_name, n):
+    """
+    Returns n to_dict() records of cls_name, without __class__, as a
+    JSON document.
+
+    :param cls_name: A class name of samples.
+    :param n: The number of records.
+    """
+    now = datetime.now().isoformat()
+    result = []
+    for i in range(n):
+        record = {"id": str(uuid4()), "created_at": now, "updated_at": now}
+        for name, value in samples[cls_name].items():
+            record[name] = value.format(i) if type(value) is str else value
+        result.append(record)
+    return json.dumps(result)
+
+
+def measure(cls, text):
+    """
+    Returns the bytes allocated per instance of cls built from text.
+
+    :param cls: The class to instantiate.
+    :param text: The JSON document of the records.
+    """
+    tracemalloc.start()
+    records = json.loads(text)
+    objs = [cls(**record) for record in records]
+    del records
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return size / len(objs)
+
+
+def main(n):
+    """
+    Runs the benchmark.
+
+    :param n: The number of objects of each class.
+    """
+    storage = FileStorage()
+    compact = compact_classes(storage.classes(), storage.attributes())
+    print(f"{n} objects per class, bytes per object")
+    print(f"{'class':8} {'model':>8} {'compact':>8} {'saved':>6}")
+    for cls_name in samples:
+        data = records(cls_name, n)
+        model = measure(storage.classes()[cls_name], data)
+        slotted = measure(compact[cls_name], data)
+        print(f"{cls_name:8} {model:8.0f} {slotted:8.0f} "
+              f"{1 - slotted / model:6.0%}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10000)
@@ -0,0 +1,56 @@
+#!/usr/bin/python3
+"""Measures the save latency of each FileStorage durability level.
+
+Usage: python3 -m benchmarks.bench_durability [objects] [saves]
+
+Updates one object and saves, in snapshot and journal mode, and
+reports the mean and worst latency of a save for each level.
+"""
+import os
+import sys
+import tempfile
+import models
+from benchmarks.dataset import timed
+from models.base_model import BaseModel
+from models.engine.file_storage import FileStorage
+
+
+def main(n, saves):
+    """
+    Runs the benchmark.
+
+    :param n: The number of objects in the store.
+    :param saves: The number of saves timed for each setting.
+    """
+    file_path = FileStorage._FileStorage__file_path
+    options = dict(FileStorage._FileStorage__options)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        FileStorage._FileStorage__file_path = os.path.join(tmpdir,
+                                                           "file.json")
+        FileStorage._FileStorage__objects = {}
+        objs = [BaseModel() for i in range(n)]
+        print(f"{n} objects, {saves} saves of one updated object")
+        print(f"{'mode':9} {'durability':10} {'mean (ms)':>10} "
+              f"{'max (ms)':>10}")
+        for journal in (False, True):
+            for durability in ("none", "flush", "always"):
+                models.storage.configure(journal=journal,
+                                         journal_limit=saves + 1,
+                                         durability=durability)
+                FileStorage._FileStorage__journal_size = None
+                models.storage.save()
+                latencies = []
+                for i in range(saves):
+                    objs[i % n].number = i
+                    latencies.append(timed(models.storage.save))
+                mode = "journal" if journal else "snapshot"
+                print(f"{mode:9} {durability:10} "
+                      f"{sum(latencies) / saves * 1000:10.3f} "
+                      f"{max(latencies) * 1000:10.3f}")
+    FileStorage._FileStorage__file_path = file_path
+    FileStorage._FileStorage__options = options
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10000,
+         int(sys.argv[2]) if len(sys.argv) > 2 else 100)
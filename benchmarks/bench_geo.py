@@ -0,0 +1,55 @@
+#!/usr/bin/python3
+"""Measures the latency of the geo index queries.
+
+Usage: python3 -m benchmarks.bench_geo [number of places] [queries]
+
+Spreads places over the globe, with a dense cluster around a city,
+and reports the mean time of nearby() and nearest() around random
+points of the cluster, compared with a scan of every place.
+"""
+import random
+import sys
+import models
+from benchmarks.dataset import timed
+from models.engine.file_storage import FileStorage
+from models.engine.geo import GeoIndex, distance_km
+from models.place import Place
+
+
+def main(n, queries):
+    """
+    Runs the benchmark.
+
+    :param n: The number of places.
+    :param queries: The number of queries timed for each method.
+    """
+    rand = random.Random(0)
+    FileStorage._FileStorage__objects = {}
+    for i in range(n):
+        place = Place()
+        if i % 2:
+            place.latitude = rand.uniform(-80, 80)
+            place.longitude = rand.uniform(-180, 180)
+        else:
+            place.latitude = rand.gauss(48.86, 0.5)
+            place.longitude = rand.gauss(2.35, 0.5)
+    geo = models.storage.index(GeoIndex)
+    build = timed(geo.refresh)
+    print(f"{n} places, index built in {build * 1000:.1f} ms")
+    points = [(rand.gauss(48.86, 0.5), rand.gauss(2.35, 0.5))
+              for i in range(queries)]
+    for name, query in (("nearby 2 km", lambda p: geo.search(*p, 2)),
+                        ("nearest 10", lambda p: geo.nearest_keys(*p, 10))):
+        elapsed = timed(lambda: [query(point) for point in points])
+        print(f"{name:12} {elapsed / queries * 1000:8.3f} ms/query")
+    places = list(models.storage.all(Place).values())
+    scan = timed(lambda: [p for p in places if distance_km(
+        *points[0], p.latitude, p.longitude) <= 2])
+    print(f"{'full scan':12} {scan * 1000:8.3f} ms/query")
+    models.storage.remove_index(geo)
+    FileStorage._FileStorage__objects = {}
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200000,
+         int(sys.argv[2]) if len(sys.argv) > 2 else 1000)
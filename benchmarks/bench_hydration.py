@@ -0,0 +1,68 @@
+#!/usr/bin/python3
+"""Measures how fast reload() builds instances from their records.
+
+Usage: python3 -m benchmarks.bench_hydration [number of objects]
+
+Compares building every record with cls(**record), which runs
+BaseModel.__init__, and with cls.from_dict(record), the path reload()
+takes, then times a whole reload(). Rates are in objects per second.
+"""
+import gc
+import json
+import os
+import sys
+import tempfile
+import models
+from benchmarks.dataset import populate, timed
+from models.engine.file_storage import FileStorage
+
+
+def main(n):
+    """
+    Runs the benchmark with a dataset of about n objects.
+
+    :param n: The number of objects.
+    """
+    file_path = FileStorage._FileStorage__file_path
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, "file.json")
+        FileStorage._FileStorage__file_path = path
+        FileStorage._FileStorage__objects = {}
+        populate(n)
+        models.storage.save()
+        classes = models.storage.classes()
+        with open(path) as f:
+            records = list(json.load(f).values())
+        count = len(records)
+        print(f"{count} objects")
+
+        def construct():
+            for o in records:
+                o = dict(o)
+                classes[o.pop("__class__")](**o)
+
+        def from_dict():
+            for o in records:
+                o = dict(o)
+                classes[o["__class__"]].from_dict(o)
+
+        def copy():
+            for o in records:
+                dict(o)
+
+        baseline = timed(copy)
+        old = count / (timed(construct) - baseline)
+        new = count / (timed(from_dict) - baseline)
+        print(f"cls(**record):        {old:12,.0f} objects/s")
+        print(f"cls.from_dict(record): {new:11,.0f} objects/s "
+              f"({new / old:.1f}x)")
+        FileStorage._FileStorage__objects = {}
+        gc.collect()
+        reload = count / timed(models.storage.reload)
+        print(f"reload():             {reload:12,.0f} objects/s")
+    FileStorage._FileStorage__file_path = file_path
+    FileStorage._FileStorage__objects = {}
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
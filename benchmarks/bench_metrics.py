@@ -0,0 +1,54 @@
+#!/usr/bin/python3
+"""Measures the overhead of the storage metrics.
+
+Usage: python3 -m benchmarks.bench_metrics [number of objects]
+
+Times BaseModel.to_dict() unwrapped, with the metrics off and on, then
+save() and reload() of the dataset with the metrics off and on.
+"""
+import os
+import sys
+import tempfile
+import models
+from benchmarks.dataset import populate, timed
+from models.base_model import BaseModel
+from models.engine.file_storage import FileStorage
+
+
+def main(n):
+    """
+    Runs the benchmark with a dataset of about n objects.
+
+    :param n: The number of objects.
+    """
+    file_path = FileStorage._FileStorage__file_path
+    with tempfile.TemporaryDirectory() as tmpdir:
+        FileStorage._FileStorage__file_path = os.path.join(tmpdir,
+                                                           "file.json")
+        FileStorage._FileStorage__objects = {}
+        populate(n)
+        objs = list(models.storage.all().values())
+        unwrapped = BaseModel.to_dict.__wrapped__
+        base = timed(lambda: [unwrapped(obj) for obj in objs])
+        print(f"{len(objs)} objects")
+        print(f"{'':12} {'to_dict (s)':>12} {'save (s)':>10} "
+              f"{'reload (s)':>10}")
+        print(f"{'unwrapped':12} {base:12.3f}")
+        for enabled in (False, True):
+            models.storage.configure(metrics=enabled)
+            to_dict = timed(lambda: [obj.to_dict() for obj in objs])
+            FileStorage._FileStorage__journal_size = None
+            save = timed(models.storage.save)
+            FileStorage._FileStorage__objects = {}
+            reload = timed(models.storage.reload)
+            print(f"{'metrics ' + ('on' if enabled else 'off'):12} "
+                  f"{to_dict:12.3f} {save:10.3f} {reload:10.3f}")
+            objs = list(models.storage.all().values())
+        models.storage.configure(metrics=False)
+        models.storage.reset_stats()
+    FileStorage._FileStorage__file_path = file_path
+    FileStorage._FileStorage__objects = {}
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
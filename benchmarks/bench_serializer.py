@@ -0,0 +1,75 @@
+#!/usr/bin/python3
+"""Compares the JSON save of FileStorage with the previous one.
+
+Usage: python3 -m benchmarks.bench_serializer [number of objects]
+
+The previous save built {key: obj.to_dict()} for every object, then
+called json.dump; save() now streams the text of each object from the
+per-class serializers of models.engine.serializer. Reports the time
+and the peak memory allocated by each, as traced by tracemalloc.
+"""
+import json
+import os
+import sys
+import tempfile
+import tracemalloc
+import models
+from benchmarks.dataset import populate, timed
+from models.engine.file_storage import FileStorage
+
+
+def dict_save(path):
+    """Writes every object as the previous save() did."""
+    objs = models.storage.all()
+    with open(path, "w") as f:
+        json.dump({key: obj.to_dict() for key, obj in objs.items()}, f)
+
+
+def stream_save(path):
+    """Writes every object with save()."""
+    FileStorage._FileStorage__journal_size = None
+    models.storage.save()
+
+
+def measure(func, path):
+    """
+    Returns the seconds func(path) takes and the peak bytes it
+    allocates.
+    """
+    seconds = timed(lambda: func(path))
+    tracemalloc.start()
+    func(path)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return seconds, peak
+
+
+def main(n):
+    """
+    Runs the benchmark with a dataset of about n objects.
+
+    :param n: The number of objects.
+    """
+    file_path = FileStorage._FileStorage__file_path
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, "file.json")
+        FileStorage._FileStorage__file_path = path
+        FileStorage._FileStorage__objects = {}
+        populate(n)
+        print(f"{models.storage.count()} objects")
+        print(f"{'save':10} {'time (s)':>10} {'peak (MiB)':>12}")
+        for name, func in (("to_dict", dict_save),
+                           ("streamed", stream_save)):
+            seconds, peak = measure(func, path)
+            print(f"{name:10} {seconds:10.3f} {peak / (1 << 20):12.1f}")
+        with open(path) as f:
+            streamed = json.load(f)
+        dict_save(path)
+        with open(path) as f:
+            assert streamed == json.load(f)
+    FileStorage._FileStorage__file_path = file_path
+    FileStorage._FileStorage__objects = {}
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
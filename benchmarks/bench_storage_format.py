@@ -0,0 +1,44 @@
+#!/usr/bin/python3
+"""Compares the JSON and binary formats of FileStorage.
+
+Usage: python3 -m benchmarks.bench_storage_format [number of objects]
+
+Times save() and reload() in both formats and reports the file size.
+"""
+import os
+import sys
+import tempfile
+import models
+from benchmarks.dataset import populate, timed
+from models.engine.file_storage import FileStorage
+
+
+def main(n):
+    """
+    Runs the benchmark with a dataset of about n objects.
+
+    :param n: The number of objects.
+    """
+    file_path = FileStorage._FileStorage__file_path
+    with tempfile.TemporaryDirectory() as tmpdir:
+        FileStorage._FileStorage__file_path = os.path.join(tmpdir,
+                                                           "file.json")
+        FileStorage._FileStorage__objects = {}
+        populate(n)
+        count = models.storage.count()
+        print(f"{count} objects")
+        print(f"{'format':8} {'save (s)':>10} {'reload (s)':>10} "
+              f"{'size (bytes)':>14}")
+        for fmt, ext in (("json", ".json"), ("binary", ".bin")):
+            models.storage.configure(format=fmt)
+            FileStorage._FileStorage__journal_size = None
+            save = timed(models.storage.save)
+            size = os.path.getsize(os.path.join(tmpdir, "file" + ext))
+            FileStorage._FileStorage__objects = {}
+            reload = timed(models.storage.reload)
+            print(f"{fmt:8} {save:10.3f} {reload:10.3f} {size:14d}")
+    FileStorage._FileStorage__file_path = file_path
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
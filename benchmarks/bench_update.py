@@ -0,0 +1,89 @@
+#!/usr/bin/python3
+"""Measures the throughput of Place.update(<id>, {...}) in the console.
+
+Usage: python3 -m benchmarks.bench_update [number of updates]
+
+First compares the payload handling alone: the previous eval() of the
+dictionary with types guessed from the class attributes, and
+parse_literal() with the coercion table of models.engine.coercion.
+Then runs whole update commands through HBNBCommand.onecmd(), with the
+journal on so that each save only appends the changed place.
+"""
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import models
+from benchmarks.dataset import timed
+from console import HBNBCommand
+from models.engine.coercion import compile_coercions, parse_literal
+from models.engine.file_storage import FileStorage
+from models.place import Place
+
+payload = ('{"name": "Loft", "number_rooms": "3", "max_guest": 4, '
+           '"price_by_night": "120", "latitude": 37.7, '
+           '"amenity_ids": ["a", "b"], "note": "quiet"}')
+
+
+def legacy(cls, text):
+    """Converts a payload as do_update used to, with its three eval()."""
+    result = {}
+    eval(text)
+    if type(eval(text)) != dict:
+        return result
+    for k, v in eval(text).items():
+        if (k in cls.__dict__.keys() and
+                type(cls.__dict__[k]) in {str, int, float}):
+            v = type(cls.__dict__[k])(v)
+        result[k] = v
+    return result
+
+
+def compiled(coercions, text):
+    """Converts a payload as do_update does."""
+    result = parse_literal(text)
+    for k, v in result.items():
+        if k in coercions:
+            result[k] = coercions[k](v)
+    return result
+
+
+def rate(n, func):
+    """Returns the number of calls of func() per second."""
+    return n / timed(lambda: [func() for i in range(n)])
+
+
+def main(n):
+    """
+    Runs the benchmark with n updates.
+
+    :param n: The number of updates.
+    """
+    coercions = compile_coercions(models.storage.attributes())["Place"]
+    old = rate(n, lambda: legacy(Place, payload))
+    new = rate(n, lambda: compiled(coercions, payload))
+    print(f"payload eval():          {old:10,.0f} /s")
+    print(f"payload parse_literal(): {new:10,.0f} /s ({new / old:.1f}x)")
+    file_path = FileStorage._FileStorage__file_path
+    options = dict(FileStorage._FileStorage__options)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        FileStorage._FileStorage__file_path = os.path.join(tmpdir,
+                                                           "file.json")
+        FileStorage._FileStorage__objects = {}
+        models.storage.configure(journal=True, journal_limit=n + 1,
+                                 durability="none")
+        place = Place()
+        models.storage.save()
+        console = HBNBCommand()
+        line = f'Place.update("{place.id}", {payload})'
+        with contextlib.redirect_stdout(io.StringIO()):
+            commands = rate(n, lambda: console.onecmd(line))
+        print(f"Place.update(id, {{...}}): {commands:8,.0f} updates/s")
+    FileStorage._FileStorage__options = options
+    FileStorage._FileStorage__file_path = file_path
+    FileStorage._FileStorage__objects = {}
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10000)
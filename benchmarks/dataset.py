@@ -0,0 +1,203 @@
+#!/usr/bin/python3
+"""Generates synthetic, referentially consistent datasets.
+
+Usage: python3 -m benchmarks.dataset <number of objects> [file path]
+
+generate(n) builds about n objects in the proportions of a real site:
+for every state 10 cities, 500 users, 1250 places and 3250 reviews,
+plus up to 200 amenities, with at least one object of each class.
+Every city_id, state_id, user_id, place_id and amenity id points to an
+object of the dataset, places are spread around the location of their
+city, and the timestamps of an object never precede those of the
+objects it refers to. The same n and seed
+always give the same attribute values; the ids are random.
+
+Given a file path, the dataset is saved there with FileStorage.
+
+The benchmarks build their stores with populate() and time their
+steps with timed().
+"""
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+import models
+from models.amenity import Amenity
+from models.city import City
+from models.engine.bulk import new_ids
+from models.engine.file_storage import FileStorage
+from models.place import Place
+from models.review import Review
+from models.state import State
+from models.user import User
+
+amenity_names = ["Wifi", "TV", "Kitchen", "Pool", "Heating", "Washer",
+                 "Parking", "Gym", "Air conditioning", "Pets allowed",
+                 "Breakfast", "Fireplace", "Balcony", "Elevator", "Dryer"]
+first_names = ["Betty", "John", "Ada", "Alan", "Grace", "Linus", "Margaret",
+               "Dennis", "Barbara", "Ken", "Frances", "Guido", "Radia"]
+last_names = ["Holberton", "Lovelace", "Turing", "Hopper", "Torvalds",
+              "Hamilton", "Ritchie", "Liskov", "Thompson", "Allen"]
+words = ["quiet", "clean", "cozy", "bright", "spacious", "central", "view",
+         "friendly", "host", "garden", "modern", "loft", "beach", "noisy",
+         "small", "comfortable", "station", "walk", "old", "charming"]
+# objects of each class per state
+proportions = (("City", 10), ("User", 500), ("Place", 1250),
+               ("Review", 3250))
+
+
+def sizes(n):
+    """
+    Returns the number of objects of each class for a dataset of n.
+
+    :param n: The total number of objects.
+    :return: A dictionary of class name to number of objects, each at
+             least 1.
+    """
+    amenities = max(1, min(200, n // 100))
+    states = max(1, n - amenities) / \
+        (1 + sum(ratio for name, ratio in proportions))
+    result = {"Amenity": amenities, "State": max(1, round(states))}
+    for name, ratio in proportions:
+        result[name] = max(1, round(states * ratio))
+    return result
+
+
+def sentence(rand, count):
+    """Returns count random words joined by spaces."""
+    return " ".join(rand.choice(words) for i in range(count))
+
+
+def generate(n, seed=0):
+    """
+    Builds a dataset of about n objects without storing them.
+
+    :param n: The total number of objects.
+    :param seed: The seed of the attribute values.
+    :return: A dictionary of class name to list of instances, in
+             dependency order (referenced classes first).
+    """
+    rand = random.Random(seed)
+    counts = sizes(n)
+    # off the whole second, which BaseModel(**kwargs) does not parse
+    epoch = datetime(2020, 1, 1, microsecond=1)
+    now = datetime(2024, 1, 1)
+    span = (now - epoch).total_seconds()
+
+    def after(start):
+        """Returns a random time between start and now."""
+        return start + timedelta(
+            seconds=rand.random() * (now - start).total_seconds())
+
+    def make(cls, count, attributes):
+        """
+        Builds count instances of cls from the dictionaries returned
+        by attributes(i), whose "at" is the creation time.
+        """
+        objs = []
+        for i, obj_id in enumerate(new_ids(count)):
+            record = attributes(i)
+            at = record.pop("at")
+            record.update(id=obj_id, created_at=at, updated_at=after(at))
+            objs.append(cls.from_dict(record))
+        return objs
+
+    dataset = {}
+    dataset["Amenity"] = make(Amenity, counts["Amenity"], lambda i: {
+        "at": epoch,
+        "name": amenity_names[i % len(amenity_names)] +
+        ("" if i < len(amenity_names) else f" {i}")})
+    dataset["State"] = make(State, counts["State"], lambda i: {
+        "at": epoch, "name": f"State {i}"})
+    centers = {}
+
+    def city(i):
+        state = dataset["State"][i % counts["State"]]
+        centers[i] = (rand.uniform(-60, 60), rand.uniform(-180, 180))
+        return {"at": after(state.created_at), "state_id": state.id,
+                "name": f"City {i}"}
+    dataset["City"] = make(City, counts["City"], city)
+    dataset["User"] = make(User, counts["User"], lambda i: {
+        "at": epoch + timedelta(seconds=rand.random() * span),
+        "email": f"user{i}@hbnb.io", "password": f"pwd{i}",
+        "first_name": rand.choice(first_names),
+        "last_name": rand.choice(last_names)})
+    amenity_ids = [amenity.id for amenity in dataset["Amenity"]]
+
+    def place(i):
+        index = rand.randrange(counts["City"])
+        owner = rand.choice(dataset["User"])
+        lat, lon = centers[index]
+        return {"at": after(max(owner.created_at,
+                                dataset["City"][index].created_at)),
+                "city_id": dataset["City"][index].id, "user_id": owner.id,
+                "name": f"{sentence(rand, 2).title()} {i}",
+                "description": sentence(rand, rand.randint(5, 20)),
+                "number_rooms": rand.randint(1, 6),
+                "number_bathrooms": rand.randint(1, 3),
+                "max_guest": rand.randint(1, 10),
+                "price_by_night": rand.randint(20, 500),
+                "latitude": lat + rand.gauss(0, 0.1),
+                "longitude": lon + rand.gauss(0, 0.1),
+                "amenity_ids": rand.sample(
+                    amenity_ids, rand.randint(0, min(8, len(amenity_ids))))}
+    dataset["Place"] = make(Place, counts["Place"], place)
+
+    def review(i):
+        reviewed = rand.choice(dataset["Place"])
+        author = rand.choice(dataset["User"])
+        return {"at": after(max(reviewed.created_at, author.created_at)),
+                "place_id": reviewed.id, "user_id": author.id,
+                "text": sentence(rand, rand.randint(3, 30))}
+    dataset["Review"] = make(Review, counts["Review"], review)
+    return dataset
+
+
+def populate(n, seed=0):
+    """
+    Builds a dataset of about n objects and stores it with
+    storage.bulk_new().
+
+    :param n: The total number of objects.
+    :param seed: The seed of the attribute values.
+    :return: The dataset, as generate() returns it.
+    """
+    dataset = generate(n, seed)
+    for objs in dataset.values():
+        models.storage.bulk_new(objs)
+    return dataset
+
+
+def timed(func):
+    """
+    Returns the seconds func() takes.
+
+    :param func: The function to time.
+    :return: The elapsed time in seconds.
+    """
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def main(n, path=None):
+    """
+    Generates a dataset of n objects, saving it to path if given.
+
+    :param n: The total number of objects.
+    :param path: The file to save the dataset to.
+    """
+    if path is not None:
+        FileStorage._FileStorage__file_path = path
+    FileStorage._FileStorage__objects = {}
+    dataset = populate(n)
+    for name, objs in dataset.items():
+        print(f"{name:8} {len(objs):10d}")
+    if path is not None:
+        models.storage.save()
+        print(f"saved to {path}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10000,
+         sys.argv[2] if len(sys.argv) > 2 else None)
@@ -0,0 +1,184 @@
+#!/usr/bin/python3
+"""Runs the storage benchmark suite and writes its results as JSON.
+
+Usage: python3 -m benchmarks.suite [--sizes 1000,10000,100000]
+                                   [--repeat 20] [--output results.json]
+                                   [--baseline old.json] [--tolerance 0.2]
+
+For each size a dataset is generated with benchmarks.dataset, then the
+suite times new(), BaseModel.to_dict(), save(), reload(), all(), and
+the console count, show, update and all commands on it. The storage is
+configured from the environment (HBNB_STORAGE_*), and the options are
+part of the results, so that runs are compared like for like.
+
+The results file holds one entry per size and operation with the
+number of operations, the seconds they took and the rate. Given the
+results of an earlier run as baseline, the operations whose rate fell
+by more than the tolerance are listed and the exit status is 1.
+"""
+import argparse
+import contextlib
+import gc
+import io
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+from datetime import datetime
+import models
+from benchmarks.dataset import generate, timed
+from console import HBNBCommand
+from models.engine.file_storage import FileStorage
+
+# timings shorter than this are too noisy to be compared
+min_seconds = 0.01
+
+
+def entry(count, func):
+    """
+    Runs func() once and returns its result entry.
+
+    :param count: The number of operations func() makes.
+    :param func: The function to time.
+    :return: A dictionary of count, seconds and per_second.
+    """
+    gc.collect()
+    seconds = timed(func)
+    return {"count": count, "seconds": round(seconds, 6),
+            "per_second": round(count / max(seconds, 1e-9), 1)}
+
+
+def run_size(n, repeat, tmpdir):
+    """
+    Runs every benchmark on a dataset of about n objects.
+
+    :param n: The size of the dataset.
+    :param repeat: The number of each console command to run.
+    :param tmpdir: The directory of the storage files.
+    :return: A dictionary of operation name to result entry.
+    """
+    FileStorage._FileStorage__file_path = os.path.join(tmpdir,
+                                                       f"file{n}.json")
+    FileStorage._FileStorage__objects = {}
+    results = {}
+    dataset = {}
+    results["generate"] = entry(n, lambda: dataset.update(generate(n)))
+    objs = [obj for group in dataset.values() for obj in group]
+    total = len(objs)
+    results["generate"]["count"] = total
+
+    def new():
+        for obj in objs:
+            models.storage.new(obj)
+    results["new"] = entry(total, new)
+    results["to_dict"] = entry(total, lambda: [obj.to_dict()
+                                               for obj in objs])
+    results["save"] = entry(total, models.storage.save)
+    del objs
+    dataset.clear()
+    FileStorage._FileStorage__objects = {}
+    results["reload"] = entry(total, models.storage.reload)
+    results["all"] = entry(total, lambda: list(
+        models.storage.all().values()))
+    results["all_class"] = entry(models.storage.count("Place"), lambda: list(
+        models.storage.all("Place").values()))
+    rand = random.Random(0)
+    ids = [key.split(".", 1)[1] for key in
+           rand.sample(sorted(models.storage.all("Place")),
+                       min(repeat, models.storage.count("Place")))]
+    console = HBNBCommand()
+
+    def commands(lines):
+        with contextlib.redirect_stdout(io.StringIO()):
+            for line in lines:
+                console.onecmd(line)
+    commands_run = {
+        "console_count": ["count Review"] * repeat,
+        "console_show": [f"show Place {i}" for i in ids],
+        "console_update": [f'update Place {i} price_by_night "{n % 500}"'
+                           for i in ids],
+        "console_all": ["all Place"]}
+    for name, lines in commands_run.items():
+        results[name] = entry(len(lines), lambda: commands(lines))
+    FileStorage._FileStorage__objects = {}
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """
+    Returns the operations slower than in baseline by more than
+    tolerance, among those that took at least min_seconds in both.
+
+    :param results: The results of this run.
+    :param baseline: The results of an earlier run.
+    :param tolerance: The accepted fraction of slowdown, like 0.2.
+    :return: A list of (size, operation, old rate, new rate).
+    """
+    slower = []
+    for size, operations in results["results"].items():
+        for name, entry in operations.items():
+            old = baseline["results"].get(size, {}).get(name)
+            if old is None or \
+                    min(old["seconds"], entry["seconds"]) < min_seconds:
+                continue
+            if entry["per_second"] < old["per_second"] * (1 - tolerance):
+                slower.append((size, name, old["per_second"],
+                               entry["per_second"]))
+    return slower
+
+
+def main(argv):
+    """
+    Runs the suite with the command line arguments argv.
+
+    :param argv: The arguments, without the program name.
+    :return: The exit status.
+    """
+    parser = argparse.ArgumentParser(prog="python3 -m benchmarks.suite")
+    parser.add_argument("--sizes", default="1000,10000,100000",
+                        help="comma separated dataset sizes")
+    parser.add_argument("--repeat", type=int, default=20,
+                        help="number of each console command")
+    parser.add_argument("--output", default="benchmark_results.json",
+                        help="file the results are written to")
+    parser.add_argument("--baseline", help="results of an earlier run")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="accepted slowdown against the baseline")
+    args = parser.parse_args(argv)
+    sizes = [int(float(size)) for size in args.sizes.split(",")]
+    file_path = FileStorage._FileStorage__file_path
+    results = {"created": datetime.now().isoformat(),
+               "python": platform.python_version(),
+               "platform": platform.platform(),
+               "options": dict(FileStorage._FileStorage__options),
+               "repeat": args.repeat,
+               "results": {}}
+    try:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            for n in sizes:
+                operations = run_size(n, args.repeat, tmpdir)
+                results["results"][str(n)] = operations
+                for name, entry in operations.items():
+                    print(f"{n:>9} {name:15} {entry['count']:>9} "
+                          f"{entry['seconds']:10.4f}s "
+                          f"{entry['per_second']:14,.0f}/s")
+    finally:
+        FileStorage._FileStorage__file_path = file_path
+        FileStorage._FileStorage__objects = {}
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"results written to {args.output}")
+    if args.baseline is None:
+        return 0
+    with open(args.baseline) as f:
+        slower = compare(results, json.load(f), args.tolerance)
+    for size, name, old, new in slower:
+        print(f"slower: {name} at {size} objects, "
+              f"{old:,.0f}/s -> {new:,.0f}/s")
+    return 1 if slower else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -4,9 +4,17 @@ import sys
 import re
 from shlex import split
 import cmd
+import itertools
 import json
+import math
 import os.path
+import time
 from models import storage
+from models.engine.bulk import build
+from models.engine.coercion import compile_coercions, parse_literal
+from models.engine.geo import GeoIndex
+from models.engine.query import Query
+from models.engine.text import TextIndex
 
 
 def parse(arg):
@@ -38,6 +46,7 @@ class HBNBCommand(cmd.Cmd):
         "Amenity",
         "Review"
     }
+    __coercions = None
 
     def emptyline(self):
         """Empty line"""
@@ -50,12 +59,17 @@ class HBNBCommand(cmd.Cmd):
             "show": self.do_show,
             "destroy": self.do_destroy,
             "count": self.do_count,
-            "update": self.do_update
+            "update": self.do_update,
+            "near": self.do_near,
+            "nearest": self.do_nearest,
+            "search": self.do_search,
+            "where": self.do_where,
+            "explain": self.do_explain
         }
         match = re.search(r"\.", arg)
         if match is not None:
             argl = [arg[:match.span()[0]], arg[match.span()[1]:]]
-            match = re.search(r"\((.*?)\)", argl[1])
+            match = re.search(r"\((.*)\)", argl[1])
             if match is not None:
                 command = [argl[1][:match.span()[0]], match.group()[1:-1]]
                 if command[0] in argdict.keys():
@@ -66,17 +80,48 @@ class HBNBCommand(cmd.Cmd):
 
     def do_quit(self, arg):
         """Quit command to exit the program."""
+        storage.flush()
         print(arg)
         return True
 
     def do_EOF(self, arg):
         """EOF signal to exit the program."""
+        storage.flush()
         print("")
         return True
 
+    def do_begin(self, arg):
+        """Usage: begin
+        Opens a transaction: the changes of the next commands are kept
+        in memory and only written by commit.
+        """
+        if storage.in_transaction():
+            print("** transaction already open **")
+            return
+        storage.begin()
+
+    def do_commit(self, arg):
+        """Usage: commit
+        Writes the changes made since begin, all at once.
+        """
+        if not storage.in_transaction():
+            print("** no transaction open **")
+            return
+        storage.commit()
+
+    def do_rollback(self, arg):
+        """Usage: rollback
+        Undoes the changes made since begin.
+        """
+        if not storage.in_transaction():
+            print("** no transaction open **")
+            return
+        storage.rollback()
+
     def do_create(self, arg):
-        """Usage: create <class>
-        Create a new class instance and print its id.
+        """Usage: create <class> [count=<n> [{<attributes>}]]
+        Create a new class instance and print its id, or <n> instances
+        saved at once and the throughput.
         """
         if not arg:
             print("** class name missing **")
@@ -85,15 +130,53 @@ class HBNBCommand(cmd.Cmd):
         try:
             args = parse(arg)
             class_name = args[0]
-            if class_name in HBNBCommand.__classes:
+            if class_name not in HBNBCommand.__classes:
+                print("** class doesn't exist **")
+            elif len(args) > 1:
+                self.create_many(class_name, args[1:])
+            else:
                 instance = storage.classes()[class_name]()
                 storage.new(instance)
                 print(instance.id)
-            else:
-                print("** class doesn't exist **")
         except ImportError:
             print("** class doesn't exist **")
 
+    def create_many(self, class_name, args):
+        """
+        Creates count instances of a class in batches, saves them with
+        one write and prints the throughput.
+
+        :param class_name: The class name.
+        :param args: The count=<n> argument, then optionally a
+                     dictionary of the attributes of every instance.
+        """
+        count = args[0][len("count="):]
+        if not args[0].startswith("count=") or not count.isdigit() or \
+                int(count) == 0:
+            print("** invalid count **")
+            return
+        attributes = {}
+        if len(args) > 1:
+            try:
+                attributes = parse_literal(args[1])
+            except ValueError:
+                attributes = None
+            if type(attributes) is not dict:
+                print("** invalid attributes **")
+                return
+        attributes = self.convert(class_name, attributes)
+        if attributes is None:
+            return
+        start = time.perf_counter()
+        created = 0
+        for objs in build(storage.classes()[class_name], int(count),
+                          attributes):
+            created += storage.bulk_new(objs)
+        storage.save()
+        elapsed = time.perf_counter() - start
+        print(f"Created {created} {class_name} in {elapsed:.2f}s "
+              f"({created / max(elapsed, 1e-9):,.0f} objects/s)")
+
     def do_show(self, arg):
         """
         Print the string representation of an
@@ -115,14 +198,12 @@ class HBNBCommand(cmd.Cmd):
             print("** instance id missing **")
             return
 
-        instance_id = args[1]
-        instance_key = f"{class_name}.{instance_id}"
+        instance = storage.get(class_name, args[1])
 
-        if instance_key not in storage.all():
+        if instance is None:
             print("** no instance found **")
             return
 
-        instance = storage.all()[instance_key]
         print(instance)
 
     def do_destroy(self, arg):
@@ -147,34 +228,70 @@ class HBNBCommand(cmd.Cmd):
             print("** instance id missing **")
             return
 
-        instance_id = args[1]
-        instance_key = f"{class_name}.{instance_id}"
+        instance = storage.get(class_name, args[1])
 
-        if instance_key not in storage.all().keys():
+        if instance is None:
             print("** no instance found **")
             return
 
-        del storage.all()[instance_key]
+        storage.delete(instance)
         storage.save()
 
         print("Instance deleted successfully.")
 
     def do_all(self, arg):
-        """Check if the input is in the format <class name>,all()"""
-        """Split the command to check for the "all" method"""
-        parts = parse(arg)
-
-        print(parts)
-        if len(parts) > 0 and parts[0] not in HBNBCommand.__classes:
-            print("** class doesn't exist **")
+        """Usage: 1. all [<class>] [limit=<n>] [offset=<n>] [after=<id>]
+            [format=jsonl] | 2. <class>.all(...)
+            Function: Prints the instances, or those of a class, one per
+            line as they are read from storage; after=<id> continues
+            after that instance, and format=jsonl prints their
+            dictionaries as JSON
+        """
+        args = parse(arg)
+        class_name = None
+        if args and "=" not in args[0]:
+            class_name = args.pop(0)
+            if class_name not in HBNBCommand.__classes:
+                print("** class doesn't exist **")
+                return
+        options = {"limit": None, "offset": "0", "after": None,
+                   "format": "str"}
+        for option in args:
+            name, _, value = option.partition("=")
+            if name not in options:
+                print(f"** unknown option '{name}' **")
+                return
+            options[name] = value
+        for name in ("limit", "offset"):
+            if options[name] is not None and not options[name].isdigit():
+                print(f"** invalid {name} **")
+                return
+        if options["format"] not in ("str", "jsonl"):
+            print(f"** unknown format '{options['format']}' **")
+            return
+        after = options["after"]
+        if after is not None and "." not in after and class_name:
+            after = f"{class_name}.{after}"
+        try:
+            objs = storage.scan(class_name, after)
+        except KeyError:
+            print("** no instance found **")
+            return
+        limit = options["limit"]
+        offset = int(options["offset"])
+        objs = itertools.islice(objs, offset,
+                                None if limit is None else offset + int(limit))
+        if options["format"] == "jsonl":
+            lines = (json.dumps(obj.to_dict()) for obj in objs)
         else:
-            objl = []
-            for obj in storage.all().values():
-                if len(parts) > 0 and parts[0] == obj.__class__.__name__:
-                    objl.append(obj.__str__())
-                elif len(parts) == 0:
-                    objl.append(obj.__str__())
-            print(objl)
+            lines = (obj.__str__() for obj in objs)
+        try:
+            for line in lines:
+                print(line)
+        except BrokenPipeError:
+            # the reader is gone, as with all | head: stop writing
+            os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+            return True
 
     def do_update(self, arg):
         """
@@ -200,10 +317,9 @@ class HBNBCommand(cmd.Cmd):
             print("** instance id missing **")
             return
 
-        instance_id = args[1]
-        instance_key = f"{class_name}.{instance_id}"
+        obj = storage.get(class_name, args[1])
 
-        if instance_key not in storage.all():
+        if obj is None:
             print("** no instance found **")
             return
 
@@ -211,42 +327,244 @@ class HBNBCommand(cmd.Cmd):
             print("** attribute name missing **")
             return
 
+        cls = storage.classes()[class_name]
         if len(args) == 3:
             try:
-                type(eval(args[2])) != dict
-            except NAmeError:
+                updates = parse_literal(args[2])
+            except ValueError:
+                updates = None
+            if type(updates) is not dict:
                 print("** value missing **")
                 return
-
-        if len(args) == 4:
-            obj = storage.all()[instance_key]
-            if args[2] in obj.__class__.__dict__.keys():
-                valtype = type(obj.__class__.__dict__[args[2]])
-                obj.__dict__[args[2]] = valtype(args[3])
-            else:
-                obj.__dict__[args[2]] = args[3]
-        elif type(eval(args[2])) == dict:
-            obj = storage.all()[instance_key]
-            for k, v in eval(args[2]).items():
-                if (k in obj.__class__.__dict__.keys() and
-                        type(obj.__class__.__dict__[k]) in {str, int, float}):
-                    valtype = type(obj.__class__.__dict__[k])
-                    obj.__dict__[k] = valtype(v)
-                else:
-                    obj.__dict__[k] = v
+        else:
+            if isinstance(getattr(cls, args[2], None), property):
+                print("** attribute can't be set **")
+                return
+            updates = {args[2]: args[3]}
+        updates = self.convert(class_name, updates)
+        if updates is None:
+            return
+        for k, v in updates.items():
+            setattr(obj, k, v)
         storage.save()
         print("Instance updated successfully.")
 
+    def convert(self, class_name, values):
+        """
+        Converts attribute values to the types of the class, dropping
+        the non-string names and the read-only properties, and prints
+        the first error.
+
+        :param class_name: The class name.
+        :param values: A dictionary of attribute name to value.
+        :return: The converted dictionary, None on error.
+        """
+        cls = storage.classes()[class_name]
+        coercions = self.coercions(class_name)
+        result = {}
+        try:
+            for k, v in values.items():
+                if isinstance(k, str) and \
+                        not isinstance(getattr(cls, k, None), property):
+                    result[k] = coercions[k](v) if k in coercions else v
+        except ValueError as error:
+            print("** {} **".format(error))
+            return None
+        return result
+
+    def coercions(self, class_name):
+        """
+        Returns the converters of the attributes of a class, compiled
+        from storage.attributes() on first use.
+
+        :param class_name: The class name.
+        :return: A dictionary of attribute name to converter.
+        """
+        if HBNBCommand.__coercions is None:
+            HBNBCommand.__coercions = compile_coercions(storage.attributes())
+        return HBNBCommand.__coercions.get(class_name, {})
+
+    def geo_args(self, arg):
+        """
+        Parses the <class name> <latitude> <longitude> <number>
+        arguments of near and nearest, printing the first error.
+
+        :return: The class name and the three numbers, or None.
+        """
+        args = parse(arg)
+        if not args:
+            print("** class name missing **")
+            return None
+        if args[0] not in HBNBCommand.__classes:
+            print("** class doesn't exist **")
+            return None
+        if args[0] != "Place":
+            print("** class has no location **")
+            return None
+        if len(args) < 4:
+            print("** coordinates missing **")
+            return None
+        try:
+            numbers = [float(value) for value in args[1:4]]
+        except ValueError:
+            numbers = [math.nan]
+        if not all(math.isfinite(number) for number in numbers):
+            print("** invalid coordinates **")
+            return None
+        return (args[0], *numbers)
+
+    def do_near(self, arg):
+        """Usage: 1. near Place <lat> <lon> <km> |
+            2. Place.near(<lat>, <lon>, <km>)
+            Function: Prints the places within <km> of a point,
+            nearest first
+        """
+        args = self.geo_args(arg)
+        if args is not None:
+            objs = storage.index(GeoIndex).nearby(*args[1:])
+            print([obj.__str__() for obj in objs])
+
+    def do_nearest(self, arg):
+        """Usage: 1. nearest Place <lat> <lon> <n> |
+            2. Place.nearest(<lat>, <lon>, <n>)
+            Function: Prints the <n> places nearest to a point
+        """
+        args = self.geo_args(arg)
+        if args is not None:
+            objs = storage.index(GeoIndex).nearest(args[1], args[2],
+                                                   int(args[3]))
+            print([obj.__str__() for obj in objs])
+
+    def do_search(self, arg):
+        """Usage: 1. search <class name> "<words>" |
+            2. <class name>.search("<words>")
+            Function: Prints the 10 instances whose text best matches
+            the words, best first
+        """
+        args = parse(arg)
+        if not args:
+            print("** class name missing **")
+        elif args[0] not in HBNBCommand.__classes:
+            print("** class doesn't exist **")
+        elif args[0] not in TextIndex.fields:
+            print("** class has no text **")
+        elif len(args) == 1:
+            print("** query missing **")
+        else:
+            objs = storage.index(TextIndex).search(args[0],
+                                                   " ".join(args[1:]))
+            print([obj.__str__() for obj in objs])
+
+    def parse_query(self, arg):
+        """
+        Parses the class name and query of the where and explain
+        commands, printing the error if there is one.
+
+        :param arg: The class name followed by the query.
+        :return: A Query, None on error.
+        """
+        args = arg.split(maxsplit=1)
+        if not args:
+            print("** class name missing **")
+        elif args[0] not in HBNBCommand.__classes:
+            print("** class doesn't exist **")
+        else:
+            try:
+                return Query.parse(storage, args[0], "".join(args[1:]))
+            except ValueError as error:
+                print(f"** invalid query: {error} **")
+        return None
+
+    def do_where(self, arg):
+        """Usage: 1. where <class name> <conditions> |
+            2. <class name>.where(<conditions>)
+            Function: Prints the instances that meet every condition,
+            such as price_by_night < 100, city_id == "<id>",
+            order_by="-price_by_night", limit=5
+        """
+        query = self.parse_query(arg)
+        if query is not None:
+            print([obj.__str__() for obj in query.run()])
+
+    def do_explain(self, arg):
+        """Usage: 1. explain <class name> <conditions> |
+            2. <class name>.explain(<conditions>)
+            Function: Prints the plan chosen for the where command and
+            its estimated cost in objects read
+        """
+        query = self.parse_query(arg)
+        if query is None:
+            return
+        plan = query.explain()
+        print(f"plan: {plan['plan']} (cost {plan['cost']})")
+        for description, cost in plan["alternatives"]:
+            print(f"rejected: {description} (cost {cost})")
+        print(f"filter: {', '.join(plan['filter']) or 'none'}")
+        if plan["order_by"]:
+            print(f"order by: {plan['order_by']}")
+        if plan["limit"] is not None:
+            print(f"limit: {plan['limit']}")
+
+    def do_stats(self, arg):
+        """Usage: stats [on | off | reset | json [<file>]]
+            Function: Prints the number of calls and the latencies of
+            the storage operations and the bytes written and read;
+            on and off start and stop recording them, json prints
+            them or writes them to <file> as JSON
+        """
+        args = parse(arg)
+        command = args[0] if args else ""
+        if command in ("on", "off"):
+            storage.configure(metrics=command == "on")
+        elif command == "reset":
+            storage.reset_stats()
+        elif command == "json":
+            text = json.dumps(storage.stats(), indent=2)
+            if len(args) == 1:
+                print(text)
+                return
+            try:
+                with open(args[1], "w") as f:
+                    f.write(text + "\n")
+            except OSError as error:
+                print(f"** cannot write {args[1]}: {error.strerror} **")
+        elif command:
+            print("** unknown stats command **")
+        else:
+            self.print_stats(storage.stats())
+
+    def print_stats(self, stats):
+        """
+        Prints the metrics returned by storage.stats() as a table, with
+        the latencies in microseconds.
+
+        :param stats: The metrics.
+        """
+        if not stats["enabled"] and not stats["operations"]:
+            print("** metrics are off, run stats on **")
+            return
+        print(f"{'operation':15} {'count':>9} {'total (s)':>10} "
+              f"{'mean':>9} {'p50':>9} {'p90':>9} {'p99':>9} {'max':>9}")
+        for name, op in stats["operations"].items():
+            print(f"{name:15} {op['count']:9d} {op['total_seconds']:10.4f}" +
+                  "".join(f" {op[field] * 1e6:9.1f}" for field in
+                          ("mean_seconds", "p50_seconds", "p90_seconds",
+                           "p99_seconds", "max_seconds")))
+        print(f"bytes written: {stats['bytes']['written']}")
+        print(f"bytes read: {stats['bytes']['read']}")
+
     def do_count(self, line):
         '''Usage: 1. count <class name> | 2. <class name>.count()
             Function: Counts all the instances  of the class
         '''
-        count = 0
-        arg = parse(line)
-        for key in storage.all().values():
-            if arg[0] == key.__class__.__name__:
-                count += 1
-        print(count)
+        args = parse(line)
+        if not args:
+            print("** class name missing **")
+            return
+        if args[0] not in HBNBCommand.__classes:
+            print("** class doesn't exist **")
+            return
+        print(storage.count(args[0]))
 
 
 if __name__ == "__main__":
@@ -1,9 +1,53 @@
 #!/usr/bin/python3
 """__init__ magic method for models directory"""
+import os
 from models.engine.file_storage import FileStorage
 
-"""Create a unique FileStorage instance for your application"""
-storage = FileStorage()
+"""Storage options that can be set from the environment"""
+env_options = {"HBNB_STORAGE_JOURNAL": ("journal", bool),
+               "HBNB_STORAGE_JOURNAL_LIMIT": ("journal_limit", int),
+               "HBNB_STORAGE_LAZY": ("lazy", bool),
+               "HBNB_STORAGE_FORMAT": ("format", str),
+               "HBNB_STORAGE_SHARD": ("shard", bool),
+               "HBNB_STORAGE_WRITE_BEHIND": ("write_behind", bool),
+               "HBNB_STORAGE_FLUSH_INTERVAL": ("flush_interval", float),
+               "HBNB_STORAGE_FLUSH_THRESHOLD": ("flush_threshold", int),
+               "HBNB_STORAGE_DURABILITY": ("durability", str),
+               "HBNB_STORAGE_COMPACT": ("compact", bool),
+               "HBNB_STORAGE_METRICS": ("metrics", bool)}
+
+"""DBStorage options that can be set from the environment"""
+db_env_options = {"HBNB_DB_PATH": ("path", str),
+                  "HBNB_DB_JOURNAL_MODE": ("journal_mode", str),
+                  "HBNB_DB_DURABILITY": ("durability", str),
+                  "HBNB_DB_METRICS": ("metrics", bool)}
+
+
+def option_from_env(value, kind):
+    """
+    Convert the value of an environment variable to an option value.
+
+    :param value: The raw string from the environment.
+    :param kind: The type of the option.
+    :return: The converted value.
+    """
+    if kind is bool:
+        return value.lower() in ("1", "true", "yes", "on")
+    return kind(value)
+
+
+"""Create a unique storage instance for your application,
+a DBStorage if HBNB_TYPE_STORAGE is db, a FileStorage otherwise"""
+if os.getenv("HBNB_TYPE_STORAGE") == "db":
+    from models.engine.db_storage import DBStorage
+    storage = DBStorage()
+    env_options = db_env_options
+else:
+    storage = FileStorage()
+
+for name, (option, kind) in env_options.items():
+    if os.getenv(name) is not None:
+        storage.configure(**{option: option_from_env(os.getenv(name), kind)})
 
 """Call the reload() method on the storage variable"""
 storage.reload()
@@ -3,6 +3,23 @@
 from uuid import uuid4
 from datetime import datetime
 import models
+from models.engine.metrics import measured
+
+time_format = '%Y-%m-%dT%H:%M:%S.%f'
+
+
+def parse_datetime(value):
+    """
+    Parse a timestamp written by datetime.isoformat(), falling back
+    to strptime for the formats fromisoformat() does not accept.
+
+    :param value: The timestamp string.
+    :return: A datetime.
+    """
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return datetime.strptime(value, time_format)
 
 
 class BaseModel:
@@ -18,7 +35,6 @@ class BaseModel:
         :param args: Unused variable-length argument list.
         :param kwargs: Keyword arguments for attribute assignment.
         """
-        time_format = '%Y-%m-%dT%H:%M:%S.%f'
         self.id = str(uuid4())
         self.created_at = datetime.now()
         self.updated_at = datetime.now()
@@ -31,6 +47,44 @@ class BaseModel:
         else:
             models.storage.new(self)
 
+    @classmethod
+    def from_dict(cls, record):
+        """
+        Build an instance from a dictionary made by to_dict(), as
+        cls(**record) does but without its work: no throwaway id and
+        timestamps, no storage calls, and record itself becomes the
+        attribute dictionary. The timestamps may be datetimes or ISO
+        strings.
+
+        :param record: The dictionary, owned by the instance afterwards.
+        :return: The instance.
+        """
+        obj = cls.__new__(cls)
+        record.pop('__class__', None)
+        for key in ('created_at', 'updated_at'):
+            value = record.get(key)
+            if value is None:
+                record[key] = datetime.now()
+            elif type(value) is not datetime:
+                record[key] = parse_datetime(value)
+        object.__setattr__(obj, '__dict__', record)
+        if 'id' not in record:
+            record['id'] = str(uuid4())
+        return obj
+
+    def __setattr__(self, name, value):
+        """
+        Set an attribute and mark the instance as dirty in storage,
+        so the next save persists it. In a transaction the storage
+        first records the attributes the instance had.
+
+        :param name: The attribute name.
+        :param value: The attribute value.
+        """
+        models.storage.preserve(self)
+        super().__setattr__(name, value)
+        models.storage.touch(self)
+
     def __str__(self):
         """
         Return a string representation of the object.
@@ -52,6 +106,7 @@ class BaseModel:
             return
 
 
+    @measured("to_dict")
     def to_dict(self):
         """
         Convert the object's attributes to a
@@ -1,6 +1,7 @@
 #!/usr/bin/python3
 """Defines the City class."""
 from models.base_model import BaseModel
+from models.engine.relations import relationship
 
 
 class City(BaseModel):
@@ -9,7 +10,9 @@ class City(BaseModel):
     Attributes:
         state_id (str): The state id.
         name (str): The name of the city.
+        places (list): The places of the city, read-only.
     """
 
     state_id = ""
     name = ""
+    places = relationship("Place", "city_id")
@@ -0,0 +1,310 @@
+#!/usr/bin/python3
+"""Defines compact, __slots__-based versions of the model classes.
+
+A compact instance has no per-object __dict__: the attributes of the
+schema live in slots, the id is packed in 16 bytes when it is a uuid
+and the timestamps are kept as integer epoch microseconds. Attributes
+outside the schema go to a small dictionary created on demand.
+"""
+from collections.abc import MutableMapping
+from datetime import datetime, timedelta
+from uuid import UUID, uuid4
+import models
+from models.base_model import parse_datetime
+from models.engine.metrics import measured
+
+EPOCH = datetime(1970, 1, 1)
+_base_fields = ("id", "created_at", "updated_at")
+_microsecond = timedelta(microseconds=1)
+
+
+def _pack_id(value):
+    """Returns the 16 bytes of a uuid string, or value unchanged."""
+    if type(value) is str and len(value) == 36:
+        try:
+            uuid = UUID(value)
+        except ValueError:
+            return value
+        if str(uuid) == value:
+            return uuid.bytes
+    return value
+
+
+def _pack_time(value):
+    """Returns the epoch microseconds of a datetime, or value unchanged."""
+    if type(value) is datetime and value.tzinfo is None:
+        return (value - EPOCH) // _microsecond
+    return value
+
+
+class SlotDict(MutableMapping):
+    """
+    A live dictionary view of the attributes of a compact instance,
+    standing in for its __dict__.
+    """
+
+    __slots__ = ("_obj",)
+
+    def __init__(self, obj):
+        """
+        Initialize the view.
+
+        :param obj: The compact instance.
+        """
+        self._obj = obj
+
+    def __iter__(self):
+        """Yields the names of the attributes that are set."""
+        obj = self._obj
+        yield from _base_fields
+        for name in obj._fields:
+            try:
+                object.__getattribute__(obj, name)
+            except AttributeError:
+                continue
+            yield name
+        if obj._extra:
+            yield from list(obj._extra)
+
+    def __len__(self):
+        """Returns the number of attributes that are set."""
+        return sum(1 for name in self)
+
+    def __getitem__(self, name):
+        """Returns the value of the attribute name if it is set."""
+        obj = self._obj
+        if name in _base_fields:
+            return getattr(obj, name)
+        if name in obj._fields:
+            try:
+                return object.__getattribute__(obj, name)
+            except AttributeError:
+                raise KeyError(name) from None
+        if obj._extra and name in obj._extra:
+            return obj._extra[name]
+        raise KeyError(name)
+
+    def __setitem__(self, name, value):
+        """Sets the attribute name, as setattr() does."""
+        setattr(self._obj, name, value)
+
+    def __delitem__(self, name):
+        """Removes the attribute name."""
+        try:
+            delattr(self._obj, name)
+        except AttributeError:
+            raise KeyError(name) from None
+
+    def __repr__(self):
+        """Returns the representation of the equivalent dictionary."""
+        return repr(dict(self))
+
+
+class CompactModel:
+    """
+    The base of the compact classes, with the behaviour of BaseModel.
+    """
+
+    __slots__ = ("_id", "_created_at", "_updated_at", "_extra",
+                 "__weakref__")
+    _fields = ()
+    _defaults = {}
+    _model = None
+
+    def __init__(self, *args, **kwargs):
+        """
+        Initialize the instance as BaseModel does.
+
+        :param args: Unused variable-length argument list.
+        :param kwargs: Keyword arguments for attribute assignment.
+        """
+        object.__setattr__(self, "_extra", None)
+        self._set("id", str(uuid4()))
+        self._set("created_at", datetime.now())
+        self._set("updated_at", datetime.now())
+        if len(kwargs) != 0:
+            for key, value in kwargs.items():
+                if key == 'created_at' or key == 'updated_at':
+                    value = parse_datetime(value)
+                if key != '__class__':
+                    self._set(key, value)
+        else:
+            models.storage.new(self)
+
+    @classmethod
+    def from_dict(cls, record):
+        """
+        Build an instance from a dictionary made by to_dict(), as
+        BaseModel.from_dict() does: no throwaway id and timestamps and
+        no storage calls. The timestamps may be datetimes or ISO
+        strings.
+
+        :param record: The dictionary.
+        :return: The instance.
+        """
+        obj = cls.__new__(cls)
+        object.__setattr__(obj, "_extra", None)
+        for key, value in record.items():
+            if key == 'created_at' or key == 'updated_at':
+                if type(value) is not datetime:
+                    value = parse_datetime(value)
+            if key != '__class__':
+                obj._set(key, value)
+        for key in ('created_at', 'updated_at'):
+            if key not in record:
+                obj._set(key, datetime.now())
+        if 'id' not in record:
+            obj._set('id', str(uuid4()))
+        return obj
+
+    @property
+    def id(self):
+        """The id of the instance."""
+        value = self._id
+        return str(UUID(bytes=value)) if type(value) is bytes else value
+
+    @property
+    def created_at(self):
+        """The creation datetime of the instance."""
+        value = self._created_at
+        return EPOCH + value * _microsecond if type(value) is int else value
+
+    @property
+    def updated_at(self):
+        """The last update datetime of the instance."""
+        value = self._updated_at
+        return EPOCH + value * _microsecond if type(value) is int else value
+
+    @property
+    def __dict__(self):
+        """A live dictionary view of the attributes of the instance."""
+        return SlotDict(self)
+
+    def _set(self, name, value):
+        """
+        Stores an attribute without marking the instance dirty.
+
+        :param name: The attribute name.
+        :param value: The attribute value.
+        """
+        if name == "id":
+            object.__setattr__(self, "_id", _pack_id(value))
+        elif name == "created_at" or name == "updated_at":
+            object.__setattr__(self, "_" + name, _pack_time(value))
+        elif name in self._fields or name.startswith("_"):
+            object.__setattr__(self, name, value)
+        else:
+            if self._extra is None:
+                object.__setattr__(self, "_extra", {})
+            self._extra[name] = value
+
+    def __setattr__(self, name, value):
+        """
+        Set an attribute and mark the instance as dirty in storage,
+        so the next save persists it.
+
+        :param name: The attribute name.
+        :param value: The attribute value.
+        """
+        models.storage.preserve(self)
+        self._set(name, value)
+        models.storage.touch(self)
+
+    def __getattr__(self, name):
+        """
+        Returns the attributes outside the schema, and the class
+        default of the schema attributes that are not set.
+
+        :param name: The attribute name.
+        """
+        if not name.startswith("_"):
+            extra = self._extra
+            if extra and name in extra:
+                return extra[name]
+            if name in self._defaults:
+                return self._defaults[name]
+        raise AttributeError(f"'{type(self).__name__}' object has no "
+                             f"attribute '{name}'")
+
+    def __delattr__(self, name):
+        """
+        Removes an attribute and marks the instance as dirty.
+
+        :param name: The attribute name.
+        """
+        models.storage.preserve(self)
+        if name in self._fields:
+            object.__delattr__(self, name)
+        elif self._extra and name in self._extra:
+            del self._extra[name]
+        else:
+            raise AttributeError(name)
+        models.storage.touch(self)
+
+    def __str__(self):
+        """
+        Return a string representation of the object.
+
+        :return: A formatted string containing class name
+        , id, and attribute dictionary.
+        """
+        return f"[{self.__class__.__name__}] ({self.id}) {self.__dict__}"
+
+    def save(self):
+        """
+        Update the `updated_at` attribute with the current datetime.
+        and call the save method on storage
+        """
+        self.updated_at = datetime.now()
+        models.storage.save()
+
+    @measured("to_dict")
+    def to_dict(self):
+        """
+        Convert the object's attributes to a
+        dictionary with the required format.
+
+        :return: A dictionary containing keys/values of instance attributes.
+        """
+        obj_dict = dict(SlotDict(self))
+        obj_dict['created_at'] = self.created_at.isoformat()
+        obj_dict['updated_at'] = self.updated_at.isoformat()
+        obj_dict['__class__'] = self.__class__.__name__
+        return obj_dict
+
+
+def compact_class(model, attributes):
+    """
+    Generates the compact class of a model class.
+
+    :param model: A model class, such as User.
+    :param attributes: The attributes of the class and their types,
+                       as in FileStorage.attributes().
+    :return: A class with the same name, built on CompactModel.
+    """
+    fields = tuple(name for name in attributes if name not in _base_fields)
+    namespace = {"__slots__": fields,
+                 "__module__": __name__,
+                 "__doc__": f"Compact version of {model.__name__}.",
+                 "_fields": fields,
+                 "_defaults": {name: getattr(model, name)
+                               for name in fields if hasattr(model, name)},
+                 "_model": model}
+    for klass in reversed(model.__mro__):
+        if klass is not object and klass.__name__ != "BaseModel":
+            for name, value in vars(klass).items():
+                if isinstance(value, property):
+                    namespace[name] = value
+    return type(model.__name__, (CompactModel,), namespace)
+
+
+def compact_classes(classes, attributes):
+    """
+    Generates the compact class of every model class.
+
+    :param classes: The model classes, as in FileStorage.classes().
+    :param attributes: The schema, as in FileStorage.attributes().
+    :return: A dictionary of class name to compact class.
+    """
+    return {name: compact_class(model, attributes.get(name, {}))
+            for name, model in classes.items()}
@@ -0,0 +1,157 @@
+#!/usr/bin/python3
+"""Defines an inverted index from amenity id to places."""
+from models.engine.bitmap import Bitmap
+from models.engine.index import Index
+
+
+class AmenityIndex(Index):
+    """
+    Maps every amenity id found in Place.amenity_ids to the bitmap of
+    the ordinals of the places that list it, so that the places having
+    several amenities are found by intersecting bitmaps.
+
+    Each indexed place gets a small integer ordinal; the ordinals of
+    deleted places are reused to keep the bitmaps dense.
+    """
+
+    classes = ("Place",)
+
+    def clear(self):
+        """Empties the index."""
+        self.bitmaps = {}
+        self.amenities = {}
+        self.ordinals = {}
+        self.keys = []
+        self.free = []
+
+    def build(self, items):
+        """
+        Fills the empty index, building each bitmap at once.
+
+        :param items: A list of (key, object) pairs.
+        """
+        ordinals = {}
+        for key, obj in items:
+            ids = self.__amenity_ids(obj)
+            ordinal = len(self.keys)
+            self.keys.append(key)
+            self.ordinals[key] = ordinal
+            self.amenities[key] = ids
+            for amenity_id in ids:
+                ordinals.setdefault(amenity_id, []).append(ordinal)
+        self.bitmaps = {amenity_id: Bitmap(values)
+                        for amenity_id, values in ordinals.items()}
+
+    @staticmethod
+    def __amenity_ids(obj):
+        """Returns the set of the amenity ids of a place."""
+        ids = getattr(obj, "amenity_ids", None)
+        if not isinstance(ids, list):
+            return frozenset()
+        return frozenset(value for value in ids if type(value) is str)
+
+    def add(self, key, obj):
+        """
+        Adds or updates the amenities of a place.
+
+        :param key: The <class name>.<id> key of the place.
+        :param obj: The place.
+        """
+        ids = self.__amenity_ids(obj)
+        ordinal = self.ordinals.get(key)
+        if ordinal is None:
+            if self.free:
+                ordinal = self.free.pop()
+                self.keys[ordinal] = key
+            else:
+                ordinal = len(self.keys)
+                self.keys.append(key)
+            self.ordinals[key] = ordinal
+        old = self.amenities.get(key, frozenset())
+        for amenity_id in old - ids:
+            self.__discard(amenity_id, ordinal)
+        for amenity_id in ids - old:
+            self.bitmaps.setdefault(amenity_id, Bitmap()).add(ordinal)
+        self.amenities[key] = ids
+
+    def remove(self, key):
+        """
+        Removes a place, if it is indexed.
+
+        :param key: The <class name>.<id> key of the place.
+        """
+        ordinal = self.ordinals.pop(key, None)
+        if ordinal is None:
+            return
+        for amenity_id in self.amenities.pop(key):
+            self.__discard(amenity_id, ordinal)
+        self.keys[ordinal] = None
+        self.free.append(ordinal)
+
+    def __discard(self, amenity_id, ordinal):
+        """Removes an ordinal from the bitmap of an amenity."""
+        bitmap = self.bitmaps[amenity_id]
+        bitmap.discard(ordinal)
+        if not len(bitmap):
+            del self.bitmaps[amenity_id]
+
+    def bitmap(self, *amenities):
+        """
+        Returns the bitmap of the places having every amenity.
+
+        :param amenities: Amenity ids or Amenity objects.
+        :return: A Bitmap of ordinals, None for every place when no
+                 amenity is given.
+        """
+        self.refresh()
+        if not amenities:
+            return None
+        bitmaps = []
+        for amenity in amenities:
+            bitmap = self.bitmaps.get(getattr(amenity, "id", amenity))
+            if bitmap is None:
+                return Bitmap()
+            bitmaps.append(bitmap)
+        bitmaps.sort(key=len)
+        result = bitmaps[0]
+        for bitmap in bitmaps[1:]:
+            result = result & bitmap
+            if not result.chunks:
+                break
+        return result
+
+    def ids(self, *amenities):
+        """
+        Returns the ids of the places having every amenity.
+
+        :param amenities: Amenity ids or Amenity objects.
+        :return: A list of place ids.
+        """
+        bitmap = self.bitmap(*amenities)
+        if bitmap is None:
+            return [key.split(".", 1)[1] for key in self.ordinals]
+        keys = self.keys
+        return [keys[ordinal].split(".", 1)[1] for ordinal in bitmap]
+
+    def count(self, *amenities):
+        """
+        Returns the number of places having every amenity.
+
+        :param amenities: Amenity ids or Amenity objects.
+        """
+        bitmap = self.bitmap(*amenities)
+        return len(self.ordinals) if bitmap is None else len(bitmap)
+
+    def places(self, *amenities):
+        """
+        Returns the places having every amenity.
+
+        :param amenities: Amenity ids or Amenity objects.
+        :return: A list of places.
+        """
+        objs = []
+        for place_id in self.ids(*amenities):
+            obj = self.storage.get("Place", place_id)
+            if obj is not None:
+                objs.append(obj)
+        return objs
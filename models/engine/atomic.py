@@ -0,0 +1,63 @@
+#!/usr/bin/python3
+"""Defines crash-safe file writes for the storage engines."""
+import contextlib
+import os
+import tempfile
+
+_umask = os.umask(0)
+os.umask(_umask)
+
+
+def sync_directory(path):
+    """
+    Flushes the directory entry of path to disk, so that a rename
+    into it survives a crash.
+
+    :param path: A path in the directory.
+    """
+    try:
+        fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+@contextlib.contextmanager
+def atomic_open(path, mode='w', sync=False):
+    """
+    Opens a temporary file next to path and renames it over path
+    once it is written, so that path always holds either the old or
+    the new content. Nothing is replaced if writing fails.
+
+    :param path: The path of the file to replace.
+    :param mode: 'w' for text or 'wb' for binary.
+    :param sync: fsync the file and its directory before returning.
+    :return: A context manager yielding the open temporary file.
+    """
+    directory, name = os.path.split(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{name}.", suffix=".tmp",
+                                    dir=directory)
+    try:
+        try:
+            os.chmod(tmp_path, os.stat(path).st_mode & 0o777)
+        except FileNotFoundError:
+            os.chmod(tmp_path, 0o666 & ~_umask)
+        with os.fdopen(fd, mode) as file:
+            yield file
+            file.flush()
+            if sync:
+                os.fsync(file.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+    if sync:
+        sync_directory(path)
@@ -0,0 +1,493 @@
+#!/usr/bin/python3
+"""Defines a compact binary format for the records of FileStorage.
+
+Layout of a file:
+    magic "HBNB", version byte
+    class table: for each class, its name and its fields with a
+                 type code (s: str, i: int, f: float, l: list of str)
+    string table: the strings shared by the records
+    record count, then the records in blocks of up to block_size
+
+A block holds the class tag of each of its records, then the columns
+of the records of each class: their ids (16 bytes for uuids),
+created_at, updated_at, and for each field the rows that have it and
+its values. Values that do not fit the schema are kept as JSON.
+Strings are stored as indexes in the string table, and each column is
+an array of the narrowest type that holds it, unpacked at once with
+array.frombytes() when the file is read.
+"""
+import json
+import re
+import sys
+from array import array
+from collections import Counter
+from itertools import accumulate, chain, islice
+
+MAGIC = b"HBNB"
+VERSION = 2
+BASE_FIELDS = ("id", "created_at", "updated_at", "__class__")
+TYPE_CODES = {str: "s", int: "i", float: "f", list: "l"}
+# number of records encoded and decoded at a time
+block_size = 10000
+_uuid = re.compile(r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-"
+                   r"[0-9a-f]{12}")
+_uuids = re.compile(f"(?:{_uuid.pattern})*")
+_types = {code: kind for kind, code in TYPE_CODES.items()}
+_missing = object()
+_array_codes = "bBhHiIqQd"
+_swap = sys.byteorder == "big"
+
+
+def _fits(code, value):
+    """
+    Tells whether value can be stored as a field of type code.
+
+    :param code: The type code of the field.
+    :param value: The value of the field.
+    :return: True if the value matches the type exactly.
+    """
+    if code == "l":
+        return (type(value) is list and
+                all(type(item) is str for item in value))
+    if code == "i":
+        return type(value) is int and -1 << 63 <= value < 1 << 63
+    return type(value) is _types[code]
+
+
+def _all_fit(code, values):
+    """
+    Tells whether every value of a column can be stored as a field of
+    type code, checking the types of the whole column at once.
+
+    :param code: The type code of the field.
+    :param values: The values of the field, one per record.
+    :return: True if they all match the type exactly.
+    """
+    if set(map(type, values)) != {_types[code]}:
+        return False
+    if code == "i":
+        return -1 << 63 <= min(values) and max(values) < 1 << 63
+    if code == "l":
+        return set(map(type, chain.from_iterable(values))) <= {str}
+    return True
+
+
+def _varint(out, n):
+    """
+    Appends the unsigned integer n to out in LEB128.
+
+    :param out: The bytearray to append to.
+    :param n: A non-negative integer.
+    """
+    while n > 0x7f:
+        out.append((n & 0x7f) | 0x80)
+        n >>= 7
+    out.append(n)
+
+
+def _text(out, s):
+    """
+    Appends the string s to out, prefixed with its length.
+
+    :param out: The bytearray to append to.
+    :param s: The string.
+    """
+    data = s.encode("utf-8")
+    _varint(out, len(data))
+    out += data
+
+
+def _array(out, values, code=None):
+    """
+    Appends values to out as a little-endian array, prefixed with its
+    type code.
+
+    :param out: The bytearray to append to.
+    :param values: A list of numbers.
+    :param code: The array type code, by default the narrowest
+                 integer type that holds every value.
+    """
+    if code is None:
+        low, high = (min(values), max(values)) if values else (0, 0)
+        for code in "BHIQ" if low >= 0 else "bhiq":
+            bits = array(code).itemsize * 8 - code.islower()
+            if -1 << bits <= low and high < 1 << bits:
+                break
+    data = array(code, values)
+    if _swap:
+        data.byteswap()
+    out.append(ord(code))
+    out += data.tobytes()
+
+
+def _column(out, column, count, code="s"):
+    """
+    Appends a column of a class that has count records in the block:
+    the number of rows that have a value, the rows unless that is
+    none or all of them, then the values.
+
+    :param out: The bytearray to append to.
+    :param column: A (rows, values) tuple of lists.
+    :param count: The number of records of the class in the block.
+    :param code: The type code of the values; strings are indexes.
+    """
+    rows, values = column
+    _varint(out, len(rows))
+    if not rows:
+        return
+    if len(rows) < count:
+        _array(out, rows)
+    if code == "f":
+        _array(out, values, "d")
+    elif code == "l":
+        _array(out, [len(value) for value in values])
+        _array(out, [item for value in values for item in value])
+    else:
+        _array(out, values)
+
+
+class Encoder:
+    """
+    Encodes blocks of to_dict() records, collecting the class layouts
+    and the string table as it goes.
+    """
+
+    def __init__(self, attributes):
+        """
+        Initialize the encoder.
+
+        :param attributes: The schema, as returned by
+                           FileStorage.attributes().
+        """
+        self.attributes = attributes
+        self.layouts = {}
+        self.strings = {}
+        self.body = bytearray()
+        self.count = 0
+
+    def layout(self, cls_name):
+        """
+        Returns the tag, fields and field names of cls_name, adding it
+        to the class table the first time it is seen.
+
+        :param cls_name: The class name.
+        :return: A (tag, [(field, type code)], {field}) tuple; the
+                 names include BASE_FIELDS.
+        """
+        if cls_name not in self.layouts:
+            fields = [(name, TYPE_CODES[kind]) for name, kind in
+                      self.attributes.get(cls_name, {}).items()
+                      if name not in BASE_FIELDS and kind in TYPE_CODES]
+            names = {name for name, code in fields}.union(BASE_FIELDS)
+            self.layouts[cls_name] = (len(self.layouts), fields, names)
+        return self.layouts[cls_name]
+
+    def indexes(self, values):
+        """
+        Returns the indexes of values in the string table, adding the
+        strings seen for the first time.
+
+        :param values: A list of strings.
+        """
+        strings = self.strings
+        add = strings.setdefault
+        return [add(s, len(strings)) for s in values]
+
+    def add(self, records):
+        """
+        Encodes a block of records.
+
+        :param records: A list of up to block_size records, as
+                        returned by to_dict().
+        """
+        tags = []
+        tables = {}
+        for record in records:
+            tag = self.layout(record["__class__"])[0]
+            tags.append(tag)
+            tables.setdefault(tag, []).append(record)
+        _varint(self.body, len(tags))
+        _array(self.body, tags)
+        for tag, records in sorted(tables.items()):
+            self.table(records, *self.layout(records[0]["__class__"])[1:])
+        self.count += len(tags)
+
+    def table(self, records, fields, names):
+        """
+        Encodes the columns of the records of one class in a block.
+
+        :param records: The records, in file order.
+        :param fields: The [(field, type code)] of the class.
+        :param names: The field names of the class and BASE_FIELDS.
+        """
+        out = self.body
+        count = len(records)
+        ids = [record["id"] for record in records]
+        if set(map(type, ids)) == {str} and set(map(len, ids)) == {36} \
+                and _uuids.fullmatch("".join(ids)):
+            uuids, ids = (range(count), ids), ((), ())
+        else:
+            uuids = ([], [])
+            text = ([], [])
+            for row, obj_id in enumerate(ids):
+                column = uuids if type(obj_id) is str and \
+                    _uuid.fullmatch(obj_id) else text
+                column[0].append(row)
+                column[1].append(obj_id)
+            ids = (text[0], self.indexes(text[1]))
+        _varint(out, len(uuids[0]))
+        if 0 < len(uuids[0]) < count:
+            _array(out, uuids[0])
+        out += bytes.fromhex("".join(uuids[1]).replace("-", ""))
+        _column(out, ids, count)
+        _array(out, self.indexes([record["created_at"]
+                                  for record in records]))
+        _array(out, self.indexes([record["updated_at"]
+                                  for record in records]))
+        extras = {}
+        for name, code in fields:
+            values = [record.get(name, _missing) for record in records]
+            if _all_fit(code, values):
+                rows = range(count)
+            else:
+                rows = []
+                kept = []
+                for row, value in enumerate(values):
+                    if value is _missing:
+                        continue
+                    if _fits(code, value):
+                        rows.append(row)
+                        kept.append(value)
+                    else:
+                        extras.setdefault(row, {})[name] = value
+                values = kept
+            if code == "s":
+                values = self.indexes(values)
+            elif code == "l":
+                values = [self.indexes(value) for value in values]
+            _column(out, (rows, values), count, code)
+        others = set().union(*records) - names
+        if others:
+            for row, record in enumerate(records):
+                for name in others.intersection(record):
+                    extras.setdefault(row, {})[name] = record[name]
+        rows = sorted(extras)
+        _column(out, (rows, self.indexes([json.dumps(extras[row])
+                                          for row in rows])), count)
+
+    def write(self, file):
+        """
+        Writes the encoded records to a binary file.
+
+        :param file: A file opened for writing in binary mode.
+        :return: The number of bytes written.
+        """
+        head = bytearray(MAGIC)
+        head.append(VERSION)
+        _varint(head, len(self.layouts))
+        for cls_name, (tag, fields, names) in self.layouts.items():
+            _text(head, cls_name)
+            _varint(head, len(fields))
+            for name, code in fields:
+                _text(head, name)
+                head += code.encode("ascii")
+        strings = [s.encode("utf-8") for s in self.strings]
+        _varint(head, len(strings))
+        _array(head, [len(data) for data in strings])
+        head += b"".join(strings)
+        _varint(head, self.count)
+        file.write(head)
+        file.write(self.body)
+        return len(head) + len(self.body)
+
+
+def dump(records, file, attributes):
+    """
+    Writes records to a binary file.
+
+    :param records: An iterable of to_dict() records.
+    :param file: A file opened for writing in binary mode.
+    :param attributes: The schema, as returned by
+                       FileStorage.attributes().
+    :return: The number of records and bytes written.
+    """
+    encoder = Encoder(attributes)
+    records = iter(records)
+    block = list(islice(records, block_size))
+    while block:
+        encoder.add(block)
+        block = list(islice(records, block_size))
+    return encoder.count, encoder.write(file)
+
+
+class Reader:
+    """
+    Reads the varints, strings and columns of a binary file in
+    fixed-size chunks.
+    """
+
+    def __init__(self, file, chunk_size=65536):
+        """
+        Initialize the reader.
+
+        :param file: A file opened for reading in binary mode.
+        :param chunk_size: The number of bytes read at a time.
+        """
+        self.file = file
+        self.chunk_size = chunk_size
+        self.buf = b""
+        self.pos = 0
+
+    def read(self, n):
+        """
+        Returns the next n bytes.
+
+        :raises ValueError: If the file ends before n bytes.
+        """
+        while len(self.buf) - self.pos < n:
+            chunk = self.file.read(max(self.chunk_size, n))
+            if not chunk:
+                raise ValueError("truncated binary storage file")
+            self.buf = self.buf[self.pos:] + chunk
+            self.pos = 0
+        data = self.buf[self.pos:self.pos + n]
+        self.pos += n
+        return data
+
+    def varint(self):
+        """Returns the next unsigned varint."""
+        n = shift = 0
+        while True:
+            byte = self.read(1)[0]
+            n |= (byte & 0x7f) << shift
+            if byte < 0x80:
+                return n
+            shift += 7
+
+    def text(self):
+        """Returns the next length-prefixed string."""
+        return self.read(self.varint()).decode("utf-8")
+
+    def array(self, count):
+        """
+        Returns the next array of count numbers.
+
+        :raises ValueError: If its type code is unknown.
+        """
+        code = chr(self.read(1)[0])
+        if code not in _array_codes:
+            raise ValueError("corrupt binary storage file")
+        values = array(code)
+        values.frombytes(self.read(count * values.itemsize))
+        if _swap:
+            values.byteswap()
+        return values
+
+    def strings(self, count):
+        """Returns the next count strings of the string table."""
+        ends = list(accumulate(self.array(count)))
+        data = self.read(ends[-1] if ends else 0)
+        starts = [0] + ends
+        if data.isascii():
+            data = data.decode("ascii")
+            return [data[start:end] for start, end in zip(starts, ends)]
+        return [data[start:end].decode("utf-8")
+                for start, end in zip(starts, ends)]
+
+    def rows(self, count):
+        """Returns the rows of the next column of count records."""
+        size = self.varint()
+        if size == 0 or size == count:
+            return range(size)
+        return self.array(size)
+
+    def column(self, count, code, strings):
+        """
+        Returns the next column of count records.
+
+        :param count: The number of records of the class in the block.
+        :param code: The type code of the values.
+        :param strings: The string table.
+        :return: An iterator of (row, value) pairs.
+        """
+        rows = self.rows(count)
+        if not rows:
+            return iter(())
+        if code == "s":
+            values = map(strings.__getitem__, self.array(len(rows)))
+        elif code == "l":
+            sizes = self.array(len(rows))
+            items = map(strings.__getitem__, self.array(sum(sizes)))
+            values = [list(islice(items, size)) for size in sizes]
+        else:
+            values = self.array(len(rows))
+        return zip(rows, values)
+
+
+def _decode(reader, count, layout, strings):
+    """
+    Decodes the columns of the records of one class in a block.
+
+    :param reader: The Reader of the file.
+    :param count: The number of records of the class in the block.
+    :param layout: The (class name, fields) of the class.
+    :param strings: The string table.
+    :return: The records, as returned by to_dict(), in file order.
+    """
+    cls_name, fields = layout
+    ids = [None] * count
+    rows = reader.rows(count)
+    digits = reader.read(16 * len(rows)).hex()
+    for row, start in zip(rows, range(0, len(digits), 32)):
+        h = digits[start:start + 32]
+        ids[row] = f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
+    for row, obj_id in reader.column(count, "s", strings):
+        ids[row] = obj_id
+    created_at = reader.array(count)
+    updated_at = reader.array(count)
+    records = [{"id": obj_id, "created_at": strings[created],
+                "updated_at": strings[updated]} for obj_id, created, updated
+               in zip(ids, created_at, updated_at)]
+    for name, code in fields:
+        for row, value in reader.column(count, code, strings):
+            records[row][name] = value
+    for row, extras in reader.column(count, "s", strings):
+        records[row].update(json.loads(extras))
+    for record in records:
+        record["__class__"] = cls_name
+    return records
+
+
+def iter_records(file):
+    """
+    Yields the <class name>.<id> keys and records of a binary file,
+    decoding them a block at a time.
+
+    :param file: A file opened for reading in binary mode.
+    :raises ValueError: If the file is not a binary storage file.
+    :return: An iterator of (key, record) pairs.
+    """
+    reader = Reader(file)
+    if reader.read(len(MAGIC)) != MAGIC:
+        raise ValueError("not a binary storage file")
+    if reader.read(1)[0] != VERSION:
+        raise ValueError("unsupported binary storage version")
+    layouts = []
+    for i in range(reader.varint()):
+        cls_name = reader.text()
+        fields = [(reader.text(), reader.read(1).decode("ascii"))
+                  for j in range(reader.varint())]
+        layouts.append((cls_name, fields))
+    strings = reader.strings(reader.varint())
+    remaining = reader.varint()
+    while remaining:
+        count = reader.varint()
+        if not 0 < count <= remaining:
+            raise ValueError("corrupt binary storage file")
+        tags = reader.array(count)
+        tables = {tag: iter(_decode(reader, size, layouts[tag], strings))
+                  for tag, size in sorted(Counter(tags).items())}
+        for tag in tags:
+            record = next(tables[tag])
+            yield f"{record['__class__']}.{record['id']}", record
+        remaining -= count
@@ -0,0 +1,170 @@
+#!/usr/bin/python3
+"""Defines a compressed bitmap of non-negative integers.
+
+The integers are split in chunks by their high 16 bits, as in Roaring
+bitmaps. A chunk with up to 4096 integers is a sorted array of their
+low 16 bits (2 bytes each); a denser chunk is a 65536-bit Python int,
+so that two dense chunks intersect with a single & in C.
+"""
+from array import array
+from bisect import bisect_left
+
+ARRAY_MAX = 4096
+CHUNK_BYTES = 8192
+_byte_bits = [tuple(bit for bit in range(8) if byte >> bit & 1)
+              for byte in range(256)]
+
+
+def _popcount(bits):
+    """Returns the number of bits set in bits."""
+    return bin(bits).count("1")
+
+
+def _to_array(bits):
+    """Returns the sorted positions of the bits set in a dense chunk."""
+    data = bits.to_bytes(CHUNK_BYTES, "little")
+    return array("H", [i * 8 + bit for i, byte in enumerate(data) if byte
+                       for bit in _byte_bits[byte]])
+
+
+def _to_bits(values):
+    """Returns the dense chunk of an array of low bits."""
+    data = bytearray(CHUNK_BYTES)
+    for value in values:
+        data[value >> 3] |= 1 << (value & 7)
+    return int.from_bytes(data, "little")
+
+
+class Bitmap:
+    """A compressed set of non-negative integers."""
+
+    __slots__ = ("chunks", "counts")
+
+    def __init__(self, values=()):
+        """
+        Initialize the bitmap.
+
+        :param values: The integers to add.
+        """
+        self.chunks = {}
+        self.counts = {}
+        lows = {}
+        for value in values:
+            lows.setdefault(value >> 16, set()).add(value & 0xffff)
+        for high, chunk in lows.items():
+            if len(chunk) > ARRAY_MAX:
+                self.chunks[high] = _to_bits(chunk)
+            else:
+                self.chunks[high] = array("H", sorted(chunk))
+            self.counts[high] = len(chunk)
+
+    def __len__(self):
+        """Returns the number of integers in the bitmap."""
+        return sum(self.counts.values())
+
+    def __contains__(self, value):
+        """Tells whether value is in the bitmap."""
+        chunk = self.chunks.get(value >> 16)
+        low = value & 0xffff
+        if chunk is None:
+            return False
+        if type(chunk) is int:
+            return bool(chunk >> low & 1)
+        i = bisect_left(chunk, low)
+        return i < len(chunk) and chunk[i] == low
+
+    def __iter__(self):
+        """Yields the integers in increasing order."""
+        for high in sorted(self.chunks):
+            chunk = self.chunks[high]
+            if type(chunk) is int:
+                chunk = _to_array(chunk)
+            base = high << 16
+            for low in chunk:
+                yield base | low
+
+    def __eq__(self, other):
+        """Tells whether two bitmaps hold the same integers."""
+        return isinstance(other, Bitmap) and list(self) == list(other)
+
+    def add(self, value):
+        """
+        Adds an integer to the bitmap.
+
+        :param value: A non-negative integer.
+        """
+        high, low = value >> 16, value & 0xffff
+        chunk = self.chunks.get(high)
+        if chunk is None:
+            self.chunks[high] = array("H", [low])
+            self.counts[high] = 1
+        elif type(chunk) is int:
+            if not chunk >> low & 1:
+                self.chunks[high] = chunk | 1 << low
+                self.counts[high] += 1
+        else:
+            i = bisect_left(chunk, low)
+            if i < len(chunk) and chunk[i] == low:
+                return
+            chunk.insert(i, low)
+            self.counts[high] += 1
+            if len(chunk) > ARRAY_MAX:
+                self.chunks[high] = _to_bits(chunk)
+
+    def discard(self, value):
+        """
+        Removes an integer from the bitmap if it is there.
+
+        :param value: A non-negative integer.
+        """
+        high, low = value >> 16, value & 0xffff
+        chunk = self.chunks.get(high)
+        if chunk is None:
+            return
+        if type(chunk) is int:
+            if not chunk >> low & 1:
+                return
+            chunk &= ~(1 << low)
+            self.counts[high] -= 1
+            if self.counts[high] <= ARRAY_MAX:
+                chunk = _to_array(chunk)
+            self.chunks[high] = chunk
+        else:
+            i = bisect_left(chunk, low)
+            if i == len(chunk) or chunk[i] != low:
+                return
+            del chunk[i]
+            self.counts[high] -= 1
+        if not self.counts[high]:
+            del self.chunks[high]
+            del self.counts[high]
+
+    def __and__(self, other):
+        """Returns the intersection of two bitmaps."""
+        result = Bitmap()
+        if len(other.chunks) < len(self.chunks):
+            self, other = other, self
+        for high, chunk in self.chunks.items():
+            other_chunk = other.chunks.get(high)
+            if other_chunk is None:
+                continue
+            if type(chunk) is int and type(other_chunk) is int:
+                chunk = chunk & other_chunk
+                count = _popcount(chunk)
+                if count and count <= ARRAY_MAX:
+                    chunk = _to_array(chunk)
+            else:
+                if type(chunk) is int:
+                    chunk, other_chunk = other_chunk, chunk
+                if type(other_chunk) is int:
+                    data = other_chunk.to_bytes(CHUNK_BYTES, "little")
+                    chunk = array("H", [low for low in chunk
+                                        if data[low >> 3] >> (low & 7) & 1])
+                else:
+                    chunk = array("H", sorted(set(chunk).intersection(
+                        other_chunk)))
+                count = len(chunk)
+            if count:
+                result.chunks[high] = chunk
+                result.counts[high] = count
+        return result
@@ -0,0 +1,129 @@
+#!/usr/bin/python3
+"""Defines the conversion of console values to attribute types.
+
+compile_coercions() turns the schema of FileStorage.attributes() into
+a table of converters, one per attribute of each class, built once.
+Literals typed in the console are read with parse_literal(), which
+never evaluates code.
+"""
+import ast
+import datetime
+import json
+from models.base_model import parse_datetime
+
+
+def _reject_constant(name):
+    """Rejects NaN and Infinity, which are not Python literals."""
+    raise ValueError(f"{name} is not a literal")
+
+
+_json_loads = json.JSONDecoder(parse_constant=_reject_constant).decode
+
+
+def parse_literal(text):
+    """
+    Reads a Python literal: a string, number, tuple, list, dict, set,
+    boolean or None. Text that is also valid JSON, the usual case of
+    dictionaries with double-quoted strings, is read by the faster
+    JSON decoder, so true, false and null are accepted too.
+
+    :param text: The literal.
+    :return: The value.
+    :raises ValueError: If text is not a literal.
+    """
+    try:
+        return _json_loads(text)
+    except ValueError:
+        pass
+    try:
+        return ast.literal_eval(text.strip())
+    except (SyntaxError, ValueError, TypeError, MemoryError,
+            RecursionError):
+        raise ValueError("value is not a literal") from None
+
+
+def to_str(value):
+    """Converts value to a string attribute."""
+    return value if type(value) is str else str(value)
+
+
+def to_int(value):
+    """
+    Converts value to an int attribute.
+
+    :raises ValueError: If value is not a number.
+    """
+    if type(value) is int:
+        return value
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise ValueError("value is not an int") from None
+
+
+def to_float(value):
+    """
+    Converts value to a float attribute.
+
+    :raises ValueError: If value is not a number.
+    """
+    if type(value) is float:
+        return value
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        raise ValueError("value is not a float") from None
+
+
+def to_list(value):
+    """
+    Converts value, a list or the text of one, to a list attribute.
+
+    :raises ValueError: If value is not a list.
+    """
+    if type(value) is str:
+        try:
+            value = parse_literal(value)
+        except ValueError:
+            pass
+    if type(value) is not list:
+        raise ValueError("value is not a list")
+    return value
+
+
+def to_datetime(value):
+    """
+    Converts value, a datetime or its ISO text, to a timestamp.
+
+    :raises ValueError: If value is not a timestamp.
+    """
+    if type(value) is datetime.datetime:
+        return value
+    try:
+        return parse_datetime(value)
+    except (TypeError, ValueError):
+        raise ValueError("value is not a datetime") from None
+
+
+COERCIONS = {str: to_str,
+             int: to_int,
+             float: to_float,
+             list: to_list,
+             datetime.datetime: to_datetime}
+
+
+def compile_coercions(attributes):
+    """
+    Builds the converter of every attribute of every class.
+
+    :param attributes: The dictionary returned by
+                       FileStorage.attributes(); the fields of
+                       "BaseModel" are shared by every class.
+    :return: A dictionary of class name to a dictionary of attribute
+             name to converter. Attributes missing from the schema
+             have no converter and are set as they are.
+    """
+    base = attributes.get("BaseModel", {})
+    return {name: {field: COERCIONS.get(kind, to_str)
+                   for field, kind in dict(base, **fields).items()}
+            for name, fields in attributes.items()}
@@ -0,0 +1,176 @@
+#!/usr/bin/python3
+"""Defines a columnar side store for the numeric fields of Place.
+
+numpy is an optional dependency: it is only needed to create a
+ColumnStore.
+"""
+import math
+from models.engine.index import Index
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+def _number(value):
+    """Returns value as a float, NaN if it is not a number."""
+    if type(value) is int or type(value) is float:
+        return float(value)
+    return math.nan
+
+
+class ColumnStore(Index):
+    """
+    Keeps numeric fields of the objects of one class in NumPy arrays,
+    one per field, to filter them with vectorized comparisons.
+
+    Every column holds float64 values (exact for integers up to 2**53);
+    a missing or non-numeric value is stored as NaN and matches no
+    range. Deleting an object moves the last row into its place.
+
+    Usage:
+        columns = ColumnStore(storage)
+        storage.add_index(columns)
+        columns.ids(price_by_night=(50, 120), number_rooms=(2, None))
+    """
+
+    fields = ("number_rooms", "number_bathrooms", "max_guest",
+              "price_by_night", "latitude", "longitude")
+
+    def __init__(self, storage, cls_name="Place", fields=None):
+        """
+        Initialize the store.
+
+        :param storage: The storage engine the store is attached to.
+        :param cls_name: The name of the class of the stored objects.
+        :param fields: The names of the numeric fields to store.
+        :raises ImportError: If numpy is not installed.
+        """
+        if numpy is None:
+            raise ImportError("ColumnStore requires numpy")
+        super().__init__(storage)
+        self.cls_name = cls_name
+        self.classes = (cls_name,)
+        if fields is not None:
+            self.fields = tuple(fields)
+        self.clear()
+
+    def clear(self):
+        """Empties the store."""
+        self.size = 0
+        self.keys = []
+        self.rows = {}
+        self.columns = {field: numpy.empty(0) for field in self.fields}
+
+    def build(self, items):
+        """
+        Fills the empty store, one array per field at once.
+
+        :param items: A list of (key, object) pairs.
+        """
+        self.keys = [key for key, obj in items]
+        self.rows = {key: row for row, key in enumerate(self.keys)}
+        self.size = len(self.keys)
+        objs = [obj for key, obj in items]
+        for field in self.fields:
+            values = [getattr(obj, field, None) for obj in objs]
+            if not all(type(v) is int or type(v) is float for v in values):
+                values = [_number(v) for v in values]
+            self.columns[field] = numpy.array(values, dtype=numpy.float64)
+
+    def add(self, key, obj):
+        """
+        Adds or updates the row of an object.
+
+        :param key: The <class name>.<id> key of the object.
+        :param obj: The object.
+        """
+        row = self.rows.get(key)
+        if row is None:
+            row = self.size
+            if row == len(self.columns[self.fields[0]]):
+                capacity = max(16, row * 2)
+                for field, column in self.columns.items():
+                    self.columns[field] = numpy.resize(column, capacity)
+            self.rows[key] = row
+            self.keys.append(key)
+            self.size += 1
+        for field, column in self.columns.items():
+            column[row] = _number(getattr(obj, field, None))
+
+    def remove(self, key):
+        """
+        Removes the row of an object, if there is one.
+
+        :param key: The <class name>.<id> key of the object.
+        """
+        row = self.rows.pop(key, None)
+        if row is None:
+            return
+        last = self.size - 1
+        if row != last:
+            for column in self.columns.values():
+                column[row] = column[last]
+            moved = self.keys[last]
+            self.keys[row] = moved
+            self.rows[moved] = row
+        self.keys.pop()
+        self.size = last
+
+    def mask(self, **ranges):
+        """
+        Returns the boolean array of the rows that match every range.
+
+        :param ranges: For each field, a (low, high) tuple of inclusive
+                       bounds, where None leaves a side open, or a
+                       single value to match exactly.
+        :raises ValueError: If a field is not stored.
+        """
+        self.refresh()
+        mask = numpy.ones(self.size, dtype=bool)
+        for field, bounds in ranges.items():
+            if field not in self.columns:
+                raise ValueError(f"unknown column '{field}'")
+            if not isinstance(bounds, tuple):
+                bounds = (bounds, bounds)
+            low, high = bounds
+            values = self.columns[field][:self.size]
+            if low is not None:
+                mask &= values >= low
+            if high is not None:
+                mask &= values <= high
+        return mask
+
+    def count(self, **ranges):
+        """
+        Returns the number of objects that match every range.
+
+        :param ranges: The ranges, as for mask().
+        """
+        return int(numpy.count_nonzero(self.mask(**ranges)))
+
+    def ids(self, **ranges):
+        """
+        Returns the ids of the objects that match every range.
+
+        :param ranges: The ranges, as for mask().
+        :return: A list of ids, in no particular order.
+        """
+        rows = numpy.flatnonzero(self.mask(**ranges))
+        keys = self.keys
+        return [keys[row].split(".", 1)[1] for row in rows]
+
+    def objects(self, **ranges):
+        """
+        Returns the objects that match every range.
+
+        :param ranges: The ranges, as for mask().
+        :return: A dictionary of <class name>.<id> to object.
+        """
+        objs = {}
+        for obj_id in self.ids(**ranges):
+            obj = self.storage.get(self.cls_name, obj_id)
+            if obj is not None:
+                objs[f"{self.cls_name}.{obj_id}"] = obj
+        return objs
@@ -0,0 +1,517 @@
+#!/usr/bin/python3
+"""Defines the DBStorage engine, backed by SQLite."""
+import contextlib
+import json
+import sqlite3
+import weakref
+from models.engine.file_storage import FileStorage
+from models.engine.metrics import measured, metrics
+from models.engine.transaction import UndoLog
+
+
+class DBStorage:
+    """
+    A storage engine with the FileStorage API that keeps the objects
+    in a SQLite database, one table per class of classes().
+
+    Only the objects in use are held in memory: clean objects are
+    weakly referenced, created, modified and deleted ones are kept
+    until they are written to the database.
+    """
+
+    __indexes = {"City": ("state_id",),
+                 "Place": ("city_id", "user_id"),
+                 "Review": ("place_id", "user_id"),
+                 "User": ("email",)}
+    __column_types = {str: "TEXT", int: "INTEGER", float: "REAL",
+                      list: "TEXT"}
+    __synchronous = {"none": "OFF", "flush": "FULL", "always": "EXTRA"}
+
+    classes = FileStorage.classes
+    attributes = FileStorage.attributes
+
+    def __init__(self):
+        """Initialize the engine, the database is opened by reload()."""
+        self.__options = {"path": "hbnb.db", "journal_mode": "wal",
+                          "durability": "flush", "metrics": False}
+        self.__connection = None
+        self.__objects = weakref.WeakValueDictionary()
+        self.__dirty = {}
+        self.__columns = {}
+        self.__attached = []
+        self.__undo = None
+
+    def configure(self, **options):
+        """
+        Update the storage options, applied by the next reload().
+
+        path: the path of the SQLite database.
+        journal_mode: the SQLite journal mode, "wal" or "delete".
+        durability: when SQLite syncs to disk, "none", "flush" (on
+                    every commit) or "always" (also the directory).
+        metrics: record the operation counts and latencies returned
+                 by stats(), applied at once.
+
+        :param options: Option names and their new values.
+        :raises TypeError: If an option name is unknown.
+        """
+        for name in options:
+            if name not in self.__options:
+                raise TypeError(f"unknown storage option '{name}'")
+        if options.get("journal_mode", "wal") not in ("wal", "delete"):
+            raise ValueError("unknown journal mode "
+                             f"'{options['journal_mode']}'")
+        if options.get("durability", "none") not in self.__synchronous:
+            raise ValueError("unknown durability "
+                             f"'{options['durability']}'")
+        self.__options.update(options)
+        metrics.enabled = self.__options["metrics"]
+
+    def all(self, cls=None):
+        """
+        Returns the stored objects, or only the objects of cls.
+
+        :param cls: A class or class name, None for every object.
+        :return: A dictionary of <class name>.<id> to object.
+        """
+        self.__flush()
+        names = self.classes() if cls is None else [self.__class_name(cls)]
+        objs = {}
+        for name in names:
+            if name not in self.__columns:
+                continue
+            cursor = self.__connect().execute(f'SELECT * FROM "{name}"')
+            for row in cursor:
+                obj = self.__build(name, cursor.description, row)
+                objs[f"{name}.{obj.id}"] = obj
+        return objs
+
+    def scan(self, cls=None, after=None):
+        """
+        Yields the stored objects, or only the objects of cls, class
+        by class in id order, reading the rows as they are consumed.
+
+        :param cls: A class or class name, None for every object.
+        :param after: A <class name>.<id> key, to start after its
+                      object (a cursor).
+        :return: An iterator of objects.
+        :raises KeyError: If after is not the key of a stored object
+                          of cls.
+        """
+        self.__flush()
+        names = self.classes() if cls is None else [self.__class_name(cls)]
+        names = [name for name in names if name in self.__columns]
+        start = ""
+        if after is not None:
+            name, _, start = after.partition(".")
+            if name not in names or self.__connect().execute(
+                    f'SELECT 1 FROM "{name}" WHERE id = ?',
+                    (start,)).fetchone() is None:
+                raise KeyError(after)
+            names = names[names.index(name):]
+        return self.__scan(names, start)
+
+    def __scan(self, names, start):
+        """
+        Yields the objects of the classes names for scan(), starting
+        after the id start in the first class.
+
+        :param names: The class names.
+        :param start: An id of the first class, "" to start with it.
+        :return: An iterator of objects.
+        """
+        for name in names:
+            cursor = self.__connect().execute(
+                f'SELECT * FROM "{name}" WHERE id > ? ORDER BY id', (start,))
+            start = ""
+            for row in cursor:
+                yield self.__build(name, cursor.description, row)
+
+    def count(self, cls=None):
+        """
+        Returns the number of stored objects, or only of cls.
+
+        :param cls: A class or class name, None for every object.
+        :return: The number of objects.
+        """
+        self.__flush()
+        names = self.classes() if cls is None else [self.__class_name(cls)]
+        return sum(self.__connect().execute(
+            f'SELECT COUNT(*) FROM "{name}"').fetchone()[0]
+            for name in names if name in self.__columns)
+
+    def get(self, cls, id):
+        """
+        Returns the object of class cls with the given id.
+
+        :param cls: A class or class name.
+        :param id: The id of the object.
+        :return: The object, or None if it is not stored.
+        """
+        name = self.__class_name(cls)
+        key = f"{name}.{id}"
+        if key in self.__dirty:
+            return self.__dirty[key]
+        obj = self.__objects.get(key)
+        if obj is not None or name not in self.__columns:
+            return obj
+        cursor = self.__connect().execute(
+            f'SELECT * FROM "{name}" WHERE id = ?', (id,))
+        row = cursor.fetchone()
+        if row is None:
+            return None
+        return self.__build(name, cursor.description, row)
+
+    def related(self, cls, field, parent_id):
+        """
+        Returns the objects of class cls whose foreign key field holds
+        parent_id, found through the index of the column.
+
+        :param cls: A class or class name.
+        :param field: A column of cls, like "state_id".
+        :param parent_id: The id of the parent object.
+        :return: A list of objects.
+        """
+        name = self.__class_name(cls)
+        if field not in self.__columns.get(name, {}):
+            return []
+        self.__flush()
+        cursor = self.__connect().execute(
+            f'SELECT * FROM "{name}" WHERE "{field}" = ?', (parent_id,))
+        return [self.__build(name, cursor.description, row)
+                for row in cursor.fetchall()]
+
+    @measured("new")
+    def new(self, obj):
+        """
+        Adds obj to the objects to be written by the next save.
+
+        :param obj: An object to be stored.
+        """
+        self.__store(obj)
+
+    @measured("bulk_new")
+    def bulk_new(self, objs):
+        """
+        Stores many objects at once, as new() does for each of them.
+
+        :param objs: An iterable of objects to be stored.
+        :return: The number of objects stored.
+        """
+        count = 0
+        for obj in objs:
+            self.__store(obj)
+            count += 1
+        return count
+
+    def __store(self, obj):
+        """
+        Adds obj to the objects to be written, for new() and
+        bulk_new().
+
+        :param obj: An object to be stored.
+        """
+        key = f"{obj.__class__.__name__}.{obj.id}"
+        if self.__undo is not None:
+            self.__undo.record(key, self.__objects.get(key))
+        self.__objects[key] = obj
+        self.__dirty[key] = obj
+        self.__mark(key, obj)
+
+    def delete(self, obj=None):
+        """
+        Deletes obj from the database on the next save.
+
+        :param obj: The object to be removed.
+        """
+        if obj is None:
+            return
+        key = f"{obj.__class__.__name__}.{obj.id}"
+        if self.__undo is not None:
+            self.__undo.record(key, obj)
+        self.__objects.pop(key, None)
+        self.__dirty[key] = None
+        self.__mark(key, None)
+
+    def touch(self, obj):
+        """
+        Marks obj as changed so the next save persists it.
+        Objects that are not known to the engine are ignored.
+
+        :param obj: The object that has been modified.
+        """
+        key = f"{obj.__class__.__name__}.{obj.id}"
+        if self.__objects.get(key) is obj:
+            self.__dirty[key] = obj
+            self.__mark(key, obj)
+
+    def preserve(self, obj):
+        """
+        Records the state of obj before it is changed, if a
+        transaction is open; called by the models before they set an
+        attribute.
+
+        :param obj: The object about to be modified.
+        """
+        if self.__undo is None:
+            return
+        key = f"{obj.__class__.__name__}.{getattr(obj, 'id', None)}"
+        if self.__objects.get(key) is obj:
+            self.__undo.record(key, obj)
+
+    def begin(self):
+        """
+        Commits the pending changes, then opens a transaction: save()
+        only writes to the open SQLite transaction until commit(), and
+        rollback() undoes it.
+
+        :raises RuntimeError: If a transaction is already open.
+        """
+        if self.__undo is not None:
+            raise RuntimeError("a transaction is already open")
+        self.save()
+        self.__undo = UndoLog()
+
+    def in_transaction(self):
+        """Tells whether a transaction is open."""
+        return self.__undo is not None
+
+    def commit(self):
+        """
+        Closes the transaction and commits its changes.
+
+        :raises RuntimeError: If no transaction is open.
+        """
+        if self.__undo is None:
+            raise RuntimeError("no transaction is open")
+        self.__undo = None
+        self.save()
+
+    def rollback(self):
+        """
+        Closes the transaction, rolls back the SQLite transaction and
+        restores the objects in memory from the undo log.
+
+        :raises RuntimeError: If no transaction is open.
+        """
+        undo = self.__undo
+        if undo is None:
+            raise RuntimeError("no transaction is open")
+        self.__undo = None
+        self.__connect().rollback()
+        for key, obj in undo.restore():
+            if obj is None:
+                self.__objects.pop(key, None)
+            else:
+                self.__objects[key] = obj
+            self.__mark(key, obj)
+        self.__dirty = {}
+
+    transaction = FileStorage.transaction
+    stats = FileStorage.stats
+    reset_stats = FileStorage.reset_stats
+
+    def add_index(self, index):
+        """
+        Attaches a secondary index, kept in sync with the objects
+        created, changed and deleted from now on.
+
+        :param index: An instance of a subclass of Index.
+        """
+        index.invalidate()
+        self.__attached.append(index)
+
+    def index(self, cls):
+        """
+        Returns the attached index of class cls, attaching a new one
+        if there is none.
+
+        :param cls: A subclass of Index, built with the storage as its
+                    only argument.
+        :return: The index.
+        """
+        for index in self.__attached:
+            if type(index) is cls:
+                return index
+        index = cls(self)
+        self.add_index(index)
+        return index
+
+    def remove_index(self, index):
+        """
+        Detaches an index attached by add_index().
+
+        :param index: The index.
+        """
+        self.__attached.remove(index)
+
+    def indexes(self):
+        """Returns the list of the attached indexes."""
+        return list(self.__attached)
+
+    def __mark(self, key, obj):
+        """
+        Records a change in the indexes that cover key.
+
+        :param key: The <class name>.<id> key of the object.
+        :param obj: The object, None if it was deleted.
+        """
+        for index in self.__attached:
+            if index.covers(key):
+                index.mark(key, obj)
+
+    def dirty_count(self):
+        """Returns the number of objects changed since the last save."""
+        return len(self.__dirty)
+
+    @measured("save")
+    def save(self):
+        """
+        Writes the changed objects and commits the transaction; in a
+        transaction of begin(), the commit waits for commit().
+        """
+        self.__flush()
+        if self.__undo is None:
+            self.__connect().commit()
+
+    def flush(self):
+        """
+        Returns once every save is on disk; save() commits right
+        away, so there is nothing to wait for.
+        """
+
+    @measured("reload")
+    def reload(self):
+        """
+        Opens the database, creating the tables and indexes of the
+        classes of classes() if needed, and forgets the objects
+        loaded so far.
+        """
+        self.close()
+        connection = self.__connect()
+        connection.execute("PRAGMA journal_mode = "
+                           f"{self.__options['journal_mode']}")
+        synchronous = self.__synchronous[self.__options["durability"]]
+        connection.execute(f"PRAGMA synchronous = {synchronous}")
+        attributes = self.attributes()
+        for name in self.classes():
+            kinds = dict(attributes["BaseModel"])
+            kinds.update(attributes.get(name, {}))
+            kinds = {col: kind if kind in self.__column_types else str
+                     for col, kind in kinds.items()}
+            connection.execute(
+                f'CREATE TABLE IF NOT EXISTS "{name}" '
+                '(id TEXT PRIMARY KEY, extra TEXT)')
+            existing = {row[1] for row in connection.execute(
+                f'PRAGMA table_info("{name}")')}
+            for col, kind in kinds.items():
+                if col not in existing:
+                    connection.execute(
+                        f'ALTER TABLE "{name}" ADD COLUMN "{col}" '
+                        f'{self.__column_types[kind]}')
+            for col in self.__indexes.get(name, ()):
+                connection.execute(
+                    f'CREATE INDEX IF NOT EXISTS "{name}_{col}" '
+                    f'ON "{name}" ("{col}")')
+            self.__columns[name] = kinds
+        connection.commit()
+
+    def close(self):
+        """Closes the database connection, dropping unsaved changes."""
+        if self.__connection is not None:
+            self.__connection.close()
+            self.__connection = None
+        self.__objects = weakref.WeakValueDictionary()
+        self.__dirty = {}
+        self.__undo = None
+        for index in self.__attached:
+            index.invalidate()
+
+    def __connect(self):
+        """Returns the connection, opened once and reused."""
+        if self.__connection is None:
+            self.__connection = sqlite3.connect(self.__options["path"],
+                                                check_same_thread=False)
+        return self.__connection
+
+    @staticmethod
+    def __class_name(cls):
+        """
+        Returns the name of cls, which is a class or a class name.
+
+        :param cls: A class or class name.
+        :return: The class name.
+        """
+        return cls if isinstance(cls, str) else cls.__name__
+
+    def __flush(self):
+        """
+        Writes the changed objects to the open transaction, so that
+        queries see them before they are committed.
+        """
+        connection = self.__connect()
+        for key, obj in self.__dirty.items():
+            name, obj_id = key.split(".", 1)
+            if name not in self.__columns:
+                continue
+            if obj is None:
+                connection.execute(f'DELETE FROM "{name}" WHERE id = ?',
+                                   (obj_id,))
+            else:
+                row = self.__row(name, obj)
+                columns = ", ".join(f'"{col}"' for col in row)
+                connection.execute(
+                    f'INSERT OR REPLACE INTO "{name}" ({columns}) '
+                    f'VALUES ({", ".join("?" * len(row))})',
+                    tuple(row.values()))
+        self.__dirty = {}
+
+    def __row(self, name, obj):
+        """
+        Returns the column values of obj.
+
+        :param name: The class name of obj.
+        :param obj: The object.
+        :return: A dictionary of column name to value.
+        """
+        record = obj.to_dict()
+        del record["__class__"]
+        row = {}
+        extra = {}
+        for col, value in record.items():
+            kind = self.__columns[name].get(col)
+            if kind is None or type(value) is not kind:
+                extra[col] = value
+            elif kind is list:
+                row[col] = json.dumps(value)
+            else:
+                row[col] = value
+        row["extra"] = json.dumps(extra) if extra else None
+        return row
+
+    def __build(self, name, description, row):
+        """
+        Returns the object of a table row, reusing the instance
+        already in memory if there is one.
+
+        :param name: The class name.
+        :param description: The cursor description of the row.
+        :param row: The row values.
+        :return: The object.
+        """
+        record = dict(zip((col[0] for col in description), row))
+        key = f"{name}.{record['id']}"
+        obj = self.__objects.get(key)
+        if obj is not None:
+            return obj
+        extra = record.pop("extra")
+        record = {col: value for col, value in record.items()
+                  if value is not None}
+        for col, value in record.items():
+            if self.__columns[name].get(col) is list:
+                record[col] = json.loads(value)
+        if extra:
+            record.update(json.loads(extra))
+        obj = self.classes()[name].from_dict(record)
+        self.__objects[key] = obj
+        return obj
@@ -1,9 +1,28 @@
 #!usr/bin/python3
 
+import atexit
+import contextlib
+import datetime
+import functools
+import itertools
 import json
+import os
 import os.path
 import re
+import threading
+import time
+from types import MappingProxyType
 from models.base_model import BaseModel
+from models.compact import compact_classes
+from models.engine import binary_format
+from models.engine.atomic import atomic_open
+from models.engine.flusher import Flusher
+from models.engine.json_stream import iter_records, iter_spans
+from models.engine.metrics import measured, metrics
+from models.engine.relations import ForeignKeyIndex
+from models.engine.serializer import Serializer, compile_serializers
+from models.engine.serializer import write_records
+from models.engine.transaction import UndoLog
 from models.user import User
 from models.state import State
 from models.city import City
@@ -11,6 +30,25 @@ from models.place import Place
 from models.amenity import Amenity
 from models.review import Review
 
+_lock = threading.RLock()
+
+
+def synchronized(method):
+    """
+    Runs method holding the storage lock, so that no object is
+    stored, deleted or marked dirty while the write-behind thread is
+    writing them. Attributes are set without the lock: the writers
+    copy the attributes of each object before encoding them.
+
+    :param method: A FileStorage method.
+    :return: The wrapped method.
+    """
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        with _lock:
+            return method(*args, **kwargs)
+    return wrapper
+
 
 class FileStorage:
     """
@@ -20,6 +58,34 @@ class FileStorage:
 
     __file_path = "file.json"
     __objects = {}
+    __options = {"journal": False,
+                 "journal_limit": 10000,
+                 "lazy": False,
+                 "format": "json",
+                 "shard": False,
+                 "write_behind": False,
+                 "flush_interval": 1.0,
+                 "flush_threshold": 1000,
+                 "durability": "flush",
+                 "compact": False,
+                 "metrics": False}
+    __hydrate_batch = 1000
+    __raw = {}
+    __sources = []
+    __dirty = {}
+    __journal_size = 0
+    __flush_stats = {"dirty": 0, "written": 0, "bytes": 0, "seconds": 0.0}
+    __tracked = None
+    __view = None
+    __by_class = {}
+    __unsaved = set()
+    __save_pending = False
+    __flusher = None
+    __compact = None
+    __serializers = None
+    __undo = None
+    __undo_dirty = None
+    __indexes = []
 
     @staticmethod
     def camel_to_snake(name):
@@ -32,22 +98,549 @@ class FileStorage:
         name = re.sub('(.)([A-Z][a-z]+)', r'\1_\2', name)
         return re.sub('([a-z0-9])([A-Z])', r'\1_\2', name).lower()
 
-    def all(self):
+    def configure(self, **options):
+        """
+        Update the storage options.
+
+        journal: append changes to <file_path>.journal instead of
+                 rewriting the whole file on every save.
+        journal_limit: number of journal records after which the
+                       journal is folded back into the snapshot.
+        lazy: only note where reload() finds each record of the JSON
+              file, and decode it and build its instance when it is
+              first accessed. The records of the binary format and of
+              the journal are kept decoded.
+        format: "json" to store the objects in __file_path, "binary"
+                to store them in the compact format of binary_format,
+                next to it with a .bin extension.
+        shard: store each class in its own file (file.User.json, ...)
+               so that a save only rewrites the classes that changed.
+        write_behind: make save() return at once and let a background
+                      thread write the changes, see flush().
+        flush_interval: seconds between two background writes.
+        flush_threshold: number of dirty objects that triggers a
+                         background write before the interval ends.
+        durability: when to fsync, "none" (leave it to the OS),
+                    "flush" (once per save) or "always" (after every
+                    journal record). Data files are always replaced
+                    atomically.
+        compact: build the instances read from the file as the
+                 __slots__ classes of models.compact, which take less
+                 memory but are not instances of the model classes.
+        metrics: record the operation counts, latencies and bytes
+                 written and read returned by stats().
+
+        :param options: Option names and their new values.
+        :raises TypeError: If an option name is unknown.
+        """
+        for name in options:
+            if name not in FileStorage.__options:
+                raise TypeError(f"unknown storage option '{name}'")
+        if options.get("format", "json") not in ("json", "binary"):
+            raise ValueError(f"unknown storage format '{options['format']}'")
+        if options.get("durability", "none") not in ("none", "flush",
+                                                     "always"):
+            raise ValueError("unknown durability "
+                             f"'{options['durability']}'")
+        FileStorage.__options.update(options)
+        metrics.enabled = FileStorage.__options["metrics"]
+        if not options.get("write_behind", True):
+            self.__stop_flusher()
+
+    @synchronized
+    def all(self, cls=None):
+        """
+        Returns a read-only view of __objects, or a dictionary of the
+        objects of cls. Objects are stored and removed with new() and
+        delete(), which keep the class index and the dirty set.
+
+        :param cls: A class or class name, None for every object.
+        :return: A mapping of key to object.
+        """
+        self.__sync()
+        if cls is None:
+            if FileStorage.__raw:
+                self.__hydrate(list(FileStorage.__raw))
+            return FileStorage.__view
+        index = FileStorage.__by_class.get(self.__class_name(cls), {})
+        if FileStorage.__raw:
+            self.__hydrate([key for key, obj in index.items() if obj is None])
+        return dict(index)
+
+    def scan(self, cls=None, after=None):
+        """
+        Yields the stored objects, or only the objects of cls, class
+        by class in the order they were stored. Unlike all(), nothing
+        is gathered first: the keys are read and the records left by
+        a lazy reload are built a batch at a time.
+
+        :param cls: A class or class name, None for every object.
+        :param after: A <class name>.<id> key, to start after its
+                      object (a cursor).
+        :return: An iterator of objects.
+        :raises KeyError: If after is not the key of a stored object
+                          of cls.
+        """
+        with _lock:
+            self.__sync()
+            by_class = FileStorage.__by_class
+            names = list(by_class) if cls is None else \
+                [self.__class_name(cls)]
+            if after is not None:
+                name = after.split(".")[0]
+                if name not in names or after not in by_class.get(name, {}):
+                    raise KeyError(after)
+                names = names[names.index(name):]
+        return self.__scan(names, after)
+
+    def __scan(self, names, after):
+        """
+        Yields the objects of the classes names for scan(), starting
+        after the key after.
+
+        :param names: The class names.
+        :param after: A key of the first class, or None.
+        :return: An iterator of objects.
+        """
+        for name in names:
+            index = FileStorage.__by_class.get(name, {})
+            keys = iter(index)
+            if after is not None:
+                for key in keys:
+                    if key == after:
+                        break
+                after = None
+            while True:
+                with _lock:
+                    batch = list(itertools.islice(
+                        keys, FileStorage.__hydrate_batch))
+                    if FileStorage.__raw:
+                        self.__hydrate([key for key in batch
+                                        if key in FileStorage.__raw])
+                    objs = [index[key] for key in batch if key in index]
+                if not batch:
+                    break
+                yield from objs
+
+    @synchronized
+    def count(self, cls=None):
+        """
+        Returns the number of stored objects, or only of cls.
+
+        :param cls: A class or class name, None for every object.
+        :return: The number of objects.
+        """
+        self.__sync()
+        if cls is None:
+            return len(FileStorage.__objects) + len(FileStorage.__raw)
+        return len(FileStorage.__by_class.get(self.__class_name(cls), {}))
+
+    @synchronized
+    def get(self, cls, id):
+        """
+        Returns the object of class cls with the given id.
+
+        :param cls: A class or class name.
+        :param id: The id of the object.
+        :return: The object, or None if it is not stored.
         """
-        Returns the dictionary __objects.
+        self.__sync()
+        key = f"{self.__class_name(cls)}.{id}"
+        if key in FileStorage.__raw:
+            self.__hydrate([key])
+        return FileStorage.__objects.get(key)
 
-        :return: A dictionary containing all stored objects.
+    def related(self, cls, field, parent_id):
         """
-        return FileStorage.__objects
+        Returns the objects of class cls whose foreign key field holds
+        parent_id, found through the ForeignKeyIndex.
 
+        :param cls: A class or class name.
+        :param field: A foreign key of ForeignKeyIndex, like "state_id".
+        :param parent_id: The id of the parent object.
+        :return: A list of objects.
+        """
+        return self.index(ForeignKeyIndex).related(self.__class_name(cls),
+                                                   field, parent_id)
+
+    @measured("new")
+    @synchronized
     def new(self, obj):
         """
         Sets in __objects the obj with key <obj class name>.id.
 
         :param obj: An object to be stored.
         """
+        self.__store((obj,))
+
+    @measured("bulk_new")
+    @synchronized
+    def bulk_new(self, objs):
+        """
+        Stores many objects at once, as new() does for each of them,
+        holding the lock and checking the class index once.
+
+        :param objs: An iterable of objects to be stored.
+        :return: The number of objects stored.
+        """
+        return self.__store(objs)
+
+    def __store(self, objs):
+        """
+        Stores objects for new() and bulk_new(), which hold the lock.
+
+        :param objs: An iterable of objects to be stored.
+        :return: The number of objects stored.
+        """
+        self.__sync()
+        objects = FileStorage.__objects
+        raw = FileStorage.__raw
+        by_class = FileStorage.__by_class
+        dirty = FileStorage.__dirty
+        undo = FileStorage.__undo
+        count = 0
+        for obj in objs:
+            cls_name = obj.__class__.__name__
+            key = f"{cls_name}.{obj.id}"
+            if undo is not None:
+                if key in raw:
+                    self.__hydrate([key])
+                undo.record(key, objects.get(key))
+            raw.pop(key, None)
+            objects[key] = obj
+            by_class.setdefault(cls_name, {})[key] = obj
+            dirty[key] = obj
+            self.__mark(key, obj)
+            count += 1
+        return count
+
+    @synchronized
+    def delete(self, obj=None):
+        """
+        Deletes obj from __objects if it's inside.
+
+        :param obj: The object to be removed.
+        """
+        if obj is None:
+            return
+        self.__sync()
         key = f"{obj.__class__.__name__}.{obj.id}"
-        FileStorage.__objects[key] = obj
+        if (FileStorage.__undo is not None and
+                FileStorage.__objects.get(key) is obj):
+            FileStorage.__undo.record(key, obj)
+        if FileStorage.__objects.pop(key, None) is not None:
+            self.__unindex(key)
+            FileStorage.__dirty[key] = None
+            self.__mark(key, None)
+
+    def touch(self, obj):
+        """
+        Marks obj as changed so the next save persists it; called by
+        the models after they set an attribute. Objects that are not
+        in __objects are ignored without taking the lock.
+
+        :param obj: The object that has been modified.
+        """
+        key = f"{obj.__class__.__name__}.{obj.id}"
+        if FileStorage.__objects.get(key) is not obj:
+            return
+        with _lock:
+            FileStorage.__dirty[key] = obj
+            if FileStorage.__indexes:
+                self.__mark(key, obj)
+
+    def preserve(self, obj):
+        """
+        Records the state of obj before it is changed, if a
+        transaction is open; called by the models before they set an
+        attribute.
+
+        :param obj: The object about to be modified.
+        """
+        undo = FileStorage.__undo
+        if undo is None:
+            return
+        obj_id = getattr(obj, "id", None)
+        key = f"{obj.__class__.__name__}.{obj_id}"
+        with _lock:
+            if FileStorage.__objects.get(key) is obj:
+                undo.record(key, obj)
+
+    @synchronized
+    def begin(self):
+        """
+        Opens a transaction: save() does nothing until commit(), and
+        rollback() restores the objects as they are now.
+
+        :raises RuntimeError: If a transaction is already open.
+        """
+        if FileStorage.__undo is not None:
+            raise RuntimeError("a transaction is already open")
+        self.__sync()
+        FileStorage.__undo = UndoLog()
+        FileStorage.__undo_dirty = dict(FileStorage.__dirty)
+
+    def in_transaction(self):
+        """Tells whether a transaction is open."""
+        return FileStorage.__undo is not None
+
+    def commit(self):
+        """
+        Closes the transaction and saves its changes at once.
+
+        :raises RuntimeError: If no transaction is open.
+        """
+        with _lock:
+            if FileStorage.__undo is None:
+                raise RuntimeError("no transaction is open")
+            FileStorage.__undo = FileStorage.__undo_dirty = None
+        self.save()
+
+    @synchronized
+    def rollback(self):
+        """
+        Closes the transaction and restores, from the undo log, the
+        objects it created, changed or deleted; nothing is read from
+        the file.
+
+        :raises RuntimeError: If no transaction is open.
+        """
+        undo = FileStorage.__undo
+        if undo is None:
+            raise RuntimeError("no transaction is open")
+        FileStorage.__undo = None
+        self.__sync()
+        for key, obj in undo.restore():
+            current = FileStorage.__objects.get(key)
+            if obj is None:
+                if current is not None:
+                    del FileStorage.__objects[key]
+                    self.__unindex(key)
+            else:
+                FileStorage.__objects[key] = obj
+                FileStorage.__by_class.setdefault(key.split(".")[0],
+                                                  {})[key] = obj
+            self.__mark(key, obj)
+        FileStorage.__dirty = FileStorage.__undo_dirty
+        FileStorage.__undo_dirty = None
+
+    @contextlib.contextmanager
+    def transaction(self):
+        """
+        Runs a block in a transaction, committed at the end of the
+        block and rolled back if the block raises.
+
+        :return: A context manager yielding the storage.
+        """
+        self.begin()
+        try:
+            yield self
+        except BaseException:
+            self.rollback()
+            raise
+        self.commit()
+
+    @synchronized
+    def dirty_count(self):
+        """Returns the number of objects changed since the last save."""
+        self.__sync()
+        return len(FileStorage.__dirty)
+
+    def flush_stats(self):
+        """
+        Returns the cost of the last save: the number of dirty
+        objects, the number of objects written, the bytes written
+        and the time it took in seconds.
+        """
+        return dict(FileStorage.__flush_stats)
+
+    def stats(self):
+        """
+        Returns the metrics recorded while the metrics option is on:
+        per operation the number of calls and their latencies, and the
+        bytes written and read.
+
+        :return: A dictionary, as Metrics.snapshot() returns it.
+        """
+        return metrics.snapshot()
+
+    def reset_stats(self):
+        """Forgets the metrics recorded so far."""
+        metrics.reset()
+
+    @synchronized
+    def add_index(self, index):
+        """
+        Attaches a secondary index, kept in sync with the objects
+        created, changed and deleted from now on.
+
+        :param index: An instance of a subclass of Index.
+        """
+        index.invalidate()
+        FileStorage.__indexes.append(index)
+
+    @synchronized
+    def index(self, cls):
+        """
+        Returns the attached index of class cls, attaching a new one
+        if there is none.
+
+        :param cls: A subclass of Index, built with the storage as its
+                    only argument.
+        :return: The index.
+        """
+        for index in FileStorage.__indexes:
+            if type(index) is cls:
+                return index
+        index = cls(self)
+        self.add_index(index)
+        return index
+
+    @synchronized
+    def remove_index(self, index):
+        """
+        Detaches an index attached by add_index().
+
+        :param index: The index.
+        """
+        FileStorage.__indexes.remove(index)
+
+    def indexes(self):
+        """Returns the list of the attached indexes."""
+        return list(FileStorage.__indexes)
+
+    def __mark(self, key, obj):
+        """
+        Records a change in the indexes that cover key.
+
+        :param key: The <class name>.<id> key of the object.
+        :param obj: The object, None if it was deleted.
+        """
+        for index in FileStorage.__indexes:
+            if index.covers(key):
+                index.mark(key, obj)
+
+    def __invalidate(self):
+        """Makes every index be built again on its next query."""
+        for index in FileStorage.__indexes:
+            index.invalidate()
+
+    def __sync(self):
+        """
+        Forget the pending changes if __objects was replaced from
+        outside: the class index is rebuilt, the indexes of
+        add_index() invalidated and the next save writes a full
+        snapshot.
+        """
+        if FileStorage.__tracked is not FileStorage.__objects:
+            FileStorage.__tracked = FileStorage.__objects
+            FileStorage.__view = MappingProxyType(FileStorage.__objects)
+            FileStorage.__dirty = {}
+            FileStorage.__journal_size = None
+            FileStorage.__raw = {}
+            self.__close_sources()
+            FileStorage.__by_class = {}
+            for key, obj in FileStorage.__objects.items():
+                FileStorage.__by_class.setdefault(
+                    key.split(".")[0], {})[key] = obj
+            self.__invalidate()
+
+    @measured("hydrate")
+    def __hydrate(self, keys):
+        """
+        Builds the instances of raw records kept by a lazy reload.
+
+        :param keys: The keys of the records to build.
+        """
+        raw = FileStorage.__raw
+        objects = FileStorage.__objects
+        by_class = FileStorage.__by_class
+        if FileStorage.__options["compact"]:
+            if FileStorage.__compact is None:
+                FileStorage.__compact = compact_classes(self.classes(),
+                                                        self.attributes())
+            classes = FileStorage.__compact
+        else:
+            classes = self.classes()
+        builders = {name: cls.from_dict for name, cls in classes.items()}
+        for key in keys:
+            o = self.__record(raw.pop(key))
+            cls_name = o["__class__"]
+            obj = builders[cls_name](o)
+            objects[key] = obj
+            by_class[cls_name][key] = obj
+        if not raw:
+            self.__close_sources()
+
+    @staticmethod
+    def __text(span):
+        """
+        Reads the JSON text of a record left in its file by a lazy
+        reload. The file stays open, so it is still read after a save
+        has replaced it.
+
+        :param span: The (file, position, length) of the record.
+        :return: A string.
+        """
+        source, offset, length = span
+        source.seek(offset)
+        return source.read(length).decode("utf-8")
+
+    @staticmethod
+    def __record(o):
+        """
+        Returns a raw record as a dictionary, decoding it from its file
+        if a lazy reload only noted where it is.
+
+        :param o: A record, or the (file, position, length) of one.
+        :return: A dictionary.
+        """
+        if type(o) is dict:
+            return o
+        return json.loads(FileStorage.__text(o))
+
+    @staticmethod
+    def __close_sources():
+        """
+        Closes the files read by a lazy reload once no raw record is
+        left in them.
+        """
+        for source in FileStorage.__sources:
+            source.close()
+        FileStorage.__sources = []
+
+    def __unindex(self, key):
+        """
+        Removes key from the class index.
+
+        :param key: The <class name>.<id> key of a removed object.
+        """
+        del FileStorage.__by_class[key.split(".")[0]][key]
+
+    @staticmethod
+    def __class_name(cls):
+        """
+        Returns the name of cls, which is a class or a class name.
+
+        :param cls: A class or class name.
+        :return: The class name.
+        """
+        return cls if isinstance(cls, str) else cls.__name__
+
+    def __data_path(self):
+        """Returns the path of the file in the configured format."""
+        if FileStorage.__options["format"] == "binary":
+            return os.path.splitext(FileStorage.__file_path)[0] + ".bin"
+        return FileStorage.__file_path
+
+    def __shard_paths(self):
+        """Returns the shard path of every class of classes()."""
+        stem, ext = os.path.splitext(self.__data_path())
+        return {name: f"{stem}.{name}{ext}" for name in self.classes()}
+
+    def __journal_path(self):
+        """Returns the path of the journal kept next to the data file."""
+        return self.__data_path() + ".journal"
 
     def classes(self):
         """Returns a dictionary of valid classes and their references."""
@@ -95,30 +688,500 @@ class FileStorage:
                     }
         return attributes
 
+    @measured("save")
     def save(self):
         """
         Serializes __objects to the JSON file
         (path: __file_path).
+
+        In journal mode only the dirty objects (created, modified or
+        deleted since the last save) are appended to the journal.
+        Otherwise the file is only rewritten if something is dirty or
+        a journal is left to fold in.
+
+        In write-behind mode the write is left to a background thread,
+        which coalesces the saves made in between.
+
+        In a transaction nothing is written until commit().
+        """
+        if FileStorage.__undo is not None:
+            return
+        if not FileStorage.__options["write_behind"]:
+            with _lock:
+                self.__write()
+            return
+        with _lock:
+            FileStorage.__save_pending = True
+            if FileStorage.__flusher is None:
+                FileStorage.__flusher = Flusher(
+                    self.__flush_pending,
+                    FileStorage.__options["flush_interval"])
+                FileStorage.__flusher.start()
+                atexit.register(self.__stop_flusher)
+            if len(FileStorage.__dirty) >= \
+                    FileStorage.__options["flush_threshold"]:
+                FileStorage.__flusher.wake()
+
+    @measured("flush")
+    def flush(self):
+        """
+        Writes the saves still pending in write-behind mode, and
+        returns once they are on disk. A save that the background
+        thread failed to write is still pending and written again.
+
+        The indexes that can be saved, such as TextIndex, are then
+        written next to the data file.
+
+        :raises Exception: The error of the write, or else the last
+                           error of the background thread.
+        """
+        self.__flush(FileStorage.__flusher)
+
+    def __flush(self, flusher):
+        """
+        Writes the pending saves and the indexes for flush(), then
+        raises the last error of flusher, if any.
+
+        :param flusher: The background thread, or None.
         """
-        objd = FileStorage.__objects
-        obj_dict = {obj: objd[obj].to_dict() for obj in objd.keys()}
+        self.__flush_pending()
+        with _lock:
+            for index in FileStorage.__indexes:
+                index.persist()
+        if flusher is not None and flusher.error is not None:
+            error, flusher.error = flusher.error, None
+            raise error
+
+    @synchronized
+    def fingerprint(self):
+        """
+        Returns the size and modification time of the storage files,
+        or None while the objects in memory differ from them, because
+        of unsaved changes or objects that were not read from them.
+        """
+        self.__sync()
+        if FileStorage.__dirty or FileStorage.__journal_size is None:
+            return None
+        if FileStorage.__options["shard"]:
+            paths = list(self.__shard_paths().values())
+        else:
+            paths = [self.__data_path()]
+        fingerprint = []
+        for path in paths + [self.__journal_path()]:
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            fingerprint.append([os.path.basename(path), stat.st_ino,
+                                stat.st_size, stat.st_mtime_ns])
+        return fingerprint
+
+    def index_path(self, name):
+        """
+        Returns the path where an index is saved, next to the data file.
+
+        :param name: The name of the index, such as "text".
+        """
+        return f"{self.__data_path()}.{name}.idx"
+
+    def __flush_pending(self):
+        """Writes the changes if a save is pending."""
+        with _lock:
+            if FileStorage.__save_pending and FileStorage.__undo is None:
+                self.__write()
+
+    def __stop_flusher(self):
+        """
+        Stops the background thread, then writes every dirty object,
+        whether its save is pending or failed in the background.
+        """
+        flusher = FileStorage.__flusher
+        if flusher is not None:
+            FileStorage.__flusher = None
+            flusher.stop()
+            atexit.unregister(self.__stop_flusher)
+            with _lock:
+                if FileStorage.__dirty:
+                    FileStorage.__save_pending = True
+            self.__flush(flusher)
+
+    @measured("write")
+    def __write(self):
+        """
+        Writes the changes to the journal or the data file. The pending
+        save is only cleared once they are written.
+        """
+        self.__sync()
+        start = time.perf_counter()
+        written = nbytes = 0
+        size = FileStorage.__journal_size
+        FileStorage.__unsaved.update(key.split(".")[0]
+                                     for key in FileStorage.__dirty)
+        if FileStorage.__options["shard"]:
+            paths = self.__shard_paths().values()
+        else:
+            paths = [self.__data_path()]
+        if (FileStorage.__options["journal"] and size is not None and
+                size < FileStorage.__options["journal_limit"]):
+            written, nbytes = self.__append_journal()
+        elif (FileStorage.__dirty or size != 0 or
+                not all(os.path.exists(path) for path in paths)):
+            written, nbytes = self.__write_snapshot()
+        FileStorage.__flush_stats = {
+            "dirty": len(FileStorage.__dirty),
+            "written": written,
+            "bytes": nbytes,
+            "seconds": time.perf_counter() - start}
+        FileStorage.__dirty = {}
+        FileStorage.__save_pending = False
+
+    def __write_snapshot(self):
+        """
+        Rewrites the data file with every object and drops the journal.
+        When sharding, only the shards of the classes changed since
+        they were last written are rewritten.
+
+        :return: The number of objects and bytes written.
+        """
+        binary = FileStorage.__options["format"] == "binary"
+        write = self.__write_binary if binary else self.__write_json
+        written = nbytes = 0
         try:
-            with open(FileStorage.__file_path, 'w') as file:
-                json.dump(obj_dict, file)
+            self.__seal_journal()
+            if not FileStorage.__options["shard"]:
+                written, nbytes = write(self.__data_path(), self.__records())
+            else:
+                paths = self.__shard_paths()
+                names = FileStorage.__unsaved
+                if (FileStorage.__journal_size is None or
+                        not all(os.path.exists(p) for p in paths.values())):
+                    names = paths
+                for name in names:
+                    count, size = write(paths[name], self.__records(name))
+                    written += count
+                    nbytes += size
+                if names is paths and os.path.exists(self.__data_path()):
+                    os.remove(self.__data_path())
+        except FileNotFoundError:
+            return 0, 0
+        try:
+            os.remove(self.__journal_path())
         except FileNotFoundError:
             pass
+        FileStorage.__journal_size = 0
+        FileStorage.__unsaved = set()
+        return written, nbytes
 
-    def reload(self):
+    def __records(self, cls_name=None):
         """
-        Deserialize the JSON file __file_path
-        to __objects, if it exists.
+        Yields the key and the object of every object, or only of the
+        objects of cls_name; the objects that a lazy reload did not
+        build yet are yielded as their raw record, a dictionary or
+        the (file, position, length) of one.
+
+        :param cls_name: A class name, None for every object.
+        :return: An iterator of (key, object or record) pairs.
+        """
+        if cls_name is None:
+            yield from FileStorage.__objects.items()
+            yield from FileStorage.__raw.items()
+            return
+        for key, obj in FileStorage.__by_class.get(cls_name, {}).items():
+            yield key, FileStorage.__raw[key] if obj is None else obj
+
+    @measured("serialize")
+    def __encode(self, obj):
+        """
+        Returns the JSON text of an object or raw record, written by
+        the serializer of its class.
+
+        :param obj: An object, a record as returned by to_dict(), or
+                    the (file, position, length) of one, whose text
+                    is copied as it is if it fits on one line.
+        :return: A string.
+        """
+        if type(obj) is tuple:
+            text = self.__text(obj)
+            if "\n" not in text and "\r" not in text:
+                return text
+            obj = json.loads(text)
+        if type(obj) is dict:
+            return json.dumps(obj)
+        serializers = FileStorage.__serializers
+        if serializers is None:
+            serializers = compile_serializers(self.attributes())
+            FileStorage.__serializers = serializers
+        name = type(obj).__name__
+        serializer = serializers.get(name)
+        if serializer is None:
+            serializer = serializers[name] = Serializer(
+                name, self.attributes()["BaseModel"])
+        return serializer.encode(obj)
+
+    def __write_json(self, path, records):
+        """
+        Writes records to path as JSON, one record at a time.
+
+        :param path: The path of the file.
+        :param records: An iterable of (key, object or record) pairs.
+        :return: The number of objects and bytes written.
+        """
+        sync = FileStorage.__options["durability"] != "none"
+        encode = self.__encode
+        with atomic_open(path, 'w', sync) as file:
+            count = write_records(file, ((key, encode(obj))
+                                         for key, obj in records))
+            nbytes = file.tell()
+        metrics.add_bytes("written", nbytes)
+        return count, nbytes
+
+    def __write_binary(self, path, records):
+        """
+        Writes records to path in the binary format.
+
+        :param path: The path of the file.
+        :param records: An iterable of (key, object or record) pairs.
+        :return: The number of objects and bytes written.
+        """
+        sync = FileStorage.__options["durability"] != "none"
+        with atomic_open(path, 'wb', sync) as file:
+            count, nbytes = binary_format.dump(
+                (self.__record(o) if type(o) in (dict, tuple) else
+                 o.to_dict() for key, o in records),
+                file, self.attributes())
+        metrics.add_bytes("written", nbytes)
+        return count, nbytes
+
+    @synchronized
+    def export_json(self, path):
+        """
+        Writes every object to path as JSON, whatever the format.
+
+        :param path: The path of the JSON file.
+        :return: The number of objects written.
+        """
+        self.__sync()
+        return self.__write_json(path, self.__records())[0]
+
+    @synchronized
+    def import_json(self, path):
+        """
+        Loads the objects of a JSON file written by save() or
+        export_json(); the next save writes them in the configured
+        format.
+
+        :param path: The path of the JSON file.
+        :return: The number of objects read.
+        """
+        self.__sync()
+        keys = []
+        with open(path) as f:
+            for key, o in iter_records(f):
+                keys.append(self.__load(key, o))
+            metrics.add_bytes("read", os.fstat(f.fileno()).st_size)
+        self.__hydrate_loaded(keys)
+        count = len(keys)
+        FileStorage.__journal_size = None
+        self.__invalidate()
+        return count
+
+    def __journal_line(self, key, obj):
+        """
+        Returns the journal record of a key, a put or a delete.
+
+        :param key: The <class name>.<id> key.
+        :param obj: The object or raw record of key, None if deleted.
+        :return: The line, with its newline.
+        """
+        if obj is None:
+            return json.dumps({"op": "delete", "key": key}) + "\n"
+        return (f'{{"op": "put", "key": {json.dumps(key)}, '
+                f'"obj": {self.__encode(obj)}}}\n')
+
+    def __seal_journal(self):
+        """
+        Before a snapshot replaces the data file, rewrites the journal,
+        if there is one, with the current state of the keys it holds
+        and of the dirty keys. The journal is removed once the snapshot
+        is in place; if a crash leaves it behind, replaying it over the
+        new snapshot then changes nothing.
+        """
+        if not os.path.exists(self.__journal_path()):
+            return
+        changes = self.__read_journal()[0]
+        keys = list(changes)
+        keys.extend(key for key in FileStorage.__dirty if key not in changes)
+        objects = FileStorage.__objects
+        raw = FileStorage.__raw
+        sync = FileStorage.__options["durability"] != "none"
+        with atomic_open(self.__journal_path(), 'w', sync) as file:
+            for key in keys:
+                file.write(self.__journal_line(key, objects.get(
+                    key, raw.get(key))))
+
+    @measured("append_journal")
+    def __append_journal(self):
+        """
+        Appends one put or delete record per dirty key to the journal.
+
+        :return: The number of records and bytes written.
+        """
+        lines = [self.__journal_line(key, obj)
+                 for key, obj in FileStorage.__dirty.items()]
+        if not lines:
+            return 0, 0
+        durability = FileStorage.__options["durability"]
+        with open(self.__journal_path(), 'a') as file:
+            if durability == "always":
+                for line in lines:
+                    file.write(line)
+                    file.flush()
+                    os.fsync(file.fileno())
+            else:
+                file.writelines(lines)
+                if durability == "flush":
+                    file.flush()
+                    os.fsync(file.fileno())
+        FileStorage.__journal_size += len(lines)
+        nbytes = sum(len(line) for line in lines)
+        metrics.add_bytes("written", nbytes)
+        return len(lines), nbytes
+
+    @measured("read_journal")
+    def __read_journal(self):
+        """
+        Reads the final state of every key changed in the journal.
+
+        A torn last line, left by a crash during an append, ends the
+        replay. The journal is then reported as unknown (None), so that
+        the next save writes a snapshot instead of appending after the
+        broken line.
+
+        :return: A dictionary of key to record (None if the key was
+                 deleted) and the number of journal records, None if
+                 the journal ends with a torn record.
+        """
+        changes = {}
+        count = 0
+        try:
+            with open(self.__journal_path()) as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        count = None
+                        break
+                    changes.pop(record["key"], None)
+                    changes[record["key"]] = record.get("obj")
+                    count += 1
+                metrics.add_bytes("read", os.fstat(f.fileno()).st_size)
+        except FileNotFoundError:
+            pass
+        return changes, count
+
+    def __load(self, key, o):
+        """
+        Stores the record o read from the file under key, replacing
+        any object with the same key.
+
+        :param key: The <class name>.<id> key of the record.
+        :param o: The record, as returned by to_dict(), or the (file,
+                  position, length) of one.
+        :return: The key, for __hydrate_loaded().
+        """
+        FileStorage.__objects.pop(key, None)
+        FileStorage.__raw.pop(key, None)
+        FileStorage.__raw[key] = o
+        FileStorage.__by_class.setdefault(key.split(".")[0], {})[key] = None
+        return key
+
+    def __hydrate_loaded(self, keys):
+        """
+        Builds the instances of records stored by __load(), unless the
+        storage is lazy; reload() calls it on batches of records.
+
+        :param keys: The keys of the records.
+        """
+        if not FileStorage.__options["lazy"]:
+            self.__hydrate([key for key in dict.fromkeys(keys)
+                            if key in FileStorage.__raw])
+
+    def __read_file(self, path, binary):
+        """
+        Yields the records of a storage file one at a time.
+
+        :param path: The path of the file.
+        :param binary: True for the binary format, False for JSON.
+        :return: An iterator of (key, record) pairs.
         """
         try:
-            with open(FileStorage.__file_path) as f:
-                objdict = json.load(f)
-                for o in objdict.values():
-                    cls_name = o["__class__"]
-                    del o["__class__"]
-                    self.new(eval(cls_name)(**o))
+            with open(path, 'rb' if binary else 'r') as f:
+                reader = binary_format.iter_records if binary else \
+                    iter_records
+                yield from reader(f)
+                metrics.add_bytes("read", os.fstat(f.fileno()).st_size)
         except FileNotFoundError:
             pass
+
+    def __read_spans(self, path):
+        """
+        Yields the keys of a JSON storage file with the file, position
+        and length of their records, for a lazy reload. The records
+        are decoded by __record() when their instances are built.
+
+        :param path: The path of the file.
+        :return: An iterator of (key, (file, position, length)) pairs.
+        """
+        try:
+            source = open(path, 'rb')
+        except FileNotFoundError:
+            return
+        FileStorage.__sources.append(source)
+        with open(path, encoding="latin-1", newline="") as f:
+            for key, (offset, length) in iter_spans(f):
+                yield key, (source, offset, length)
+        metrics.add_bytes("read", os.fstat(source.fileno()).st_size)
+
+    @measured("reload")
+    @synchronized
+    def reload(self):
+        """
+        Deserialize the JSON file __file_path (or the binary file, or
+        the shards) to __objects, if it exists, then replay its journal.
+
+        The file is read one record at a time. In lazy mode only the
+        position of each record of a JSON file is kept, and a record
+        is decoded and built when all(), get() or the class index
+        reach it.
+        """
+        self.__sync()
+        changes, size = self.__read_journal()
+        binary = FileStorage.__options["format"] == "binary"
+        paths = []
+        if FileStorage.__options["shard"]:
+            paths = [path for path in self.__shard_paths().values()
+                     if os.path.exists(path)]
+            if not paths and os.path.exists(self.__data_path()):
+                size = None
+        if FileStorage.__options["lazy"] and not binary:
+            read = self.__read_spans
+        else:
+            read = functools.partial(self.__read_file, binary=binary)
+        records = itertools.chain.from_iterable(
+            read(path) for path in paths or [self.__data_path()])
+        batch = []
+        for key, o in records:
+            if key not in changes:
+                batch.append(self.__load(key, o))
+                if len(batch) == FileStorage.__hydrate_batch:
+                    self.__hydrate_loaded(batch)
+                    batch = []
+        for key, o in changes.items():
+            if o is not None:
+                batch.append(self.__load(key, o))
+            elif (FileStorage.__objects.pop(key, None) is not None or
+                    FileStorage.__raw.pop(key, None) is not None):
+                self.__unindex(key)
+        self.__hydrate_loaded(batch)
+        FileStorage.__journal_size = size
+        self.__invalidate()
@@ -0,0 +1,44 @@
+#!/usr/bin/python3
+"""Defines the background thread of the write-behind mode."""
+import threading
+
+
+class Flusher(threading.Thread):
+    """
+    A daemon thread that calls a flush function every interval
+    seconds, or as soon as it is woken up.
+    """
+
+    def __init__(self, flush, interval):
+        """
+        Initialize the thread.
+
+        :param flush: The function writing the pending changes.
+        :param interval: The number of seconds between two flushes.
+        """
+        super().__init__(name="hbnb-flusher", daemon=True)
+        self.flush = flush
+        self.interval = interval
+        self.error = None
+        self.__wakeup = threading.Event()
+        self.__stopped = threading.Event()
+
+    def run(self):
+        """Flushes on every interval or wake up until stopped."""
+        while not self.__stopped.is_set():
+            self.__wakeup.wait(self.interval)
+            self.__wakeup.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                self.error = e
+
+    def wake(self):
+        """Asks for a flush without waiting for the interval."""
+        self.__wakeup.set()
+
+    def stop(self):
+        """Stops the thread and waits for its last flush."""
+        self.__stopped.set()
+        self.__wakeup.set()
+        self.join()
@@ -0,0 +1,216 @@
+#!/usr/bin/python3
+"""Defines a grid index over the latitude and longitude of Place."""
+import math
+from models.engine.index import Index
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+
+
+def distance_km(lat1, lon1, lat2, lon2):
+    """
+    Returns the great-circle distance between two points.
+
+    :param lat1: The latitude of the first point, in degrees.
+    :param lon1: The longitude of the first point, in degrees.
+    :param lat2: The latitude of the second point, in degrees.
+    :param lon2: The longitude of the second point, in degrees.
+    :return: The distance in kilometers.
+    """
+    lat1, lon1, lat2, lon2 = map(math.radians, (lat1, lon1, lat2, lon2))
+    a = (math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) *
+         math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2)
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def _coordinate(value, limit):
+    """Returns value as a float if it is a number within limit."""
+    if type(value) is int or type(value) is float:
+        if -limit <= value <= limit:
+            return float(value)
+    return None
+
+
+class GeoIndex(Index):
+    """
+    Buckets the objects of one class in a grid of cells of cell_deg
+    degrees by their latitude and longitude.
+
+    nearby() reads the cells that overlap the bounding box of the
+    circle; nearest() searches circles of doubling radius. Objects
+    without a valid latitude and longitude are not indexed.
+    """
+
+    def __init__(self, storage, cls_name="Place", cell_deg=0.05):
+        """
+        Initialize the index.
+
+        :param storage: The storage engine the index is attached to.
+        :param cls_name: The name of the class of the indexed objects.
+        :param cell_deg: The size of a cell, in degrees.
+        """
+        super().__init__(storage)
+        self.cls_name = cls_name
+        self.classes = (cls_name,)
+        self.cell_deg = cell_deg
+        self.rows = math.ceil(180 / cell_deg)
+        self.cols = math.ceil(360 / cell_deg)
+        self.clear()
+
+    def clear(self):
+        """Empties the index."""
+        self.cells = {}
+        self.points = {}
+
+    def cell(self, lat, lon):
+        """Returns the (row, column) of the cell of a point."""
+        row = min(int((lat + 90) / self.cell_deg), self.rows - 1)
+        col = int((lon + 180) / self.cell_deg) % self.cols
+        return row, col
+
+    def add(self, key, obj):
+        """
+        Adds or moves the point of an object.
+
+        :param key: The <class name>.<id> key of the object.
+        :param obj: The object.
+        """
+        lat = _coordinate(getattr(obj, "latitude", None), 90)
+        lon = _coordinate(getattr(obj, "longitude", None), 180)
+        if lat is None or lon is None:
+            self.remove(key)
+            return
+        point = self.points.get(key)
+        if point is not None and point[:2] == (lat, lon):
+            return
+        self.remove(key)
+        self.points[key] = (lat, lon, self.cell(lat, lon))
+        self.cells.setdefault(self.cell(lat, lon), {})[key] = (lat, lon)
+
+    def remove(self, key):
+        """
+        Removes the point of an object, if there is one.
+
+        :param key: The <class name>.<id> key of the object.
+        """
+        point = self.points.pop(key, None)
+        if point is None:
+            return
+        bucket = self.cells[point[2]]
+        del bucket[key]
+        if not bucket:
+            del self.cells[point[2]]
+
+    def __cells(self, lat, lon, lat_span):
+        """
+        Returns the cells that overlap the bounding box of a circle,
+        or None if there are more of them than occupied cells, which
+        are then cheaper to read.
+
+        :param lat: The latitude of the center.
+        :param lon: The longitude of the center.
+        :param lat_span: The radius of the circle, in degrees.
+        :return: A list of (row, column) pairs, or None.
+        """
+        first = min(int(max(0.0, lat - lat_span + 90) / self.cell_deg),
+                    self.rows - 1)
+        last = min(int(min(180.0, lat + lat_span + 90) / self.cell_deg),
+                   self.rows - 1)
+        rows = range(first, last + 1)
+        if lat_span + abs(lat) >= 90:
+            cols = range(self.cols)
+        else:
+            # The widest longitude reached by a circle on the sphere.
+            lon_span = math.degrees(math.asin(min(1.0, math.sin(
+                math.radians(lat_span)) / math.cos(math.radians(lat)))))
+            first = math.floor((lon - lon_span + 180) / self.cell_deg)
+            last = math.floor((lon + lon_span + 180) / self.cell_deg)
+            if last - first + 1 >= self.cols:
+                cols = range(self.cols)
+            else:
+                cols = [col % self.cols for col in range(first, last + 1)]
+        if len(rows) * len(cols) > len(self.cells):
+            return None
+        return [(row, col) for row in rows for col in cols]
+
+    def __search(self, lat, lon, radius_km):
+        """
+        Returns the keys of the points within radius_km of a point,
+        without refreshing the index.
+        """
+        lat_span = radius_km / KM_PER_DEGREE
+        cells = self.__cells(lat, lon, lat_span)
+        if cells is None:
+            cells = list(self.cells)
+        hits = []
+        for cell in cells:
+            for key, (plat, plon) in self.cells.get(cell, {}).items():
+                if abs(plat - lat) <= lat_span:
+                    dist = distance_km(lat, lon, plat, plon)
+                    if dist <= radius_km:
+                        hits.append((dist, key))
+        hits.sort()
+        return hits
+
+    def __objects(self, hits):
+        """Returns the objects of the keys of (distance, key) pairs."""
+        objs = []
+        for dist, key in hits:
+            obj = self.storage.get(self.cls_name, key.split(".", 1)[1])
+            if obj is not None:
+                objs.append(obj)
+        return objs
+
+    def search(self, lat, lon, radius_km):
+        """
+        Returns the keys of the points within radius_km of a point.
+
+        :param lat: The latitude of the center, in degrees.
+        :param lon: The longitude of the center, in degrees.
+        :param radius_km: The radius, in kilometers.
+        :return: A list of (distance, key) pairs, nearest first.
+        """
+        self.refresh()
+        return self.__search(lat, lon, radius_km)
+
+    def nearby(self, lat, lon, radius_km):
+        """
+        Returns the objects within radius_km of a point.
+
+        :param lat: The latitude of the center, in degrees.
+        :param lon: The longitude of the center, in degrees.
+        :param radius_km: The radius, in kilometers.
+        :return: A list of objects, nearest first.
+        """
+        return self.__objects(self.search(lat, lon, radius_km))
+
+    def nearest_keys(self, lat, lon, n):
+        """
+        Returns the keys of the n points nearest to a point, searching
+        circles of doubling radius until one holds n points.
+
+        :param lat: The latitude of the point, in degrees.
+        :param lon: The longitude of the point, in degrees.
+        :param n: The number of points.
+        :return: A list of (distance, key) pairs, nearest first.
+        """
+        self.refresh()
+        if n <= 0:
+            return []
+        radius = self.cell_deg * KM_PER_DEGREE / 8
+        while True:
+            hits = self.__search(lat, lon, radius)
+            if len(hits) >= n or radius >= math.pi * EARTH_RADIUS_KM:
+                return hits[:n]
+            radius *= 2
+
+    def nearest(self, lat, lon, n):
+        """
+        Returns the n objects nearest to a point.
+
+        :param lat: The latitude of the point, in degrees.
+        :param lon: The longitude of the point, in degrees.
+        :param n: The number of objects.
+        :return: A list of objects, nearest first.
+        """
+        return self.__objects(self.nearest_keys(lat, lon, n))
@@ -0,0 +1,103 @@
+#!/usr/bin/python3
+"""Defines the base of the secondary indexes of the storage engines."""
+
+
+class Index:
+    """
+    The base of the secondary indexes that a storage engine keeps in
+    sync with its objects, see FileStorage.add_index().
+
+    The engine only records the keys that change, with mark(); they
+    are applied to the index by refresh(), which every query of the
+    index calls first. The first refresh, and the first one after
+    invalidate(), builds the index from every object of its classes.
+    """
+
+    classes = ()
+
+    def __init__(self, storage):
+        """
+        Initialize the index, built on the first refresh().
+
+        :param storage: The storage engine the index is attached to.
+        """
+        self.storage = storage
+        self.pending = {}
+        self.stale = True
+
+    def covers(self, key):
+        """
+        Tells whether the object of key belongs in the index.
+
+        :param key: A <class name>.<id> key.
+        """
+        return not self.classes or key.split(".", 1)[0] in self.classes
+
+    def mark(self, key, obj):
+        """
+        Records that the object of key was created or changed.
+
+        :param key: The <class name>.<id> key of the object.
+        :param obj: The object, None if it was deleted.
+        """
+        if not self.stale:
+            self.pending[key] = obj
+
+    def invalidate(self):
+        """Makes the next refresh() build the index again."""
+        self.stale = True
+        self.pending = {}
+
+    def refresh(self):
+        """Applies the changes recorded since the last refresh."""
+        if self.stale:
+            self.stale = False
+            self.pending = {}
+            items = []
+            for name in self.classes or [None]:
+                items.extend(self.storage.all(name).items())
+            self.clear()
+            self.build(items)
+            return
+        pending, self.pending = self.pending, {}
+        for key, obj in pending.items():
+            if obj is None:
+                self.remove(key)
+            else:
+                self.add(key, obj)
+
+    def persist(self):
+        """
+        Saves the index next to the storage files, if the index
+        supports it; called by storage.flush().
+        """
+
+    def build(self, items):
+        """
+        Fills the empty index.
+
+        :param items: A list of (key, object) pairs.
+        """
+        for key, obj in items:
+            self.add(key, obj)
+
+    def clear(self):
+        """Empties the index."""
+        raise NotImplementedError
+
+    def add(self, key, obj):
+        """
+        Adds or updates the entry of an object.
+
+        :param key: The <class name>.<id> key of the object.
+        :param obj: The object.
+        """
+        raise NotImplementedError
+
+    def remove(self, key):
+        """
+        Removes the entry of an object, if there is one.
+
+        :param key: The <class name>.<id> key of the object.
+        """
+        raise NotImplementedError
@@ -0,0 +1,262 @@
+#!/usr/bin/python3
+"""Defines an incremental reader for the JSON file of FileStorage."""
+import json
+import re
+
+_decoder = json.JSONDecoder()
+_whitespace = re.compile(r"[ \t\n\r]*")
+_member = re.compile(r'[ \t\n\r]*"([^"\\]*)"[ \t\n\r]*:[ \t\n\r]*')
+_separator = re.compile(r"[ \t\n\r]*([,}])")
+
+
+class RecordReader:
+    """
+    Walks the top-level object of a JSON document read from a file
+    and yields its members one at a time, so that only one record
+    (plus one chunk of text) is held in memory.
+    """
+
+    def __init__(self, file, chunk_size=65536):
+        """
+        Initialize the reader.
+
+        :param file: A text file opened for reading.
+        :param chunk_size: The number of characters read at a time.
+        """
+        self.file = file
+        self.chunk_size = chunk_size
+        self.buf = ""
+        self.pos = 0
+        self.offset = 0
+        self.eof = False
+
+    def __iter__(self):
+        """
+        Yields the (key, value) pairs of the top-level object.
+
+        :raises json.JSONDecodeError: If the document is malformed.
+        """
+        self.expect("{")
+        if self.peek() == "}":
+            return
+        while True:
+            member = self.member()
+            if member is not None:
+                yield member
+                if self.buf[self.pos - 1] == "}":
+                    return
+                continue
+            self.peek()
+            key = self.key()
+            if not isinstance(key, str):
+                self.fail("Expecting property name enclosed in double quotes")
+            self.expect(":")
+            self.peek()
+            yield key, self.record()
+            if self.peek() == "}":
+                return
+            self.expect(",")
+
+    def member(self):
+        """
+        Decodes the next member and its separator if they are both in
+        the buffer and the key has no escapes, the common case, with
+        one regular expression on each side of the value.
+
+        :return: The (key, value) pair, None to take the general path.
+        """
+        match = _member.match(self.buf, self.pos)
+        if match is None:
+            return None
+        try:
+            value, end = self.decode(match.end())
+        except json.JSONDecodeError:
+            return None
+        separator = _separator.match(self.buf, end)
+        if separator is None:
+            return None
+        self.pos = separator.end()
+        return match.group(1), value
+
+    def fill(self):
+        """
+        Reads the next chunk, dropping the text already consumed.
+
+        :return: False if the end of the file was reached.
+        """
+        if self.eof:
+            return False
+        chunk = self.file.read(self.chunk_size)
+        self.buf = self.buf[self.pos:] + chunk
+        self.offset += self.pos
+        self.pos = 0
+        self.eof = not chunk
+        return not self.eof
+
+    def peek(self):
+        """
+        Skips whitespace and returns the next character.
+
+        :return: The next character, or "" at the end of the file.
+        """
+        while True:
+            self.pos = _whitespace.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf) or not self.fill():
+                return self.buf[self.pos:self.pos + 1]
+
+    def expect(self, char):
+        """
+        Consumes char, which must be the next non-whitespace character.
+
+        :param char: The expected character.
+        """
+        if self.peek() != char:
+            self.fail(f"Expecting '{char}' delimiter")
+        self.pos += 1
+
+    def key(self):
+        """
+        Decodes the next key, reading more of the file until the key
+        is complete.
+
+        :return: The key, or whatever value is there instead.
+        """
+        return self.value()
+
+    def decode(self, start):
+        """
+        Decodes the record that starts at start in the buffer.
+
+        :param start: The position of the record in the buffer.
+        :return: The record and the position after it.
+        :raises json.JSONDecodeError: If the record is not complete.
+        """
+        return _decoder.raw_decode(self.buf, start)
+
+    def record(self):
+        """
+        Decodes the next record, reading more of the file until the
+        record is complete.
+
+        :return: The record.
+        """
+        return self.value()
+
+    def value(self):
+        """
+        Decodes the next JSON value, reading more of the file until
+        the value is complete.
+
+        :return: The decoded value.
+        """
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if not self.fill():
+                    raise
+                continue
+            if end < len(self.buf) or not self.fill():
+                self.pos = end
+                return value
+            self.pos = 0
+
+    def fail(self, msg):
+        """
+        Raises a decoding error at the current position.
+
+        :param msg: The error message.
+        """
+        raise json.JSONDecodeError(msg, self.buf, self.pos)
+
+
+class SpanReader(RecordReader):
+    """
+    Walks the top-level object of a storage file like RecordReader,
+    but yields where each record is in the file instead of decoding
+    it. The file is read as latin-1, one character per byte, so that
+    positions are byte offsets; UTF-8 bytes above 127 are never JSON
+    delimiters, so the structure reads the same.
+    """
+
+    def member(self):
+        """
+        Finds the next member like RecordReader.member(), its key read
+        back as UTF-8.
+
+        :return: The (key, (position, length)) pair, None to take the
+                 general path.
+        """
+        member = super().member()
+        if member is None or member[0].isascii():
+            return member
+        return member[0].encode("latin-1").decode("utf-8"), member[1]
+
+    def key(self):
+        """
+        Decodes the next key from its text read back as UTF-8.
+
+        :return: The key, or whatever value is there instead.
+        """
+        start = self.offset + self.pos
+        self.value()
+        text = self.buf[start - self.offset:self.pos]
+        return json.loads(text.encode("latin-1").decode("utf-8"))
+
+    def decode(self, start):
+        """
+        Finds the end of the record that starts at start in the buffer:
+        the first "}" after an even number of quotes ends a record
+        without nested objects or escapes, any other record is decoded
+        and dropped.
+
+        :param start: The position of the record in the buffer.
+        :return: The (position, length) of the record in the file and
+                 the position after it in the buffer.
+        :raises json.JSONDecodeError: If the record is not complete.
+        """
+        buf = self.buf
+        end = buf.find("}", start) + 1
+        while end and buf.count('"', start, end) % 2:
+            end = buf.find("}", end) + 1
+        if (not end or buf[start] != "{" or
+                buf.find("{", start + 1, end) != -1 or
+                buf.find("\\", start, end) != -1):
+            end = _decoder.raw_decode(buf, start)[1]
+        return (self.offset + start, end - start), end
+
+    def record(self):
+        """
+        Finds the end of the next record, reading more of the file
+        until the record is complete.
+
+        :return: The (position, length) of the record in the file.
+        """
+        start = self.offset + self.pos
+        self.value()
+        return start, self.offset + self.pos - start
+
+
+def iter_records(file, chunk_size=65536):
+    """
+    Yields the <class name>.<id> keys and records of a storage file
+    one at a time.
+
+    :param file: A text file opened for reading.
+    :param chunk_size: The number of characters read at a time.
+    :return: An iterator of (key, record) pairs.
+    """
+    return iter(RecordReader(file, chunk_size))
+
+
+def iter_spans(file, chunk_size=65536):
+    """
+    Yields the <class name>.<id> keys of a storage file with the
+    position and length in bytes of their records, without decoding
+    the records.
+
+    :param file: A file opened with encoding="latin-1" and newline="".
+    :param chunk_size: The number of characters read at a time.
+    :return: An iterator of (key, (position, length)) pairs.
+    """
+    return iter(SpanReader(file, chunk_size))
@@ -0,0 +1,157 @@
+#!/usr/bin/python3
+"""Defines the instrumentation of the storage.
+
+The storage methods and BaseModel.to_dict() are wrapped with
+measured(name), which records the number of calls and a latency
+histogram of each operation in the metrics object; the storage files
+add the bytes they write and read. Recording is off until enabled
+with storage.configure(metrics=True), and costs one flag test per
+call until then.
+"""
+import functools
+import threading
+import time
+
+# number of power of two buckets, the last one holds every call of
+# 2 ** (buckets - 2) microseconds (about 4 minutes) or more
+buckets = 30
+
+
+class Histogram:
+    """
+    The latencies of an operation, in buckets of powers of two
+    microseconds: bucket i counts the calls that took less than
+    2 ** i microseconds and at least 2 ** (i - 1).
+    """
+
+    def __init__(self):
+        """Initialize an empty histogram."""
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = 0.0
+        self.buckets = [0] * buckets
+
+    def record(self, seconds):
+        """
+        Adds a call to the histogram.
+
+        :param seconds: The time the call took.
+        """
+        self.count += 1
+        self.total += seconds
+        if self.min is None or seconds < self.min:
+            self.min = seconds
+        if seconds > self.max:
+            self.max = seconds
+        self.buckets[min(int(seconds * 1e6).bit_length(), buckets - 1)] += 1
+
+    def percentile(self, q):
+        """
+        Returns an upper bound of the q-th percentile of the latencies,
+        the end of the bucket that holds it.
+
+        :param q: The percentile, between 0 and 100.
+        :return: A number of seconds, 0.0 if the histogram is empty.
+        """
+        rank = q / 100 * self.count
+        seen = 0
+        for i, count in enumerate(self.buckets):
+            seen += count
+            if count and seen >= rank:
+                return min((1 << i) / 1e6, self.max)
+        return 0.0
+
+    def to_dict(self):
+        """
+        Returns the histogram as a dictionary of numbers; the keys of
+        "histogram_us" are the ends of the non-empty buckets.
+        """
+        return {"count": self.count,
+                "total_seconds": self.total,
+                "mean_seconds": self.total / self.count if self.count else 0,
+                "min_seconds": self.min or 0.0,
+                "max_seconds": self.max,
+                "p50_seconds": self.percentile(50),
+                "p90_seconds": self.percentile(90),
+                "p99_seconds": self.percentile(99),
+                "histogram_us": {str(1 << i): count for i, count
+                                 in enumerate(self.buckets) if count}}
+
+
+class Metrics:
+    """The operation histograms and byte counters of the storage."""
+
+    def __init__(self):
+        """Initialize the metrics, disabled."""
+        self.enabled = False
+        self.__lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Forgets everything recorded so far."""
+        with self.__lock:
+            self.operations = {}
+            self.bytes = {"written": 0, "read": 0}
+
+    def record(self, name, seconds):
+        """
+        Records a call of an operation.
+
+        :param name: The operation name, like "save".
+        :param seconds: The time the call took.
+        """
+        with self.__lock:
+            histogram = self.operations.get(name)
+            if histogram is None:
+                histogram = self.operations[name] = Histogram()
+            histogram.record(seconds)
+
+    def add_bytes(self, direction, count):
+        """
+        Counts bytes written to or read from the storage files, if
+        the metrics are enabled.
+
+        :param direction: "written" or "read".
+        :param count: The number of bytes.
+        """
+        if self.enabled:
+            with self.__lock:
+                self.bytes[direction] += count
+
+    def snapshot(self):
+        """
+        Returns everything recorded so far as a dictionary that
+        json.dumps() accepts.
+        """
+        with self.__lock:
+            return {"enabled": self.enabled,
+                    "operations": {name: histogram.to_dict()
+                                   for name, histogram
+                                   in sorted(self.operations.items())},
+                    "bytes": dict(self.bytes)}
+
+
+metrics = Metrics()
+
+
+def measured(name):
+    """
+    Records the calls of the decorated function as the operation name
+    while the metrics are enabled.
+
+    :param name: The operation name.
+    :return: The decorator.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not metrics.enabled:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                metrics.record(name, time.perf_counter() - start)
+        return wrapper
+    return decorator
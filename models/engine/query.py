@@ -0,0 +1,230 @@
+#!/usr/bin/python3
+"""Defines a small query language with an index-aware planner.
+
+A query is a list of conditions with optional ordering and limit:
+
+    price_by_night < 100, city_id == "1234", order_by="-max_guest", limit=5
+
+Each condition compares an attribute with a Python literal using ==,
+!=, <, <=, >, >=, in or not in. The text is read with the ast module,
+nothing is evaluated.
+"""
+import ast
+import operator
+from models.engine.columnar import ColumnStore
+from models.engine.relations import ForeignKeyIndex
+
+OPERATORS = {ast.Eq: ("==", operator.eq),
+             ast.NotEq: ("!=", operator.ne),
+             ast.Lt: ("<", operator.lt),
+             ast.LtE: ("<=", operator.le),
+             ast.Gt: (">", operator.gt),
+             ast.GtE: (">=", operator.ge),
+             ast.In: ("in", lambda a, b: a in b),
+             ast.NotIn: ("not in", lambda a, b: a not in b)}
+_functions = {symbol: function for symbol, function in OPERATORS.values()}
+# what ast.parse and ast.literal_eval raise on text they cannot read
+_literal_errors = (ValueError, TypeError, SyntaxError, MemoryError,
+                   RecursionError)
+
+
+def _sort_key(value):
+    """Returns a key that orders numbers, then strings, then the rest."""
+    if type(value) is int or type(value) is float:
+        return (0, value, "")
+    if type(value) is str:
+        return (1, 0, value)
+    return (2, 0, repr(value))
+
+
+class Query:
+    """
+    A query over the objects of one class, planned against the
+    indexes of the storage engine.
+
+    Access paths considered by the planner:
+        id lookup: a condition id == <value>, cost 1.
+        foreign key index: a condition <foreign key> == <value> on a
+            field of ForeignKeyIndex, cost the number of children.
+        column store: range conditions on the fields of an attached
+            ColumnStore, cost the number of matching rows plus a
+            fiftieth of the rows for the vectorized scan.
+        class scan: every object of the class, cost their number.
+    Every condition is then checked on the objects of the chosen path.
+    """
+
+    def __init__(self, storage, cls_name, conditions=(), order_by=None,
+                 limit=None):
+        """
+        Initialize the query.
+
+        :param storage: The storage engine to query.
+        :param cls_name: The name of the class of the objects.
+        :param conditions: A list of (field, operator, value) tuples.
+        :param order_by: A field to sort on, "-field" for descending.
+        :param limit: The maximum number of objects, None for all.
+        :raises ValueError: If an operator is unknown.
+        """
+        for field, symbol, value in conditions:
+            if symbol not in _functions:
+                raise ValueError(f"unknown operator '{symbol}'")
+        self.storage = storage
+        self.cls_name = cls_name
+        self.conditions = list(conditions)
+        self.order_by = order_by
+        self.limit = limit
+
+    @classmethod
+    def parse(cls, storage, cls_name, text):
+        """
+        Builds a query from its text.
+
+        :param storage: The storage engine to query.
+        :param cls_name: The name of the class of the objects.
+        :param text: The conditions and options, separated by commas.
+        :raises ValueError: If the text is not a valid query.
+        """
+        try:
+            call = ast.parse(f"where({text})", mode="eval").body
+        except _literal_errors:
+            raise ValueError("syntax error") from None
+        conditions = []
+        for node in call.args:
+            if (not isinstance(node, ast.Compare) or len(node.ops) != 1 or
+                    not isinstance(node.left, ast.Name)):
+                raise ValueError("expected <attribute> <operator> <value>")
+            if type(node.ops[0]) not in OPERATORS:
+                raise ValueError("unknown operator")
+            try:
+                value = ast.literal_eval(node.comparators[0])
+            except _literal_errors:
+                raise ValueError("values must be literals") from None
+            conditions.append((node.left.id,
+                               OPERATORS[type(node.ops[0])][0], value))
+        options = {}
+        for keyword in call.keywords:
+            if keyword.arg not in ("order_by", "limit"):
+                raise ValueError(f"unknown option '{keyword.arg}'")
+            try:
+                options[keyword.arg] = ast.literal_eval(keyword.value)
+            except _literal_errors:
+                raise ValueError("values must be literals") from None
+        if not isinstance(options.get("order_by", ""), str):
+            raise ValueError("order_by must be a string")
+        limit = options.get("limit")
+        if limit is not None and (type(limit) is not int or limit < 0):
+            raise ValueError("limit must be a non-negative integer")
+        return cls(storage, cls_name, conditions, options.get("order_by"),
+                   limit)
+
+    def matches(self, obj):
+        """
+        Tells whether obj meets every condition; a comparison between
+        values of incompatible types is false.
+
+        :param obj: An object of the class.
+        """
+        for field, symbol, value in self.conditions:
+            try:
+                if not _functions[symbol](getattr(obj, field), value):
+                    return False
+            except (AttributeError, TypeError):
+                return False
+        return True
+
+    def plans(self):
+        """
+        Returns the access paths that can answer the query.
+
+        :return: A list of (cost, description, fetch) tuples, cheapest
+                 first, where fetch() returns the candidate objects.
+        """
+        cls_name = self.cls_name
+        size = self.storage.count(cls_name)
+        plans = [(size, "class scan", lambda: list(
+            self.storage.all(cls_name).values()))]
+        equal = {field: value for field, symbol, value in self.conditions
+                 if symbol == "=="}
+        if "id" in equal:
+            obj_id = equal["id"]
+            plans.append((1, f"id lookup {cls_name}.{obj_id}", lambda: [
+                obj for obj in [self.storage.get(cls_name, obj_id)]
+                if obj is not None]))
+        for field in ForeignKeyIndex.foreign_keys.get(cls_name, ()):
+            if type(equal.get(field)) is str:
+                plans.append(self.__foreign_key_plan(field, equal[field]))
+        for index in self.storage.indexes():
+            if isinstance(index, ColumnStore) and index.cls_name == cls_name:
+                plan = self.__column_plan(index)
+                if plan is not None:
+                    plans.append(plan)
+        plans.sort(key=lambda plan: plan[0])
+        return plans
+
+    def __foreign_key_plan(self, field, value):
+        """Returns the plan reading the children of value."""
+        index = self.storage.index(ForeignKeyIndex)
+        index.refresh()
+        count = len(index.children.get((self.cls_name, field), {}).get(
+            value, ()))
+        return (count, f"foreign key index {self.cls_name}.{field} == "
+                f"{value!r}", lambda: index.related(self.cls_name, field,
+                                                    value))
+
+    def __column_plan(self, index):
+        """Returns the plan reading the matching rows of a ColumnStore."""
+        ranges = {}
+        for field, symbol, value in self.conditions:
+            if (field not in index.fields or symbol not in
+                    ("==", "<", "<=", ">", ">=") or
+                    type(value) not in (int, float)):
+                continue
+            low, high = ranges.get(field, (None, None))
+            if symbol in ("==", ">", ">=") and (low is None or value > low):
+                low = value
+            if symbol in ("==", "<", "<=") and (high is None or
+                                                value < high):
+                high = value
+            ranges[field] = (low, high)
+        if not ranges:
+            return None
+        count = index.count(**ranges)
+        text = ", ".join(f"{field} in [{low}, {high}]"
+                         for field, (low, high) in ranges.items())
+        return (count + index.size // 50, f"column store {text}",
+                lambda: list(index.objects(**ranges).values()))
+
+    def explain(self):
+        """
+        Returns the plan of the query without running it.
+
+        :return: A dictionary with the chosen access path, its
+                 estimated cost, the other paths, the filter, the
+                 ordering and the limit.
+        """
+        plans = self.plans()
+        return {"plan": plans[0][1],
+                "cost": plans[0][0],
+                "alternatives": [(description, cost)
+                                 for cost, description, fetch in plans[1:]],
+                "filter": [f"{field} {symbol} {value!r}"
+                           for field, symbol, value in self.conditions],
+                "order_by": self.order_by,
+                "limit": self.limit}
+
+    def run(self):
+        """
+        Runs the query with the cheapest plan.
+
+        :return: A list of objects.
+        """
+        objs = (obj for obj in self.plans()[0][2]() if self.matches(obj))
+        if self.order_by:
+            field = self.order_by.lstrip("-")
+            objs = sorted(objs, key=lambda obj: _sort_key(
+                getattr(obj, field, None)),
+                reverse=self.order_by.startswith("-"))
+        elif self.limit is not None:
+            return [obj for i, obj in zip(range(self.limit), objs)]
+        objs = list(objs)
+        return objs if self.limit is None else objs[:self.limit]
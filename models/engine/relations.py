@@ -0,0 +1,93 @@
+#!/usr/bin/python3
+"""Defines the reverse indexes of the foreign keys between models."""
+import models
+from models.engine.index import Index
+
+
+class ForeignKeyIndex(Index):
+    """
+    Maps the id held in each foreign key (City.state_id, Place.city_id,
+    Place.user_id, Review.place_id and Review.user_id) to the keys of
+    the objects that hold it, so that the children of an object are
+    found without scanning their class.
+    """
+
+    foreign_keys = {"City": ("state_id",),
+                    "Place": ("city_id", "user_id"),
+                    "Review": ("place_id", "user_id")}
+    classes = tuple(foreign_keys)
+
+    def clear(self):
+        """Empties the index."""
+        self.children = {}
+        self.values = {}
+
+    def add(self, key, obj):
+        """
+        Adds or updates the foreign keys of an object.
+
+        :param key: The <class name>.<id> key of the object.
+        :param obj: The object.
+        """
+        cls_name = key.split(".", 1)[0]
+        fields = self.foreign_keys[cls_name]
+        values = tuple(getattr(obj, field, None) for field in fields)
+        if self.values.get(key) == values:
+            return
+        self.remove(key)
+        self.values[key] = values
+        for field, value in zip(fields, values):
+            if type(value) is str and value:
+                self.children.setdefault((cls_name, field), {}).setdefault(
+                    value, {})[key] = None
+
+    def remove(self, key):
+        """
+        Removes the foreign keys of an object, if they are indexed.
+
+        :param key: The <class name>.<id> key of the object.
+        """
+        values = self.values.pop(key, None)
+        if values is None:
+            return
+        cls_name = key.split(".", 1)[0]
+        for field, value in zip(self.foreign_keys[cls_name], values):
+            if type(value) is str and value:
+                by_value = self.children[(cls_name, field)]
+                del by_value[value][key]
+                if not by_value[value]:
+                    del by_value[value]
+
+    def related(self, cls_name, field, parent_id):
+        """
+        Returns the objects of cls_name whose field holds parent_id.
+
+        :param cls_name: The class name of the children.
+        :param field: The foreign key, such as "state_id".
+        :param parent_id: The id of the parent object.
+        :return: A list of objects, in the order they were indexed.
+        """
+        self.refresh()
+        parents = self.children.get((cls_name, field), {})
+        keys = list(parents.get(parent_id, ()))
+        objs = []
+        for key in keys:
+            obj = self.storage.get(cls_name, key.split(".", 1)[1])
+            if obj is not None:
+                objs.append(obj)
+        return objs
+
+
+def relationship(cls_name, field):
+    """
+    Returns a read-only property listing the objects of cls_name whose
+    field holds the id of the instance, such as State.cities.
+
+    :param cls_name: The class name of the children.
+    :param field: The foreign key of the children.
+    :return: A property.
+    """
+    def getter(self):
+        return models.storage.related(cls_name, field, self.id)
+    return property(getter, doc=f"The {cls_name} objects whose {field} "
+                    "is the id of this object.")
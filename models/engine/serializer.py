@@ -0,0 +1,135 @@
+#!/usr/bin/python3
+"""Defines per-class JSON serializers and a streaming JSON writer.
+
+A Serializer writes the JSON text of an object straight from its
+attributes, the same text as json.dumps(obj.to_dict()) without the
+dictionary that to_dict() builds. The encoder of each attribute is
+chosen once per class from FileStorage.attributes(); a value that does
+not have the type of its attribute is encoded by json.dumps.
+"""
+import datetime
+import json
+from json.encoder import encode_basestring_ascii
+
+_dumps = json.dumps
+_float_repr = float.__repr__
+_int_repr = int.__repr__
+_datetime = datetime.datetime
+
+
+def _encode_str(value):
+    """Encodes a str attribute."""
+    if type(value) is str:
+        return encode_basestring_ascii(value)
+    return _dumps(value)
+
+
+def _encode_int(value):
+    """Encodes an int attribute."""
+    if type(value) is int:
+        return _int_repr(value)
+    return _dumps(value)
+
+
+def _encode_float(value):
+    """Encodes a float attribute; NaN and infinities go to json.dumps."""
+    if type(value) is float and value - value == 0:
+        return _float_repr(value)
+    return _dumps(value)
+
+
+def _encode_datetime(value):
+    """Encodes a timestamp the way to_dict() does, with isoformat()."""
+    if type(value) is _datetime:
+        return f'"{value.isoformat()}"'
+    return _dumps(value)
+
+
+ENCODERS = {str: _encode_str,
+            int: _encode_int,
+            float: _encode_float,
+            datetime.datetime: _encode_datetime}
+
+
+class Serializer:
+    """The JSON serializer of the objects of one class."""
+
+    def __init__(self, cls_name, fields):
+        """
+        Initialize the serializer.
+
+        :param cls_name: The class name, written as __class__.
+        :param fields: A dictionary of attribute name to type, as
+                       returned by FileStorage.attributes().
+        """
+        self.cls_name = cls_name
+        self.encoders = {name: ENCODERS.get(kind, _dumps)
+                         for name, kind in fields.items()}
+        self.keys = {name: f"{encode_basestring_ascii(name)}: "
+                     for name in fields}
+        self.suffix = f'"__class__": {encode_basestring_ascii(cls_name)}}}'
+
+    def encode(self, obj):
+        """
+        Returns the JSON text of the record of obj.
+
+        :param obj: An object of the class.
+        :return: The same text as json.dumps(obj.to_dict()).
+        """
+        encoders = self.encoders
+        keys = self.keys
+        parts = ["{"]
+        # copied at once, another thread may set attributes meanwhile
+        for name, value in list(obj.__dict__.items()):
+            if name == "__class__":
+                continue
+            key = keys.get(name)
+            if key is None:
+                key = f"{encode_basestring_ascii(name)}: "
+            parts.append(key)
+            parts.append(encoders.get(name, _dumps)(value))
+            parts.append(", ")
+        parts.append(self.suffix)
+        return "".join(parts)
+
+
+def compile_serializers(attributes):
+    """
+    Builds the serializer of every class of a schema.
+
+    :param attributes: The dictionary returned by
+                       FileStorage.attributes(); the fields of
+                       "BaseModel" are shared by every class.
+    :return: A dictionary of class name to Serializer.
+    """
+    base = attributes.get("BaseModel", {})
+    return {name: Serializer(name, dict(base, **fields))
+            for name, fields in attributes.items()}
+
+
+def write_records(file, records, batch=1000):
+    """
+    Writes a JSON object of already encoded records to file, one
+    batch of records at a time.
+
+    :param file: A text file opened for writing.
+    :param records: An iterable of (key, JSON text) pairs.
+    :param batch: The number of records joined in one write.
+    :return: The number of records written.
+    """
+    count = 0
+    parts = []
+    file.write("{")
+    for key, text in records:
+        if count:
+            parts.append(", ")
+        parts.append(encode_basestring_ascii(key))
+        parts.append(": ")
+        parts.append(text)
+        count += 1
+        if len(parts) >= 4 * batch:
+            file.write("".join(parts))
+            parts = []
+    parts.append("}")
+    file.write("".join(parts))
+    return count
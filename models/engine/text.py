@@ -0,0 +1,242 @@
+#!/usr/bin/python3
+"""Defines a full-text index over Review.text and Place.description."""
+import heapq
+import json
+import math
+import os
+import re
+from models.engine.atomic import atomic_open
+from models.engine.index import Index
+
+_token = re.compile(r"\w+")
+
+
+def tokenize(text):
+    """
+    Splits a text in lowercase words.
+
+    :param text: A string.
+    :return: A list of words.
+    """
+    return _token.findall(text.lower()) if isinstance(text, str) else []
+
+
+class TextIndex(Index):
+    """
+    An inverted index from word to the objects whose text fields hold
+    it, queried with BM25 ranking.
+
+    Each class is indexed and ranked on its own. The index is saved
+    next to the storage file by storage.flush(), with a fingerprint of
+    the storage files; it is loaded instead of rebuilt while the files
+    have not changed since. The words of each object, needed to update
+    it, are only rebuilt from the loaded postings on the first update.
+    """
+
+    fields = {"Review": ("text",),
+              "Place": ("name", "description")}
+    classes = tuple(fields)
+    k1 = 1.2
+    b = 0.75
+    VERSION = 1
+
+    def clear(self):
+        """Empties the index."""
+        self.postings = {name: {} for name in self.fields}
+        self.__docs = {}
+        self.lengths = {}
+        self.count = {name: 0 for name in self.fields}
+        self.total = {name: 0 for name in self.fields}
+        self.fingerprint = None
+        self.changed = True
+
+    def mark(self, key, obj):
+        """
+        Records that the object of key was created or changed, even
+        before the first refresh, which may load the saved index.
+
+        :param key: The <class name>.<id> key of the object.
+        :param obj: The object, None if it was deleted.
+        """
+        self.pending[key] = obj
+
+    def refresh(self):
+        """
+        Applies the changes recorded since the last refresh, loading
+        the saved index first if the index is stale.
+        """
+        if self.stale and self.load():
+            self.stale = False
+        super().refresh()
+
+    def add(self, key, obj):
+        """
+        Adds or updates the words of an object.
+
+        :param key: The <class name>.<id> key of the object.
+        :param obj: The object.
+        """
+        self.remove(key)
+        cls_name = key.split(".", 1)[0]
+        words = []
+        for field in self.fields[cls_name]:
+            words.extend(tokenize(getattr(obj, field, None)))
+        counts = {}
+        for word in words:
+            counts[word] = counts.get(word, 0) + 1
+        self.__insert(cls_name, key, counts)
+
+    def __insert(self, cls_name, key, counts):
+        """
+        Adds the word counts of an object to the postings.
+
+        :param cls_name: The class name of the object.
+        :param key: The <class name>.<id> key of the object.
+        :param counts: A dictionary of word to number of occurrences.
+        """
+        postings = self.postings[cls_name]
+        for word, count in counts.items():
+            postings.setdefault(word, {})[key] = count
+        self.docs[key] = counts
+        self.lengths[key] = length = sum(counts.values())
+        self.count[cls_name] += 1
+        self.total[cls_name] += length
+        self.changed = True
+
+    @property
+    def docs(self):
+        """The word counts of every object, by key."""
+        if self.__docs is None:
+            self.__docs = {}
+            for postings in self.postings.values():
+                for word, counts in postings.items():
+                    for key, count in counts.items():
+                        self.__docs.setdefault(key, {})[word] = count
+        return self.__docs
+
+    def remove(self, key):
+        """
+        Removes the words of an object, if it is indexed.
+
+        :param key: The <class name>.<id> key of the object.
+        """
+        counts = self.docs.pop(key, None)
+        if counts is None:
+            return
+        cls_name = key.split(".", 1)[0]
+        postings = self.postings[cls_name]
+        for word in counts:
+            del postings[word][key]
+            if not postings[word]:
+                del postings[word]
+        self.count[cls_name] -= 1
+        self.total[cls_name] -= self.lengths.pop(key)
+        self.changed = True
+
+    def search_keys(self, cls_name, query, limit=10):
+        """
+        Returns the keys of the objects of cls_name that best match
+        the words of query.
+
+        :param cls_name: The class name, "Review" or "Place".
+        :param query: A string of words.
+        :param limit: The maximum number of results, None for all.
+        :return: A list of (score, key) pairs, best first.
+        """
+        self.refresh()
+        postings = self.postings.get(cls_name, {})
+        n = self.count.get(cls_name, 0)
+        if not n:
+            return []
+        average = self.total[cls_name] / n or 1
+        scores = {}
+        for word in set(tokenize(query)):
+            docs = postings.get(word)
+            if not docs:
+                continue
+            idf = math.log(1 + (n - len(docs) + 0.5) / (len(docs) + 0.5))
+            for key, count in docs.items():
+                norm = self.k1 * (1 - self.b + self.b *
+                                  self.lengths[key] / average)
+                scores[key] = scores.get(key, 0.0) + idf * count * (
+                    self.k1 + 1) / (count + norm)
+        hits = ((score, key) for key, score in scores.items())
+        if limit is None:
+            return sorted(hits, key=lambda hit: (-hit[0], hit[1]))
+        return heapq.nsmallest(limit, hits, key=lambda hit: (-hit[0],
+                                                             hit[1]))
+
+    def search(self, cls_name, query, limit=10):
+        """
+        Returns the objects of cls_name that best match query.
+
+        :param cls_name: The class name, "Review" or "Place".
+        :param query: A string of words.
+        :param limit: The maximum number of results, None for all.
+        :return: A list of objects, best first.
+        """
+        objs = []
+        for score, key in self.search_keys(cls_name, query, limit):
+            obj = self.storage.get(cls_name, key.split(".", 1)[1])
+            if obj is not None:
+                objs.append(obj)
+        return objs
+
+    def __path(self):
+        """Returns the path of the saved index, None if not supported."""
+        if not hasattr(self.storage, "fingerprint"):
+            return None
+        return self.storage.index_path("text")
+
+    def persist(self):
+        """
+        Saves the index next to the storage file if it changed since
+        it was loaded or saved.
+        """
+        path = self.__path()
+        if path is None:
+            return
+        self.refresh()
+        fingerprint = self.storage.fingerprint()
+        if fingerprint is None or (not self.changed and
+                                   fingerprint == self.fingerprint):
+            return
+        with atomic_open(path, 'w') as file:
+            json.dump({"version": self.VERSION,
+                       "fingerprint": fingerprint,
+                       "postings": self.postings,
+                       "lengths": self.lengths,
+                       "count": self.count,
+                       "total": self.total}, file)
+        self.fingerprint = fingerprint
+        self.changed = False
+
+    def load(self):
+        """
+        Loads the saved index if the storage files did not change
+        since it was saved.
+
+        :return: True if the index was loaded.
+        """
+        path = self.__path()
+        if path is None or not os.path.exists(path):
+            return False
+        fingerprint = self.storage.fingerprint()
+        if fingerprint is None:
+            return False
+        try:
+            with open(path) as f:
+                saved = json.load(f)
+        except ValueError:
+            return False
+        if (saved.get("version") != self.VERSION or
+                saved.get("fingerprint") != fingerprint):
+            return False
+        self.postings = saved["postings"]
+        self.lengths = saved["lengths"]
+        self.count = saved["count"]
+        self.total = saved["total"]
+        self.__docs = None
+        self.fingerprint = fingerprint
+        self.changed = False
+        return True
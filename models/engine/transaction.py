@@ -0,0 +1,64 @@
+#!/usr/bin/python3
+"""Defines the undo log of the storage transactions."""
+
+
+def _snapshot(obj):
+    """
+    Returns a copy of the attributes of obj; lists are copied too,
+    since they are the only mutable values of the schema.
+
+    :param obj: A model instance.
+    :return: A dictionary of attribute name to value.
+    """
+    return {name: list(value) if type(value) is list else value
+            for name, value in obj.__dict__.items()}
+
+
+class UndoLog:
+    """
+    The state, before a transaction, of the objects it changes.
+
+    An object is copied the first time it is changed, created or
+    deleted in the transaction (copy on write), so a transaction costs
+    nothing for the objects it does not touch.
+    """
+
+    def __init__(self):
+        """Initialize an empty log."""
+        self.entries = {}
+
+    def __len__(self):
+        """Returns the number of objects changed in the transaction."""
+        return len(self.entries)
+
+    def record(self, key, obj):
+        """
+        Records the state of the object of key before its first change
+        in the transaction.
+
+        :param key: The <class name>.<id> key.
+        :param obj: The object stored under key, None if there is none.
+        """
+        if key not in self.entries:
+            self.entries[key] = None if obj is None else (obj, _snapshot(obj))
+
+    def restore(self):
+        """
+        Gives back their attributes to the objects of the log.
+
+        :return: A list of (key, object) pairs, the object stored under
+                 key before the transaction, None if there was none.
+        """
+        restored = []
+        for key, entry in self.entries.items():
+            if entry is None:
+                restored.append((key, None))
+                continue
+            obj, saved = entry
+            attributes = obj.__dict__
+            for name in [name for name in attributes if name not in saved]:
+                delattr(obj, name)
+            attributes.update(saved)
+            restored.append((key, obj))
+        self.entries = {}
+        return restored
@@ -1,6 +1,7 @@
 #!/usr/bin/python3
 """Defines the Place class."""
 from models.base_model import BaseModel
+from models.engine.relations import relationship
 
 
 class Place(BaseModel):
@@ -18,6 +19,7 @@ class Place(BaseModel):
         latitude (float): The latitude of the place.
         longitude (float): The longitude of the place.
         amenity_ids (list): A list of Amenity ids.
+        reviews (list): The reviews of the place, read-only.
     """
 
     city_id = ""
@@ -31,3 +33,4 @@ class Place(BaseModel):
     latitude = 0.0
     longitude = 0.0
     amenity_ids = []
+    reviews = relationship("Review", "place_id")
@@ -1,6 +1,7 @@
 #!/usr/bin/python3
 """Defines the State class."""
 from models.base_model import BaseModel
+from models.engine.relations import relationship
 
 
 class State(BaseModel):
@@ -8,6 +9,8 @@ class State(BaseModel):
 
     Attributes:
         name (str): The name of the state.
+        cities (list): The cities of the state, read-only.
     """
 
     name = ""
+    cities = relationship("City", "state_id")
@@ -1,6 +1,7 @@
 #!/usr/bin/python3
 """Defines the User class."""
 from models.base_model import BaseModel
+from models.engine.relations import relationship
 
 
 class User(BaseModel):
@@ -11,9 +12,13 @@ class User(BaseModel):
         password (str): The password of the user.
         first_name (str): The first name of the user.
         last_name (str): The last name of the user.
+        places (list): The places owned by the user, read-only.
+        reviews (list): The reviews written by the user, read-only.
     """
 
     email = ""
     password = ""
     first_name = ""
     last_name = ""
+    places = relationship("Place", "user_id")
+    reviews = relationship("Review", "user_id")
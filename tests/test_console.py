@@ -6,7 +6,9 @@ from models.engine.file_storage import FileStorage
 from models import storage
 import io
 from io import StringIO
+import json
 import os
+import tempfile
 
 
 class TestParseFunction(unittest.TestCase):
@@ -56,8 +58,9 @@ class TestHBNBCommandClass(unittest.TestCase):
             self.assertEqual(h, output.getvalue().strip())
 
     def test_help_create(self):
-        h = ("Usage: create <class>\n        "
-             "Create a new class instance and print its id.")
+        h = ("Usage: create <class> [count=<n> [{<attributes>}]]\n"
+             "        Create a new class instance and print its id, or <n> "
+             "instances\n        saved at once and the throughput.")
         with patch("sys.stdout", new=StringIO()) as output:
             self.assertFalse(HBNBCommand().onecmd("help create"))
             self.assertEqual(h, output.getvalue().strip())
@@ -180,7 +183,7 @@ class TestConsoleCommands(unittest.TestCase):
     def test_do_all_class_does_not_exist(self):
         """Test all with non-existent class name"""
         self.input_cmd = "all MyModel"
-        expected_output = "['MyModel']\n** class doesn't exist **"
+        expected_output = "** class doesn't exist **"
         self.assert_output(expected_output)
 
     def test_update_valid_string_attr_space_notation(self):
@@ -192,6 +195,67 @@ class TestConsoleCommands(unittest.TestCase):
         test_dict = storage.all()["BaseModel.{}".format(testId)].__dict__
         self.assertEqual("attr_value", test_dict["attr_name"])
 
+    def test_update_relationship(self):
+        with patch("sys.stdout", new=StringIO()) as output:
+            HBNBCommand().onecmd("create State")
+            state_id = output.getvalue().strip()
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd(
+                "update State {} cities x".format(state_id)))
+            self.assertEqual("** attribute can't be set **",
+                             output.getvalue().strip())
+
+    def test_update_list(self):
+        with patch("sys.stdout", new=StringIO()) as output:
+            HBNBCommand().onecmd("create Place")
+            place_id = output.getvalue().strip()
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd(
+                'Place.update({}, amenity_ids, ["a", "b"])'.format(place_id)))
+            self.assertEqual(["a", "b"],
+                             storage.get("Place", place_id).amenity_ids)
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd(
+                "update Place {} amenity_ids wifi".format(place_id)))
+            self.assertEqual("** value is not a list **",
+                             output.getvalue().strip())
+
+    def test_update_dict(self):
+        with patch("sys.stdout", new=StringIO()) as output:
+            HBNBCommand().onecmd("create Place")
+            place_id = output.getvalue().strip()
+        line = ('Place.update("{}", {{"number_rooms": "4", "latitude": 2, '
+                '"amenity_ids": ["a"], "nickname": 7, "reviews": []}})')
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd(line.format(place_id)))
+            self.assertEqual("Instance updated successfully.",
+                             output.getvalue().strip())
+        place = storage.get("Place", place_id)
+        self.assertEqual(4, place.number_rooms)
+        self.assertEqual(2.0, place.latitude)
+        self.assertIs(float, type(place.latitude))
+        self.assertEqual(["a"], place.amenity_ids)
+        self.assertEqual(7, place.nickname)
+        self.assertNotIn("reviews", place.__dict__)
+
+    def test_update_errors(self):
+        with patch("sys.stdout", new=StringIO()) as output:
+            HBNBCommand().onecmd("create Place")
+            place_id = output.getvalue().strip()
+        for line, error in (
+                ("update Place {} number_rooms many",
+                 "** value is not an int **"),
+                ('Place.update("{}", {{"name": "x", "latitude": "north"}})',
+                 "** value is not a float **"),
+                ('Place.update("{}", {{"name": __import__("os").getcwd()}})',
+                 "** value missing **"),
+                ("update Place {} {{[1]: 2}}", "** value missing **"),
+                ("update Place {} name", "** value missing **")):
+            with patch("sys.stdout", new=StringIO()) as output:
+                self.assertFalse(HBNBCommand().onecmd(line.format(place_id)))
+                self.assertEqual(error, output.getvalue().strip())
+        self.assertNotIn("name", storage.get("Place", place_id).__dict__)
+
 
 class TestHBNBCommand_count(unittest.TestCase):
     """Unittests for testing count method of HBNB comand interpreter."""
@@ -218,7 +282,18 @@ class TestHBNBCommand_count(unittest.TestCase):
     def test_count_invalid_class(self):
         with patch("sys.stdout", new=StringIO()) as output:
             self.assertFalse(HBNBCommand().onecmd("MyModel.count()"))
-            self.assertEqual("0", output.getvalue().strip())
+            self.assertEqual("** class doesn't exist **",
+                             output.getvalue().strip())
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd("count MyModel"))
+            self.assertEqual("** class doesn't exist **",
+                             output.getvalue().strip())
+
+    def test_count_missing_class(self):
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd("count"))
+            self.assertEqual("** class name missing **",
+                             output.getvalue().strip())
 
     def test_count_object(self):
         with patch("sys.stdout", new=StringIO()) as output:
@@ -228,5 +303,329 @@ class TestHBNBCommand_count(unittest.TestCase):
             self.assertEqual("1", output.getvalue().strip())
 
 
+class TestHBNBCommand_near(unittest.TestCase):
+    """Unittests for testing near and nearest of HBNB comand interpreter."""
+
+    def setUp(self):
+        FileStorage._FileStorage__objects = {}
+        self.places = []
+        for lat in (37.70, 37.75, 38.5):
+            place = storage.classes()["Place"]()
+            place.latitude = lat
+            place.longitude = -122.4
+            self.places.append(place)
+
+    def tearDown(self):
+        FileStorage._FileStorage__objects = {}
+
+    def test_near(self):
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd(
+                "Place.near(37.7, -122.4, 10)"))
+            self.assertEqual(str([str(p) for p in self.places[:2]]),
+                             output.getvalue().strip())
+
+    def test_nearest(self):
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd(
+                "Place.nearest(38.6, -122.4, 1)"))
+            self.assertEqual(str([str(self.places[2])]),
+                             output.getvalue().strip())
+
+    def test_near_errors(self):
+        for line, error in (("near", "** class name missing **"),
+                            ("MyModel.near(1, 2, 3)",
+                             "** class doesn't exist **"),
+                            ("User.near(1, 2, 3)",
+                             "** class has no location **"),
+                            ("Place.near(1, 2)", "** coordinates missing **"),
+                            ("Place.nearest(a, 2, 3)",
+                             "** invalid coordinates **"),
+                            ("Place.nearest(0, 0, inf)",
+                             "** invalid coordinates **"),
+                            ("Place.near(nan, 2, 3)",
+                             "** invalid coordinates **")):
+            with patch("sys.stdout", new=StringIO()) as output:
+                self.assertFalse(HBNBCommand().onecmd(line))
+                self.assertEqual(error, output.getvalue().strip())
+
+
+class TestHBNBCommand_search(unittest.TestCase):
+    """Unittests for testing search of HBNB comand interpreter."""
+
+    def setUp(self):
+        FileStorage._FileStorage__objects = {}
+        self.reviews = []
+        for text in ("quiet and clean", "clean kitchen", "noisy"):
+            review = storage.classes()["Review"]()
+            review.text = text
+            self.reviews.append(review)
+
+    def tearDown(self):
+        FileStorage._FileStorage__objects = {}
+
+    def test_search(self):
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd(
+                'Review.search("quiet clean")'))
+            self.assertEqual(str([str(r) for r in self.reviews[:2]]),
+                             output.getvalue().strip())
+
+    def test_search_errors(self):
+        for line, error in (("search", "** class name missing **"),
+                            ('MyModel.search("a")',
+                             "** class doesn't exist **"),
+                            ('User.search("a")', "** class has no text **"),
+                            ("Review.search()", "** query missing **")):
+            with patch("sys.stdout", new=StringIO()) as output:
+                self.assertFalse(HBNBCommand().onecmd(line))
+                self.assertEqual(error, output.getvalue().strip())
+
+
+class TestHBNBCommand_transaction(unittest.TestCase):
+    """Unittests for testing begin, commit and rollback of HBNB comand
+    interpreter."""
+
+    def setUp(self):
+        FileStorage._FileStorage__objects = {}
+
+    def tearDown(self):
+        if storage.in_transaction():
+            storage.rollback()
+        FileStorage._FileStorage__objects = {}
+
+    def run_lines(self, *lines):
+        with patch("sys.stdout", new=StringIO()) as output:
+            for line in lines:
+                self.assertFalse(HBNBCommand().onecmd(line))
+            return output.getvalue().strip()
+
+    def test_commit(self):
+        user_id = self.run_lines("create User")
+        self.run_lines('update User {} first_name "B"'.format(user_id))
+        state_id = self.run_lines("begin", "create State")
+        self.run_lines('update State {} name "CA"'.format(state_id),
+                       "destroy User {}".format(user_id))
+        with open("file.json") as f:
+            saved = f.read()
+        self.assertIn(user_id, saved)
+        self.assertNotIn(state_id, saved)
+        self.run_lines("commit")
+        with open("file.json") as f:
+            saved = f.read()
+        self.assertNotIn(user_id, saved)
+        self.assertIn(state_id, saved)
+        self.assertEqual("CA", storage.get("State", state_id).name)
+
+    def test_rollback(self):
+        user_id = self.run_lines("create User")
+        self.run_lines("begin", 'update User {} email "a@b.c"'.format(user_id))
+        state_id = self.run_lines("create State")
+        self.run_lines("destroy User {}".format(user_id), "rollback")
+        self.assertNotIn("email", storage.get("User", user_id).__dict__)
+        self.assertIsNone(storage.get("State", state_id))
+        self.assertFalse(storage.in_transaction())
+
+    def test_errors(self):
+        self.assertEqual("** no transaction open **",
+                         self.run_lines("commit"))
+        self.assertEqual("** no transaction open **",
+                         self.run_lines("rollback"))
+        self.assertEqual("** transaction already open **",
+                         self.run_lines("begin", "begin"))
+
+
+class TestHBNBCommand_create_many(unittest.TestCase):
+    """Unittests for testing create count=<n> of HBNB comand interpreter."""
+
+    def setUp(self):
+        FileStorage._FileStorage__objects = {}
+
+    def tearDown(self):
+        FileStorage._FileStorage__objects = {}
+
+    def test_create_many(self):
+        line = 'create User count=25 {"first_name": "x", "age": 3}'
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd(line))
+            self.assertRegex(output.getvalue().strip(),
+                             r"^Created 25 User in [0-9.]+s "
+                             r"\([0-9,]+ objects/s\)$")
+        users = storage.all("User")
+        self.assertEqual(25, len(users))
+        self.assertEqual(25, len({user.id for user in users.values()}))
+        self.assertEqual({"x"}, {user.first_name for user in users.values()})
+        self.assertEqual(0, storage.dirty_count())
+        with open("file.json") as f:
+            saved = json.load(f)
+        self.assertEqual(set(users), set(saved))
+
+    def test_create_many_coerces(self):
+        line = 'create Place count=2 {"number_rooms": "3"}'
+        with patch("sys.stdout", new=StringIO()):
+            self.assertFalse(HBNBCommand().onecmd(line))
+        for place in storage.all("Place").values():
+            self.assertEqual(3, place.number_rooms)
+
+    def test_create_many_errors(self):
+        for line, error in (("create User count=0", "** invalid count **"),
+                            ("create User size=3", "** invalid count **"),
+                            ("create User count=x", "** invalid count **"),
+                            ('create User count=2 ["a"]',
+                             "** invalid attributes **"),
+                            ('create Place count=2 {"max_guest": "many"}',
+                             "** value is not an int **")):
+            with patch("sys.stdout", new=StringIO()) as output:
+                self.assertFalse(HBNBCommand().onecmd(line))
+                self.assertEqual(error, output.getvalue().strip())
+        self.assertEqual(0, storage.count())
+
+
+class TestHBNBCommand_stats(unittest.TestCase):
+    """Unittests for testing stats of HBNB comand interpreter."""
+
+    def setUp(self):
+        FileStorage._FileStorage__objects = {}
+        storage.reset_stats()
+
+    def tearDown(self):
+        storage.configure(metrics=False)
+        storage.reset_stats()
+        FileStorage._FileStorage__objects = {}
+
+    def run_lines(self, *lines):
+        with patch("sys.stdout", new=StringIO()) as output:
+            for line in lines:
+                self.assertFalse(HBNBCommand().onecmd(line))
+            return output.getvalue().strip()
+
+    def test_stats(self):
+        self.assertEqual("** metrics are off, run stats on **",
+                         self.run_lines("stats"))
+        lines = self.run_lines("stats on", "create User count=3",
+                               "stats").splitlines()
+        self.assertTrue(lines[1].startswith("operation"))
+        self.assertIn("bulk_new", [line.split()[0] for line in lines[2:-2]])
+        self.assertRegex(lines[-2], r"^bytes written: [1-9][0-9]*$")
+        self.assertEqual("bytes read: 0", lines[-1])
+
+    def test_stats_json(self):
+        self.run_lines("stats on", "create User count=2")
+        stats = json.loads(self.run_lines("stats json"))
+        self.assertEqual(1, stats["operations"]["save"]["count"])
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "stats.json")
+            self.run_lines("stats off", "stats json {}".format(path))
+            with open(path) as f:
+                self.assertFalse(json.load(f)["enabled"])
+        self.run_lines("stats reset")
+        self.assertEqual({}, storage.stats()["operations"])
+        self.assertEqual("** unknown stats command **",
+                         self.run_lines("stats bogus"))
+        self.assertRegex(self.run_lines("stats json /missing/stats.json"),
+                         r"^\*\* cannot write /missing/stats.json: .+ \*\*$")
+
+
+class TestHBNBCommand_all(unittest.TestCase):
+    """Unittests for testing the options of all of HBNB comand
+    interpreter."""
+
+    def setUp(self):
+        FileStorage._FileStorage__objects = {}
+        self.users = [storage.classes()["User"]() for i in range(4)]
+        storage.classes()["State"]()
+
+    def tearDown(self):
+        FileStorage._FileStorage__objects = {}
+
+    def run_line(self, line):
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd(line))
+            return output.getvalue().splitlines()
+
+    def test_all_one_per_line(self):
+        self.assertEqual([str(us) for us in self.users],
+                         self.run_line("all User"))
+        self.assertEqual(5, len(self.run_line("all")))
+
+    def test_limit_offset(self):
+        for line in ("all User limit=2 offset=1",
+                     "User.all(limit=2, offset=1)"):
+            self.assertEqual([str(us) for us in self.users[1:3]],
+                             self.run_line(line))
+
+    def test_cursor(self):
+        lines = self.run_line("all User after={} limit=2".format(
+            self.users[1].id))
+        self.assertEqual([str(us) for us in self.users[2:]], lines)
+        lines = self.run_line("all after=User.{}".format(self.users[3].id))
+        self.assertEqual(1, len(lines))
+        self.assertTrue(lines[0].startswith("[State]"))
+
+    def test_jsonl(self):
+        lines = self.run_line("all User format=jsonl limit=1")
+        self.assertEqual([self.users[0].to_dict()],
+                         [json.loads(line) for line in lines])
+
+    def test_all_errors(self):
+        for line, error in (("all User limit=x", "** invalid limit **"),
+                            ("all User offset=-1", "** invalid offset **"),
+                            ("all User colour=red",
+                             "** unknown option 'colour' **"),
+                            ("all User format=xml",
+                             "** unknown format 'xml' **"),
+                            ("all User after=missing",
+                             "** no instance found **")):
+            self.assertEqual([error], self.run_line(line))
+
+
+class TestHBNBCommand_where(unittest.TestCase):
+    """Unittests for testing where and explain of HBNB comand interpreter."""
+
+    def setUp(self):
+        FileStorage._FileStorage__objects = {}
+        self.places = []
+        for price in (120, 40, 80):
+            place = storage.classes()["Place"]()
+            place.price_by_night = price
+            self.places.append(place)
+
+    def tearDown(self):
+        FileStorage._FileStorage__objects = {}
+
+    def test_where(self):
+        expected = str([str(self.places[2]), str(self.places[1])])
+        for line in ('Place.where(price_by_night < 100, '
+                     'order_by="-price_by_night")',
+                     'where Place price_by_night < 100, '
+                     'order_by="-price_by_night"'):
+            with patch("sys.stdout", new=StringIO()) as output:
+                self.assertFalse(HBNBCommand().onecmd(line))
+                self.assertEqual(expected, output.getvalue().strip())
+
+    def test_explain(self):
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd(
+                'Place.explain(price_by_night in (40, 80), limit=1)'))
+            self.assertEqual("plan: class scan (cost 3)\n"
+                             "filter: price_by_night in (40, 80)\n"
+                             "limit: 1", output.getvalue().strip())
+
+    def test_where_errors(self):
+        for line, error in (("where", "** class name missing **"),
+                            ("MyModel.where()", "** class doesn't exist **"),
+                            ("Place.where(price_by_night <)",
+                             "** invalid query: syntax error **"),
+                            ("explain Place colour=1",
+                             "** invalid query: unknown option 'colour' **"),
+                            ("Place.where(name is None)",
+                             "** invalid query: unknown operator **"),
+                            ("Place.where(name == {[1]})",
+                             "** invalid query: values must be literals **")):
+            with patch("sys.stdout", new=StringIO()) as output:
+                self.assertFalse(HBNBCommand().onecmd(line))
+                self.assertEqual(error, output.getvalue().strip())
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -3,6 +3,7 @@ import unittest
 import os
 from time import sleep
 from datetime import datetime
+import models
 from models.base_model import BaseModel
 
 
@@ -47,6 +48,30 @@ class TestBaseModel(unittest.TestCase):
         self.assertEqual(base_model.updated_at,
                          datetime(2023, 8, 2, 12, 34, 56, 789012))
 
+    def test_from_dict(self):
+        record = self.base_model.to_dict()
+        record['name'] = 'Betty'
+        count = models.storage.count()
+        base_model = BaseModel.from_dict(record)
+        self.assertEqual(count, models.storage.count())
+        self.assertIs(record, base_model.__dict__)
+        self.assertEqual(self.base_model.id, base_model.id)
+        self.assertEqual(self.base_model.created_at, base_model.created_at)
+        self.assertEqual(self.base_model.updated_at, base_model.updated_at)
+        self.assertEqual('Betty', base_model.name)
+        self.assertNotIn('__class__', base_model.__dict__)
+
+    def test_from_dict_timestamps(self):
+        base_model = BaseModel.from_dict({
+            'id': 'test_id',
+            'created_at': '2023-08-01T12:34:56',
+            'updated_at': '2023-08-02T12:34:56.7'})
+        self.assertEqual(datetime(2023, 8, 1, 12, 34, 56),
+                         base_model.created_at)
+        self.assertEqual(datetime(2023, 8, 2, 12, 34, 56, 700000),
+                         base_model.updated_at)
+        self.assertIsInstance(BaseModel.from_dict({}).id, str)
+
 
 class TestBaseModel_save(unittest.TestCase):
     """Unittests for testing save method of the BaseModel class."""
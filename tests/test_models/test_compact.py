@@ -0,0 +1,128 @@
+#!/usr/bin/python3
+"""Defines unittests for models/compact.py.
+
+Unittest classes:
+    TestCompact_instances
+    TestCompact_storage
+"""
+import models
+import unittest
+from datetime import datetime
+from unittest.mock import patch
+from models.compact import compact_classes
+from models.engine.file_storage import FileStorage
+from models.place import Place
+from models.user import User
+from test_models.test_engine import StorageTestCase
+
+
+class TestCompact_instances(unittest.TestCase):
+    """Unittests for testing the compact classes on their own."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.classes = compact_classes(models.storage.classes(),
+                                      models.storage.attributes())
+
+    def test_same_name(self):
+        self.assertEqual("User", self.classes["User"].__name__)
+
+    def test_no_dict(self):
+        user = self.classes["User"](id="x", created_at=datetime.now()
+                                    .isoformat(), updated_at=datetime.now()
+                                    .isoformat())
+        self.assertEqual(0, type(user).__dictoffset__)
+        self.assertEqual("x", user.id)
+
+    def test_to_dict_round_trip(self):
+        user = User()
+        user.email = "betty@hbnb.io"
+        user.nickname = "betty"
+        record = user.to_dict()
+        compact = self.classes["User"](**record)
+        self.assertEqual(record, compact.to_dict())
+        self.assertEqual(user.id, compact.id)
+        self.assertEqual(user.created_at, compact.created_at)
+        self.assertEqual(str(user), str(compact))
+        self.assertEqual(16, len(compact._id))
+        self.assertIs(int, type(compact._updated_at))
+
+    def test_defaults(self):
+        place = self.classes["Place"](id="1", created_at=datetime.now()
+                                      .isoformat(), updated_at=datetime.now()
+                                      .isoformat())
+        self.assertEqual(0, place.number_rooms)
+        self.assertEqual("1", place.id)
+        self.assertNotIn("number_rooms", place.to_dict())
+        with self.assertRaises(AttributeError):
+            place.unknown
+
+    def test_dict_view(self):
+        place = self.classes["Place"](**Place().to_dict())
+        place.__dict__["max_guest"] = 4
+        place.__dict__["pets"] = True
+        self.assertEqual(4, place.max_guest)
+        self.assertTrue(place.pets)
+        self.assertEqual(["id", "created_at", "updated_at", "max_guest",
+                          "pets"], list(place.__dict__))
+        del place.__dict__["pets"]
+        self.assertFalse(hasattr(place, "pets"))
+
+    def test_from_dict(self):
+        record = dict(Place().to_dict(), created_at="2020-01-01T00:00:00")
+        count = models.storage.count()
+        with patch("models.compact.uuid4") as uuid4:
+            place = self.classes["Place"].from_dict(dict(record))
+        uuid4.assert_not_called()
+        self.assertEqual(count, models.storage.count())
+        self.assertEqual(record, place.to_dict())
+
+
+class TestCompact_storage(StorageTestCase):
+    """Unittests for testing the compact option of FileStorage."""
+
+    def test_reload_compact(self):
+        user = User()
+        user.email = "betty@hbnb.io"
+        models.storage.save()
+        models.storage.configure(compact=True)
+        FileStorage._FileStorage__objects = {}
+        models.storage.reload()
+        compact = models.storage.get(User, user.id)
+        self.assertNotIsInstance(compact, User)
+        self.assertEqual(user.to_dict(), compact.to_dict())
+        self.assertEqual(1, models.storage.count("User"))
+
+    def test_reload_whole_seconds(self):
+        user = User.from_dict({"id": "345",
+                               "created_at": "2020-01-01T00:00:00",
+                               "updated_at": "2020-01-01T00:00:00.000001",
+                               "__class__": "User"})
+        models.storage.new(user)
+        models.storage.save()
+        models.storage.configure(compact=True)
+        FileStorage._FileStorage__objects = {}
+        models.storage.reload()
+        compact = models.storage.get(User, "345")
+        self.assertEqual(datetime(2020, 1, 1), compact.created_at)
+        self.assertEqual(user.to_dict(), compact.to_dict())
+
+    def test_changes_are_saved(self):
+        user = User()
+        models.storage.save()
+        models.storage.configure(compact=True, journal=True)
+        FileStorage._FileStorage__objects = {}
+        models.storage.reload()
+        compact = models.storage.get(User, user.id)
+        compact.first_name = "Betty"
+        self.assertEqual(1, models.storage.dirty_count())
+        compact.save()
+        models.storage.configure(compact=False)
+        FileStorage._FileStorage__objects = {}
+        models.storage.reload()
+        self.assertEqual("Betty", models.storage.get(User, user.id)
+                         .first_name)
+
+
+if __name__ == "__main__":
+    unittest.main()
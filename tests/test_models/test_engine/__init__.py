@@ -0,0 +1,31 @@
+#!/usr/bin/python3
+"""Defines the base class of the storage unittests."""
+import os
+import models
+import tempfile
+import unittest
+from models.engine.file_storage import FileStorage
+
+
+class StorageTestCase(unittest.TestCase):
+    """
+    Base of the unittests that run FileStorage on self.path, a file of
+    a temporary directory, and restore its options and file path after
+    each test.
+    """
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "file.json")
+        self.options = dict(FileStorage._FileStorage__options)
+        self.file_path = FileStorage._FileStorage__file_path
+        FileStorage._FileStorage__file_path = self.path
+        FileStorage._FileStorage__objects = {}
+
+    def tearDown(self):
+        if models.storage.in_transaction():
+            models.storage.rollback()
+        FileStorage._FileStorage__options = self.options
+        FileStorage._FileStorage__file_path = self.file_path
+        FileStorage._FileStorage__objects = {}
+        self.tmpdir.cleanup()
@@ -0,0 +1,62 @@
+#!/usr/bin/python3
+"""Defines unittests for models/engine/amenities.py.
+
+Unittest classes:
+    TestAmenityIndex
+"""
+import models
+import unittest
+from models.amenity import Amenity
+from models.engine.amenities import AmenityIndex
+from models.engine.file_storage import FileStorage
+from models.place import Place
+from test_models.test_engine import StorageTestCase
+
+
+class TestAmenityIndex(StorageTestCase):
+    """Unittests for testing the inverted index of amenities."""
+
+    def setUp(self):
+        super().setUp()
+        self.wifi, self.tv, self.pets = Amenity(), Amenity(), Amenity()
+        self.places = [Place() for i in range(6)]
+        for i, place in enumerate(self.places):
+            place.amenity_ids = [a.id for n, a in enumerate(
+                (self.wifi, self.tv, self.pets)) if i >> n & 1]
+        self.index = models.storage.index(AmenityIndex)
+
+    def tearDown(self):
+        models.storage.remove_index(self.index)
+        super().tearDown()
+
+    def test_intersection(self):
+        self.assertEqual([self.places[3]],
+                         self.index.places(self.wifi, self.tv))
+        self.assertEqual([self.places[1], self.places[3], self.places[5]],
+                         self.index.places(self.wifi.id))
+        self.assertEqual([], self.index.places(self.wifi, self.tv,
+                                               self.pets))
+        self.assertEqual(0, self.index.count("unknown"))
+        self.assertEqual(6, self.index.count())
+
+    def test_follows_changes(self):
+        self.assertEqual(1, self.index.count(self.wifi, self.pets))
+        self.places[0].amenity_ids = [self.wifi.id, self.pets.id]
+        self.places[5].amenity_ids = []
+        models.storage.delete(self.places[1])
+        new = Place()
+        new.amenity_ids = [self.wifi.id, self.pets.id, self.tv.id]
+        self.assertEqual(sorted([self.places[0].id, new.id]),
+                         sorted(self.index.ids(self.wifi, self.pets)))
+        self.assertEqual(new.id, self.index.keys[1].split(".")[1])
+
+    def test_reload(self):
+        models.storage.save()
+        FileStorage._FileStorage__objects = {}
+        models.storage.reload()
+        self.assertEqual([self.places[3].id],
+                         self.index.ids(self.wifi, self.tv))
+
+
+if __name__ == "__main__":
+    unittest.main()
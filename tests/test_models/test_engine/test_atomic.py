@@ -0,0 +1,79 @@
+#!/usr/bin/python3
+"""Defines unittests for models/engine/atomic.py.
+
+Unittest classes:
+    TestAtomicOpen
+"""
+import os
+import tempfile
+import unittest
+from models.engine.atomic import atomic_open
+
+
+class TestAtomicOpen(unittest.TestCase):
+    """Unittests for testing crash-safe file writes."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "file.json")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def read(self):
+        with open(self.path) as f:
+            return f.read()
+
+    def test_creates_file(self):
+        with atomic_open(self.path) as f:
+            f.write("{}")
+        self.assertEqual("{}", self.read())
+        self.assertEqual(["file.json"], os.listdir(self.tmpdir.name))
+
+    def test_replaces_file(self):
+        with open(self.path, "w") as f:
+            f.write("old")
+        with atomic_open(self.path, sync=True) as f:
+            f.write("new")
+        self.assertEqual("new", self.read())
+
+    def test_old_content_survives_until_rename(self):
+        with open(self.path, "w") as f:
+            f.write("old")
+        with atomic_open(self.path) as f:
+            f.write("new")
+            self.assertEqual("old", self.read())
+
+    def test_failed_write_keeps_old_content(self):
+        with open(self.path, "w") as f:
+            f.write("old")
+        with self.assertRaises(ZeroDivisionError):
+            with atomic_open(self.path) as f:
+                f.write("half")
+                1 / 0
+        self.assertEqual("old", self.read())
+        self.assertEqual(["file.json"], os.listdir(self.tmpdir.name))
+
+    def test_binary_mode(self):
+        with atomic_open(self.path, "wb") as f:
+            f.write(b"HBNB")
+        with open(self.path, "rb") as f:
+            self.assertEqual(b"HBNB", f.read())
+
+    def test_keeps_permissions(self):
+        with open(self.path, "w") as f:
+            f.write("old")
+        os.chmod(self.path, 0o640)
+        with atomic_open(self.path) as f:
+            f.write("new")
+        self.assertEqual(0o640, os.stat(self.path).st_mode & 0o777)
+
+    def test_missing_directory(self):
+        path = os.path.join(self.tmpdir.name, "missing", "file.json")
+        with self.assertRaises(FileNotFoundError):
+            with atomic_open(path) as f:
+                f.write("{}")
+
+
+if __name__ == "__main__":
+    unittest.main()
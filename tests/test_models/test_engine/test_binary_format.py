@@ -0,0 +1,104 @@
+#!/usr/bin/python3
+"""Defines unittests for models/engine/binary_format.py.
+
+Unittest classes:
+    TestBinaryFormat
+"""
+import io
+import json
+import unittest
+from unittest.mock import patch
+from models import storage
+from models.engine import binary_format
+
+
+class TestBinaryFormat(unittest.TestCase):
+    """Unittests for testing the binary storage format."""
+
+    def setUp(self):
+        self.records = [
+            {"id": "ed879d60-a541-4e48-ac9b-0cdc9f8acefc",
+             "created_at": "2023-08-15T19:24:19.027561",
+             "updated_at": "2023-08-15T19:24:19.027566",
+             "__class__": "BaseModel"},
+            {"id": "345", "created_at": "1969-12-31T23:59:59.000001",
+             "updated_at": "2023-08-15T19:24:19.000000",
+             "first_name": "Bétty", "email": "b@hbnb.io",
+             "middle_name": "Holberton", "my_number": 98,
+             "__class__": "User"},
+            {"id": "6cfb47c4-a434-4da7-ac03-2122624c3762",
+             "created_at": "2023-08-15T19:24:19.027561",
+             "updated_at": "2023-08-15T19:24:19.027566",
+             "city_id": "0001", "user_id": "0002", "name": "Loft",
+             "number_rooms": 3, "number_bathrooms": -1,
+             "max_guest": 2 ** 40, "price_by_night": "100",
+             "latitude": 37.773972, "longitude": -122.431297,
+             "amenity_ids": ["wifi", "tv"], "__class__": "Place"},
+        ]
+
+    def round_trip(self, records):
+        buf = io.BytesIO()
+        binary_format.dump(records, buf, storage.attributes())
+        buf.seek(0)
+        return list(binary_format.iter_records(buf))
+
+    def test_round_trip(self):
+        got = self.round_trip(self.records)
+        self.assertEqual([f"{r['__class__']}.{r['id']}" for r in
+                          self.records], [key for key, o in got])
+        for record, (key, o) in zip(self.records, got):
+            self.assertEqual(record, o)
+
+    def test_dump_returns_counts(self):
+        buf = io.BytesIO()
+        count, nbytes = binary_format.dump(self.records, buf,
+                                           storage.attributes())
+        self.assertEqual(3, count)
+        self.assertEqual(len(buf.getvalue()), nbytes)
+
+    def test_values_off_schema_are_kept(self):
+        key, o = self.round_trip(self.records[2:])[0]
+        self.assertEqual("100", o["price_by_night"])
+        self.assertEqual(int, type(o["number_rooms"]))
+
+    def test_unknown_class(self):
+        record = dict(self.records[0], __class__="MyModel", name="x")
+        self.assertEqual(record, self.round_trip([record])[0][1])
+
+    def test_repeated_strings_stored_once(self):
+        records = [dict(self.records[2], id=str(i)) for i in range(100)]
+        buf = io.BytesIO()
+        binary_format.dump(records, buf, storage.attributes())
+        self.assertEqual(1, buf.getvalue().count(b"Loft"))
+
+    def test_smaller_than_json(self):
+        records = [dict(self.records[2], id=f"{i:08d}-a434-4da7-ac03-"
+                        "2122624c3762") for i in range(100)]
+        buf = io.BytesIO()
+        binary_format.dump(records, buf, storage.attributes())
+        self.assertLess(len(buf.getvalue()) * 3, len(json.dumps(records)))
+
+    def test_blocks(self):
+        records = [dict(record, id=record["id"] + str(i)[:i % 2])
+                   for i in range(7) for record in self.records]
+        with patch.object(binary_format, "block_size", 4):
+            got = self.round_trip(records)
+        self.assertEqual(records, [o for key, o in got])
+
+    def test_empty(self):
+        self.assertEqual([], self.round_trip([]))
+
+    def test_not_binary_file(self):
+        with self.assertRaises(ValueError):
+            list(binary_format.iter_records(io.BytesIO(b"{}")))
+
+    def test_truncated_file(self):
+        buf = io.BytesIO()
+        binary_format.dump(self.records, buf, storage.attributes())
+        data = buf.getvalue()[:-3]
+        with self.assertRaises(ValueError):
+            list(binary_format.iter_records(io.BytesIO(data)))
+
+
+if __name__ == "__main__":
+    unittest.main()
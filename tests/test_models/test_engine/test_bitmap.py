@@ -0,0 +1,49 @@
+#!/usr/bin/python3
+"""Defines unittests for models/engine/bitmap.py.
+
+Unittest classes:
+    TestBitmap
+"""
+import random
+import unittest
+from models.engine.bitmap import ARRAY_MAX, Bitmap
+
+
+class TestBitmap(unittest.TestCase):
+    """Unittests for testing the compressed bitmap."""
+
+    def test_add_discard(self):
+        bitmap = Bitmap([5, 70000, 5])
+        self.assertEqual(2, len(bitmap))
+        self.assertIn(70000, bitmap)
+        self.assertNotIn(6, bitmap)
+        bitmap.discard(5)
+        bitmap.discard(6)
+        self.assertEqual([70000], list(bitmap))
+        bitmap.discard(70000)
+        self.assertEqual({}, bitmap.chunks)
+
+    def test_dense_chunks(self):
+        values = list(range(0, 3 * ARRAY_MAX, 2))
+        bitmap = Bitmap(values)
+        self.assertIs(int, type(bitmap.chunks[0]))
+        self.assertEqual(values, list(bitmap))
+        for value in values[ARRAY_MAX:]:
+            bitmap.discard(value)
+        self.assertIsNot(int, type(bitmap.chunks[0]))
+        self.assertEqual(values[:ARRAY_MAX], list(bitmap))
+
+    def test_intersection(self):
+        rand = random.Random(3)
+        for size_a, size_b in ((100, 100), (20000, 50), (30000, 40000)):
+            a = set(rand.sample(range(200000), size_a))
+            b = set(rand.sample(range(200000), size_b))
+            self.assertEqual(sorted(a & b), list(Bitmap(a) & Bitmap(b)))
+            self.assertEqual(sorted(a & b), list(Bitmap(b) & Bitmap(a)))
+
+    def test_empty_intersection(self):
+        self.assertEqual(0, len(Bitmap([1]) & Bitmap([70000])))
+
+
+if __name__ == "__main__":
+    unittest.main()
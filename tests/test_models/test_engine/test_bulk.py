@@ -0,0 +1,66 @@
+#!/usr/bin/python3
+"""Defines unittests for models/engine/bulk.py and storage.bulk_new.
+
+Unittest classes:
+    TestBulk
+"""
+import re
+import models
+import unittest
+from models.engine.bulk import build, new_ids
+from models.engine.file_storage import FileStorage
+from models.place import Place
+from models.state import State
+from models.user import User
+from test_models.test_engine import StorageTestCase
+
+
+class TestBulk(StorageTestCase):
+    """Unittests for testing new_ids, build and bulk_new."""
+
+    def test_new_ids(self):
+        ids = new_ids(500)
+        self.assertEqual(500, len(set(ids)))
+        pattern = re.compile(r"^[0-9a-f]{8}-[0-9a-f]{4}-4[0-9a-f]{3}-"
+                             r"[89ab][0-9a-f]{3}-[0-9a-f]{12}$")
+        for obj_id in ids:
+            self.assertRegex(obj_id, pattern)
+        self.assertEqual([], new_ids(0))
+
+    def test_build(self):
+        batches = list(build(Place, 25, {"name": "Loft", "id": "x",
+                                         "amenity_ids": ["a"]}, batch=10))
+        self.assertEqual([10, 10, 5], [len(objs) for objs in batches])
+        places = [place for objs in batches for place in objs]
+        self.assertEqual(25, len({place.id for place in places}))
+        first = places[0]
+        self.assertIs(Place, type(first))
+        self.assertEqual("Loft", first.name)
+        self.assertEqual(first.created_at, first.updated_at)
+        first.amenity_ids.append("b")
+        self.assertEqual(["a"], places[1].amenity_ids)
+        self.assertEqual(0, models.storage.count())
+
+    def test_bulk_new(self):
+        users = next(build(User, 3, {"first_name": "Ada"}))
+        self.assertEqual(3, models.storage.bulk_new(users))
+        self.assertEqual(3, models.storage.count("User"))
+        self.assertEqual(3, models.storage.dirty_count())
+        self.assertIs(users[0], models.storage.get("User", users[0].id))
+        models.storage.save()
+        FileStorage._FileStorage__objects = {}
+        models.storage.reload()
+        self.assertEqual("Ada",
+                         models.storage.get("User", users[2].id).first_name)
+
+    def test_bulk_new_rollback(self):
+        state = State()
+        models.storage.begin()
+        models.storage.bulk_new(next(build(State, 4)))
+        self.assertEqual(5, models.storage.count())
+        models.storage.rollback()
+        self.assertEqual([state], list(models.storage.all("State").values()))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+#!/usr/bin/python3
+"""Defines unittests for models/engine/coercion.py.
+
+Unittest classes:
+    TestCoercion
+"""
+import unittest
+from datetime import datetime
+from models.engine.coercion import compile_coercions, parse_literal
+from models.engine.file_storage import FileStorage
+
+
+class TestCoercion(unittest.TestCase):
+    """Unittests for testing the conversion of console values."""
+
+    def setUp(self):
+        self.coercions = compile_coercions(FileStorage().attributes())
+
+    def coerce(self, cls_name, name, value):
+        return self.coercions[cls_name][name](value)
+
+    def test_table(self):
+        self.assertEqual(set(FileStorage().attributes()),
+                         set(self.coercions))
+        self.assertIn("created_at", self.coercions["Place"])
+        self.assertNotIn("nickname", self.coercions["User"])
+
+    def test_types(self):
+        self.assertEqual(3, self.coerce("Place", "number_rooms", "3"))
+        self.assertEqual(3, self.coerce("Place", "number_rooms", 3.7))
+        self.assertEqual(1.5, self.coerce("Place", "latitude", "1.5"))
+        self.assertEqual(2.0, self.coerce("Place", "latitude", 2))
+        self.assertEqual("5", self.coerce("User", "first_name", 5))
+        self.assertEqual(["a"], self.coerce("Place", "amenity_ids",
+                                            '["a"]'))
+        self.assertEqual(datetime(2023, 8, 1, 12, 0),
+                         self.coerce("User", "updated_at",
+                                     "2023-08-01T12:00:00"))
+
+    def test_errors(self):
+        for cls_name, name, value, message in (
+                ("Place", "number_rooms", "3.5", "value is not an int"),
+                ("Place", "number_rooms", None, "value is not an int"),
+                ("Place", "latitude", "north", "value is not a float"),
+                ("Place", "amenity_ids", "wifi", "value is not a list"),
+                ("Place", "amenity_ids", "('a',)", "value is not a list"),
+                ("User", "created_at", "today", "value is not a datetime")):
+            with self.assertRaises(ValueError) as context:
+                self.coerce(cls_name, name, value)
+            self.assertEqual(message, str(context.exception))
+
+    def test_parse_literal(self):
+        self.assertEqual({"a": [1, 2.5, None]},
+                         parse_literal(' {"a": [1, 2.5, None]} '))
+        for text in ("__import__('os')", "print(1)", "a", "{", "",
+                     "{[1]: 2}", "{{1}}"):
+            with self.assertRaises(ValueError):
+                parse_literal(text)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+#!/usr/bin/python3
+"""Defines unittests for models/engine/columnar.py.
+
+Unittest classes:
+    TestColumnStore
+"""
+import models
+import unittest
+from models.engine import columnar
+from models.engine.file_storage import FileStorage
+from models.place import Place
+from test_models.test_engine import StorageTestCase
+
+
+@unittest.skipUnless(columnar.numpy, "numpy is not installed")
+class TestColumnStore(StorageTestCase):
+    """Unittests for testing the columnar store of Place."""
+
+    def setUp(self):
+        super().setUp()
+        self.places = []
+        for i in range(10):
+            place = Place()
+            place.price_by_night = i * 10
+            place.number_rooms = i % 4
+            self.places.append(place)
+        self.columns = columnar.ColumnStore(models.storage)
+        models.storage.add_index(self.columns)
+
+    def tearDown(self):
+        models.storage.remove_index(self.columns)
+        super().tearDown()
+
+    def expected(self, low, high, rooms):
+        return sorted(p.id for p in self.places
+                      if low <= p.price_by_night <= high and
+                      p.number_rooms >= rooms)
+
+    def test_range_query(self):
+        self.assertEqual(self.expected(20, 70, 2), sorted(self.columns.ids(
+            price_by_night=(20, 70), number_rooms=(2, None))))
+        self.assertEqual(10, self.columns.count())
+
+    def test_exact_value(self):
+        self.assertEqual(3, self.columns.count(number_rooms=0))
+
+    def test_objects(self):
+        objs = self.columns.objects(price_by_night=(None, 10))
+        self.assertEqual({f"Place.{p.id}": p for p in self.places[:2]}, objs)
+
+    def test_follows_changes(self):
+        self.columns.refresh()
+        self.places[0].price_by_night = 500
+        self.places[0].number_rooms = 3
+        models.storage.delete(self.places[9])
+        del self.places[9]
+        for i in range(20):
+            place = Place()
+            place.price_by_night = 65
+            place.number_rooms = 2
+            self.places.append(place)
+        self.assertEqual(self.expected(20, 70, 2), sorted(self.columns.ids(
+            price_by_night=(20, 70), number_rooms=(2, None))))
+        self.assertEqual([self.places[0].id],
+                         self.columns.ids(price_by_night=(400, None)))
+        self.assertEqual(29, self.columns.count())
+
+    def test_rebuilt_after_reload(self):
+        models.storage.save()
+        FileStorage._FileStorage__objects = {}
+        models.storage.reload()
+        self.assertEqual(self.expected(0, 90, 1), sorted(
+            self.columns.ids(number_rooms=(1, None))))
+
+    def test_missing_and_invalid_values(self):
+        self.places[1].latitude = "north"
+        self.assertEqual(9, self.columns.count(latitude=0.0))
+        self.assertNotIn(self.places[1].id,
+                         self.columns.ids(latitude=(None, 100)))
+
+    def test_unknown_column(self):
+        with self.assertRaises(ValueError):
+            self.columns.ids(color=1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,239 @@
+#!/usr/bin/python3
+"""Defines unittests for models/engine/db_storage.py.
+
+Unittest classes:
+    TestDBStorage_instantiation
+    TestDBStorage_methods
+"""
+import os
+import sqlite3
+import tempfile
+import unittest
+from unittest.mock import patch
+import models
+from models.engine import columnar
+from models.engine.db_storage import DBStorage
+from models.engine.file_storage import FileStorage
+from models.city import City
+from models.place import Place
+from models.state import State
+from models.user import User
+
+
+class TestDBStorage_instantiation(unittest.TestCase):
+    """Unittests for testing instantiation of the DBStorage class."""
+
+    def test_DBStorage_instantiation_no_args(self):
+        self.assertEqual(type(DBStorage()), DBStorage)
+
+    def test_DBStorage_instantiation_with_arg(self):
+        with self.assertRaises(TypeError):
+            DBStorage(None)
+
+    def test_classes_and_attributes(self):
+        self.assertEqual(FileStorage().classes(), DBStorage().classes())
+        self.assertEqual(FileStorage().attributes(),
+                         DBStorage().attributes())
+
+    def test_configure(self):
+        with self.assertRaises(TypeError):
+            DBStorage().configure(pth="x")
+        with self.assertRaises(ValueError):
+            DBStorage().configure(journal_mode="memory")
+
+
+class TestDBStorage_methods(unittest.TestCase):
+    """Unittests for testing methods of the DBStorage class."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "hbnb.db")
+        self.storage = DBStorage()
+        self.storage.configure(path=self.path)
+        self.storage.reload()
+        self.patcher = patch.object(models, "storage", self.storage)
+        self.patcher.start()
+
+    def tearDown(self):
+        self.patcher.stop()
+        self.storage.close()
+        self.tmpdir.cleanup()
+
+    def reopen(self):
+        self.storage.close()
+        self.storage = DBStorage()
+        self.storage.configure(path=self.path)
+        self.storage.reload()
+        return self.storage
+
+    def test_new_and_save(self):
+        us = User()
+        us.email = "b@hbnb.io"
+        us.save()
+        got = self.reopen().get(User, us.id)
+        self.assertIsNot(us, got)
+        self.assertEqual(us.to_dict(), got.to_dict())
+
+    def test_unsaved_changes_are_not_committed(self):
+        us = User()
+        self.assertIsNone(self.reopen().get(User, us.id))
+
+    def test_transaction(self):
+        us = User()
+        us.email = "a@hbnb.io"
+        self.storage.begin()
+        us.email = "b@hbnb.io"
+        st = State()
+        self.storage.save()
+        self.assertEqual(2, self.storage.count())
+        self.storage.rollback()
+        self.assertEqual("a@hbnb.io", us.email)
+        self.assertIsNone(self.storage.get(State, st.id))
+        self.assertEqual(1, self.storage.count())
+        with self.storage.transaction():
+            us.email = "c@hbnb.io"
+        self.assertEqual("c@hbnb.io", self.reopen().get(User, us.id).email)
+
+    def test_bulk_new(self):
+        objs = [User.from_dict({"email": f"{i}@hbnb.io"}) for i in range(3)]
+        self.assertEqual(3, self.storage.bulk_new(objs))
+        self.storage.save()
+        self.assertEqual(3, self.reopen().count(User))
+
+    def test_stats(self):
+        self.storage.configure(metrics=True)
+        try:
+            User()
+            self.storage.save()
+            operations = self.storage.stats()["operations"]
+        finally:
+            self.storage.configure(metrics=False)
+            self.storage.reset_stats()
+        self.assertEqual(1, operations["new"]["count"])
+        self.assertNotIn("bulk_new", operations)
+        self.assertEqual(1, operations["save"]["count"])
+
+    def test_scan(self):
+        users = sorted((User() for i in range(3)), key=lambda us: us.id)
+        st = State()
+        self.assertEqual([us.id for us in users],
+                         [us.id for us in self.storage.scan(User)])
+        after = "User." + users[0].id
+        self.assertEqual([us.id for us in users[1:]],
+                         [us.id for us in self.storage.scan(User, after)])
+        self.assertIn(st.id, [obj.id for obj in self.storage.scan()])
+        with self.assertRaises(KeyError):
+            self.storage.scan(State, after)
+
+    def test_queries_see_unsaved_objects(self):
+        us = User()
+        State()
+        self.assertEqual(1, self.storage.count(User))
+        self.assertEqual(2, self.storage.count())
+        self.assertEqual({"User." + us.id: us}, self.storage.all(User))
+        self.assertIs(us, self.storage.get("User", us.id))
+
+    def test_setattr_marks_dirty(self):
+        us = User()
+        self.storage.save()
+        self.assertEqual(0, self.storage.dirty_count())
+        us.first_name = "Betty"
+        self.assertEqual(1, self.storage.dirty_count())
+        self.storage.save()
+        self.assertEqual("Betty",
+                         self.reopen().get(User, us.id).first_name)
+
+    def test_delete(self):
+        us = User()
+        self.storage.save()
+        self.storage.delete(us)
+        self.assertIsNone(self.storage.get(User, us.id))
+        self.storage.save()
+        self.assertEqual(0, self.reopen().count(User))
+
+    def test_typed_columns_and_extras(self):
+        pl = Place()
+        pl.number_rooms = 3
+        pl.latitude = 6.5
+        pl.amenity_ids = ["wifi", "tv"]
+        pl.price_by_night = "100"
+        pl.my_number = 98
+        pl.save()
+        got = self.reopen().get(Place, pl.id)
+        self.assertEqual(pl.to_dict(), got.to_dict())
+        connection = sqlite3.connect(self.path)
+        row = connection.execute("SELECT number_rooms, latitude, "
+                                 "price_by_night FROM Place").fetchone()
+        connection.close()
+        self.assertEqual((3, 6.5, None), row)
+
+    def test_identity_map(self):
+        us = User()
+        us.save()
+        storage = self.reopen()
+        self.assertIs(storage.get(User, us.id), storage.all(User)[
+            "User." + us.id])
+
+    def test_indexes(self):
+        connection = sqlite3.connect(self.path)
+        names = {row[0] for row in connection.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'index'")}
+        connection.close()
+        for name in ("City_state_id", "Place_city_id", "Place_user_id",
+                     "Review_place_id", "Review_user_id", "User_email"):
+            self.assertIn(name, names)
+
+    def test_journal_mode(self):
+        connection = sqlite3.connect(self.path)
+        mode = connection.execute("PRAGMA journal_mode").fetchone()[0]
+        connection.close()
+        self.assertEqual("wal", mode)
+        self.storage.close()
+        storage = DBStorage()
+        storage.configure(path=self.path, journal_mode="delete")
+        storage.reload()
+        storage.close()
+        connection = sqlite3.connect(self.path)
+        mode = connection.execute("PRAGMA journal_mode").fetchone()[0]
+        connection.close()
+        self.assertEqual("delete", mode)
+
+    def test_relations_by_foreign_key(self):
+        st = State()
+        ct = City()
+        ct.state_id = st.id
+        self.storage.save()
+        cities = self.reopen().all(City)
+        self.assertEqual(st.id, cities["City." + ct.id].state_id)
+
+    def test_related(self):
+        st = State()
+        cities = [City(), City()]
+        for ct in cities:
+            ct.state_id = st.id
+        self.storage.save()
+        self.assertEqual(cities, st.cities)
+        cities[0].state_id = "other"
+        self.assertEqual([cities[1]], st.cities)
+        self.assertEqual([], self.storage.related(City, "color", st.id))
+
+    @unittest.skipUnless(columnar.numpy, "numpy is not installed")
+    def test_index(self):
+        cheap = Place()
+        cheap.price_by_night = 10
+        dear = Place()
+        dear.price_by_night = 500
+        self.storage.save()
+        columns = columnar.ColumnStore(self.storage)
+        self.storage.add_index(columns)
+        self.assertEqual([dear.id], columns.ids(price_by_night=(100, None)))
+        cheap.price_by_night = 200
+        self.storage.delete(dear)
+        self.assertEqual([cheap.id], columns.ids(price_by_night=(100, None)))
+        self.assertEqual([columns], self.storage.indexes())
+        self.storage.remove_index(columns)
+        self.assertEqual([], self.storage.indexes())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -4,14 +4,31 @@
 Unittest classes:
     TestFileStorage_instantiation
     TestFileStorage_methods
+    TestFileStorage_journal
+    TestFileStorage_dirty
+    TestFileStorage_class_index
+    TestFileStorage_lazy
+    TestFileStorage_binary
+    TestFileStorage_shard
+    TestFileStorage_write_behind
+    TestFileStorage_durability
 """
 import os
 import json
 import models
+import tempfile
+import time
 import unittest
 from datetime import datetime
+from io import StringIO
+from types import MappingProxyType
+from unittest.mock import patch
 from models.base_model import BaseModel
+from models.user import User
+from models.state import State
+from models.place import Place
 from models.engine.file_storage import FileStorage
+from test_models.test_engine import StorageTestCase
 
 
 class TestFileStorage_instantiation(unittest.TestCase):
@@ -57,11 +74,14 @@ class TestFileStorage_methods(unittest.TestCase):
         FileStorage._FileStorage__objects = {}
 
     def test_all(self):
-        self.assertEqual(dict, type(models.storage.all()))
+        self.assertEqual(MappingProxyType, type(models.storage.all()))
 
-    def test_all_with_arg(self):
+    def test_all_with_none(self):
+        self.assertIs(models.storage.all(), models.storage.all(None))
+
+    def test_all_with_two_args(self):
         with self.assertRaises(TypeError):
-            models.storage.all(None)
+            models.storage.all(None, None)
 
     def test_new(self):
         bm = BaseModel()
@@ -82,6 +102,21 @@ class TestFileStorage_methods(unittest.TestCase):
             save_text = f.read()
             self.assertIn("BaseModel." + bm.id, save_text)
 
+    def test_save_matches_to_dict(self):
+        FileStorage._FileStorage__objects = {}
+        place = Place()
+        place.name = "Chez B\u00e9"
+        place.number_rooms = "3"
+        place.amenity_ids = ["a"]
+        user = User()
+        user.email = "a@b.c"
+        FileStorage._FileStorage__journal_size = None
+        models.storage.save()
+        with open("file.json", "r") as f:
+            saved = f.read()
+        self.assertEqual(json.dumps({key: obj.to_dict() for key, obj in
+                                     models.storage.all().items()}), saved)
+
     def test_save_with_arg(self):
         with self.assertRaises(TypeError):
             models.storage.save(None)
@@ -99,5 +134,660 @@ class TestFileStorage_methods(unittest.TestCase):
             models.storage.reload(None)
 
 
+class TestFileStorage_journal(StorageTestCase):
+    """Unittests for testing the journal mode of the FileStorage class."""
+
+    def setUp(self):
+        super().setUp()
+        models.storage.configure(journal=True)
+
+    def journal_lines(self):
+        with open(self.path + ".journal") as f:
+            return [json.loads(line) for line in f]
+
+    def test_configure_unknown_option(self):
+        with self.assertRaises(TypeError):
+            models.storage.configure(journl=True)
+
+    def test_first_save_writes_snapshot(self):
+        bm = BaseModel()
+        models.storage.save()
+        with open(self.path) as f:
+            self.assertIn("BaseModel." + bm.id, json.load(f))
+        self.assertFalse(os.path.exists(self.path + ".journal"))
+
+    def test_save_appends_changed_objects_only(self):
+        bm1 = BaseModel()
+        BaseModel()
+        models.storage.save()
+        bm1.save()
+        lines = self.journal_lines()
+        self.assertEqual(1, len(lines))
+        self.assertEqual("put", lines[0]["op"])
+        self.assertEqual("BaseModel." + bm1.id, lines[0]["key"])
+
+    def test_delete_appends_delete_record(self):
+        bm = BaseModel()
+        models.storage.save()
+        models.storage.delete(bm)
+        models.storage.save()
+        self.assertEqual([{"op": "delete", "key": "BaseModel." + bm.id}],
+                         self.journal_lines())
+        self.assertNotIn("BaseModel." + bm.id, models.storage.all())
+
+    def test_reload_replays_journal(self):
+        bm1 = BaseModel()
+        bm2 = BaseModel()
+        models.storage.save()
+        bm1.name = "journaled"
+        bm1.save()
+        models.storage.delete(bm2)
+        models.storage.save()
+        FileStorage._FileStorage__objects = {}
+        models.storage.reload()
+        objs = models.storage.all()
+        self.assertEqual("journaled", objs["BaseModel." + bm1.id].name)
+        self.assertNotIn("BaseModel." + bm2.id, objs)
+
+    def test_reload_ignores_torn_record(self):
+        bm = BaseModel()
+        models.storage.save()
+        bm.save()
+        with open(self.path + ".journal", "a") as f:
+            f.write('{"op": "delete", "key": "BaseMo')
+        FileStorage._FileStorage__objects = {}
+        models.storage.reload()
+        self.assertIn("BaseModel." + bm.id, models.storage.all())
+
+    def test_save_after_torn_record(self):
+        bm = BaseModel()
+        models.storage.save()
+        bm.save()
+        with open(self.path + ".journal", "a") as f:
+            f.write('{"op": "delete", "key": "BaseMo')
+        FileStorage._FileStorage__objects = {}
+        models.storage.reload()
+        models.storage.get("BaseModel", bm.id).name = "Betty"
+        models.storage.save()
+        other = BaseModel()
+        models.storage.save()
+        FileStorage._FileStorage__objects = {}
+        models.storage.reload()
+        self.assertEqual("Betty",
+                         models.storage.get("BaseModel", bm.id).name)
+        self.assertIsNotNone(models.storage.get("BaseModel", other.id))
+
+    def test_journal_limit_folds_into_snapshot(self):
+        models.storage.configure(journal_limit=2)
+        bm = BaseModel()
+        models.storage.save()
+        bm.save()
+        bm.save()
+        self.assertEqual(2, len(self.journal_lines()))
+        bm.save()
+        self.assertFalse(os.path.exists(self.path + ".journal"))
+        with open(self.path) as f:
+            self.assertIn("BaseModel." + bm.id, json.load(f))
+
+    def test_crash_before_journal_removal(self):
+        models.storage.configure(journal_limit=2)
+        bm = BaseModel()
+        models.storage.save()
+        for name in ("v0", "v1"):
+            bm.name = name
+            models.storage.save()
+        self.assertEqual(2, len(self.journal_lines()))
+        bm.name = "v2"
+        remove = os.remove
+
+        def crash(path):
+            if path.endswith(".journal"):
+                raise RuntimeError("crash")
+            remove(path)
+        with patch("models.engine.file_storage.os.remove", crash):
+            with self.assertRaises(RuntimeError):
+                models.storage.save()
+        self.assertTrue(os.path.exists(self.path + ".journal"))
+        FileStorage._FileStorage__objects = {}
+        models.storage.reload()
+        self.assertEqual("v2", models.storage.get("BaseModel", bm.id).name)
+
+    def test_snapshot_mode_drops_journal(self):
+        bm = BaseModel()
+        models.storage.save()
+        bm.save()
+        models.storage.configure(journal=False)
+        models.storage.save()
+        self.assertFalse(os.path.exists(self.path + ".journal"))
+
+
+class TestFileStorage_dirty(StorageTestCase):
+    """Unittests for testing dirty tracking in the FileStorage class."""
+
+    def test_new_marks_dirty(self):
+        BaseModel()
+        BaseModel()
+        self.assertEqual(2, models.storage.dirty_count())
+
+    def test_save_clears_dirty(self):
+        BaseModel()
+        models.storage.save()
+        self.assertEqual(0, models.storage.dirty_count())
+
+    def test_setattr_marks_dirty(self):
+        bm = BaseModel()
+        models.storage.save()
+        bm.name = "dirty"
+        self.assertEqual(1, models.storage.dirty_count())
+
+    def test_setattr_on_untracked_object_is_ignored(self):
+        bm = BaseModel(id="untracked", created_at="2023-08-01T12:34:56.0",
+                       updated_at="2023-08-01T12:34:56.0")
+        bm.name = "not stored"
+        self.assertEqual(0, models.storage.dirty_count())
+
+    def test_setattr_on_untracked_object_skips_lock(self):
+        bm = BaseModel(id="untracked", created_at="2023-08-01T12:34:56.0",
+                       updated_at="2023-08-01T12:34:56.0")
+        with patch("models.engine.file_storage._lock") as lock:
+            bm.name = "not stored"
+        lock.__enter__.assert_not_called()
+
+    def test_delete_marks_dirty(self):
+        bm = BaseModel()
+        models.storage.save()
+        models.storage.delete(bm)
+        self.assertEqual(1, models.storage.dirty_count())
+
+    def test_clean_save_skips_write(self):
+        BaseModel()
+        models.storage.save()
+        mtime = os.stat(self.path).st_mtime_ns
+        models.storage.save()
+        self.assertEqual(mtime, os.stat(self.path).st_mtime_ns)
+        self.assertEqual(0, models.storage.flush_stats()["written"])
+
+    def test_flush_stats_journal(self):
+        models.storage.configure(journal=True)
+        bm = BaseModel()
+        for i in range(9):
+            BaseModel()
+        models.storage.save()
+        self.assertEqual(10, models.storage.flush_stats()["written"])
+        bm.save()
+        stats = models.storage.flush_stats()
+        self.assertEqual(1, stats["dirty"])
+        self.assertEqual(1, stats["written"])
+        self.assertLess(0, stats["bytes"])
+
+
+class TestFileStorage_class_index(StorageTestCase):
+    """Unittests for testing the per-class index of the FileStorage class."""
+
+    def test_all_with_class(self):
+        us = User()
+        st = State()
+        self.assertEqual({"User." + us.id: us}, models.storage.all(User))
+        self.assertEqual({"State." + st.id: st}, models.storage.all("State"))
+
+    def test_all_with_class_returns_copy(self):
+        User()
+        models.storage.all(User).clear()
+        self.assertEqual(1, models.storage.count(User))
+
+    def test_all_unknown_class(self):
+        self.assertEqual({}, models.storage.all("MyModel"))
+
+    def test_count(self):
+        User()
+        User()
+        State()
+        self.assertEqual(3, models.storage.count())
+        self.assertEqual(2, models.storage.count(User))
+        self.assertEqual(1, models.storage.count("State"))
+        self.assertEqual(0, models.storage.count("MyModel"))
+
+    def test_get(self):
+        us = User()
+        self.assertIs(us, models.storage.get(User, us.id))
+        self.assertIs(us, models.storage.get("User", us.id))
+        self.assertIsNone(models.storage.get("State", us.id))
+
+    def test_delete_updates_index(self):
+        us = User()
+        models.storage.delete(us)
+        self.assertEqual(0, models.storage.count(User))
+        self.assertIsNone(models.storage.get(User, us.id))
+
+    def test_all_is_read_only(self):
+        us = User()
+        with self.assertRaises(TypeError):
+            del models.storage.all()["User." + us.id]
+        with self.assertRaises(TypeError):
+            models.storage.all()["State.direct"] = State()
+        self.assertEqual({"User." + us.id: us}, models.storage.all("User"))
+
+    def test_scan(self):
+        users = [User() for i in range(3)]
+        st = State()
+        self.assertEqual(users, list(models.storage.scan(User)))
+        self.assertEqual(users + [st], list(models.storage.scan()))
+        after = "User." + users[0].id
+        self.assertEqual(users[1:] + [st],
+                         list(models.storage.scan(after=after)))
+        self.assertEqual(users[1:], list(models.storage.scan("User", after)))
+        self.assertEqual([], list(models.storage.scan("MyModel")))
+        with self.assertRaises(KeyError):
+            models.storage.scan(State, after)
+        with self.assertRaises(KeyError):
+            models.storage.scan(after="User.missing")
+
+    def test_replaced_objects_are_saved(self):
+        User()
+        models.storage.save()
+        st = State()
+        FileStorage._FileStorage__objects = {"State." + st.id: st}
+        self.assertEqual(0, models.storage.count(User))
+        models.storage.save()
+        with open(self.path) as f:
+            self.assertEqual({"State." + st.id}, set(json.load(f)))
+
+    def test_reload_updates_index(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        file_path = FileStorage._FileStorage__file_path
+        FileStorage._FileStorage__file_path = os.path.join(tmpdir.name,
+                                                           "file.json")
+        try:
+            us = User()
+            models.storage.save()
+            FileStorage._FileStorage__objects = {}
+            models.storage.reload()
+            self.assertEqual(["User." + us.id],
+                             list(models.storage.all(User).keys()))
+        finally:
+            FileStorage._FileStorage__file_path = file_path
+            tmpdir.cleanup()
+
+
+class TestFileStorage_lazy(StorageTestCase):
+    """Unittests for testing the lazy reload of the FileStorage class."""
+
+    def setUp(self):
+        super().setUp()
+        self.us = User()
+        self.us.first_name = "Betty"
+        self.st = State()
+        models.storage.save()
+        FileStorage._FileStorage__objects = {}
+        models.storage.configure(lazy=True)
+        models.storage.reload()
+
+    def test_reload_builds_no_instance(self):
+        self.assertEqual({}, FileStorage._FileStorage__objects)
+
+    def test_count_does_not_hydrate(self):
+        self.assertEqual(2, models.storage.count())
+        self.assertEqual(1, models.storage.count(User))
+        self.assertEqual({}, FileStorage._FileStorage__objects)
+
+    def test_get_hydrates_one_object(self):
+        us = models.storage.get(User, self.us.id)
+        self.assertEqual("Betty", us.first_name)
+        self.assertEqual(self.us.created_at, us.created_at)
+        self.assertEqual(["User." + self.us.id],
+                         list(FileStorage._FileStorage__objects))
+        self.assertIs(us, models.storage.get(User, self.us.id))
+
+    def test_all_with_class_hydrates_class(self):
+        objs = models.storage.all(State)
+        self.assertEqual(["State." + self.st.id], list(objs))
+        self.assertEqual(State, type(objs["State." + self.st.id]))
+        self.assertNotIn("User." + self.us.id,
+                         FileStorage._FileStorage__objects)
+
+    def test_all_hydrates_everything(self):
+        objs = models.storage.all()
+        self.assertIn("User." + self.us.id, objs)
+        self.assertIn("State." + self.st.id, objs)
+
+    def test_save_keeps_unbuilt_records(self):
+        models.storage.get(State, self.st.id).name = "Lagos"
+        models.storage.save()
+        FileStorage._FileStorage__objects = {}
+        models.storage.reload()
+        self.assertEqual("Betty",
+                         models.storage.get(User, self.us.id).first_name)
+        self.assertEqual("Lagos", models.storage.get(State, self.st.id).name)
+
+    def test_scan_hydrates_as_it_goes(self):
+        objs = models.storage.scan(State)
+        self.assertEqual({}, FileStorage._FileStorage__objects)
+        st = next(objs)
+        self.assertEqual(self.st.id, st.id)
+        self.assertEqual(["State." + self.st.id],
+                         list(FileStorage._FileStorage__objects))
+
+    def test_new_replaces_unbuilt_record(self):
+        us = User(**self.us.to_dict())
+        models.storage.new(us)
+        self.assertEqual(2, models.storage.count())
+        self.assertIs(us, models.storage.get(User, self.us.id))
+
+    def test_reload_decodes_no_record(self):
+        raw = FileStorage._FileStorage__raw
+        self.assertEqual(2, len(raw))
+        for o in raw.values():
+            self.assertNotIsInstance(o, dict)
+
+    def test_unbuilt_records_survive_save(self):
+        models.storage.get(State, self.st.id).name = "Lagos"
+        models.storage.save()
+        os.remove(self.path)
+        self.assertEqual("Betty",
+                         models.storage.get(User, self.us.id).first_name)
+
+    def test_indented_file(self):
+        with open(self.path) as f:
+            records = json.load(f)
+        with open(self.path, "w") as f:
+            json.dump(records, f, indent=4)
+        FileStorage._FileStorage__objects = {}
+        models.storage.reload()
+        models.storage.get(State, self.st.id).name = "Lagos"
+        models.storage.save()
+        FileStorage._FileStorage__objects = {}
+        models.storage.reload()
+        records["State." + self.st.id]["name"] = "Lagos"
+        self.assertEqual(records, {key: obj.to_dict() for key, obj
+                                   in models.storage.all().items()})
+
+
+class TestFileStorage_binary(StorageTestCase):
+    """Unittests for testing the binary format of the FileStorage class."""
+
+    def setUp(self):
+        super().setUp()
+        self.bin_path = os.path.join(self.tmpdir.name, "file.bin")
+        models.storage.configure(format="binary")
+
+    def test_unknown_format(self):
+        with self.assertRaises(ValueError):
+            models.storage.configure(format="xml")
+
+    def test_save_writes_bin_file(self):
+        BaseModel()
+        models.storage.save()
+        self.assertTrue(os.path.exists(self.bin_path))
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_save_reload(self):
+        pl = Place()
+        pl.name = "Loft"
+        pl.latitude = 6.5
+        pl.amenity_ids = ["wifi"]
+        models.storage.save()
+        FileStorage._FileStorage__objects = {}
+        models.storage.reload()
+        got = models.storage.get(Place, pl.id)
+        self.assertEqual(pl.to_dict(), got.to_dict())
+
+    def test_journal(self):
+        models.storage.configure(journal=True)
+        us = User()
+        models.storage.save()
+        us.first_name = "Betty"
+        us.save()
+        self.assertTrue(os.path.exists(self.bin_path + ".journal"))
+        FileStorage._FileStorage__objects = {}
+        models.storage.reload()
+        self.assertEqual("Betty", models.storage.get(User, us.id).first_name)
+
+    def test_export_import_json(self):
+        us = User()
+        us.email = "b@hbnb.io"
+        models.storage.save()
+        json_path = os.path.join(self.tmpdir.name, "export.json")
+        self.assertEqual(1, models.storage.export_json(json_path))
+        with open(json_path) as f:
+            self.assertEqual(us.to_dict(), json.load(f)["User." + us.id])
+        FileStorage._FileStorage__objects = {}
+        os.remove(self.bin_path)
+        self.assertEqual(1, models.storage.import_json(json_path))
+        models.storage.save()
+        FileStorage._FileStorage__objects = {}
+        models.storage.reload()
+        self.assertEqual("b@hbnb.io", models.storage.get(User, us.id).email)
+
+
+class TestFileStorage_shard(StorageTestCase):
+    """Unittests for testing the per-class shards of the FileStorage class."""
+
+    def setUp(self):
+        super().setUp()
+        models.storage.configure(shard=True)
+
+    def shard(self, name):
+        return os.path.join(self.tmpdir.name, f"file.{name}.json")
+
+    def test_save_writes_one_file_per_class(self):
+        us = User()
+        st = State()
+        models.storage.save()
+        self.assertFalse(os.path.exists(self.path))
+        with open(self.shard("User")) as f:
+            self.assertEqual(["User." + us.id], list(json.load(f)))
+        with open(self.shard("State")) as f:
+            self.assertEqual(["State." + st.id], list(json.load(f)))
+        with open(self.shard("Review")) as f:
+            self.assertEqual({}, json.load(f))
+
+    def test_save_rewrites_changed_shards_only(self):
+        us = User()
+        State()
+        models.storage.save()
+        mtime = os.stat(self.shard("State")).st_mtime_ns
+        us.first_name = "Betty"
+        us.save()
+        self.assertEqual(mtime, os.stat(self.shard("State")).st_mtime_ns)
+        self.assertEqual(1, models.storage.flush_stats()["written"])
+        with open(self.shard("User")) as f:
+            self.assertEqual("Betty", json.load(f)["User." + us.id][
+                "first_name"])
+
+    def test_delete_rewrites_shard(self):
+        us = User()
+        models.storage.save()
+        models.storage.delete(us)
+        models.storage.save()
+        with open(self.shard("User")) as f:
+            self.assertEqual({}, json.load(f))
+
+    def test_reload(self):
+        us = User()
+        st = State()
+        models.storage.save()
+        FileStorage._FileStorage__objects = {}
+        models.storage.reload()
+        self.assertEqual({"User." + us.id, "State." + st.id},
+                         set(models.storage.all()))
+
+    def test_reload_many_shards(self):
+        ids = {"User." + User().id for i in range(5)}
+        ids |= {"State." + State().id for i in range(5)}
+        models.storage.save()
+        FileStorage._FileStorage__objects = {}
+        models.storage.reload()
+        self.assertEqual(ids, set(models.storage.all()))
+
+    def test_lazy_reload(self):
+        us = User()
+        st = State()
+        models.storage.save()
+        FileStorage._FileStorage__objects = {}
+        models.storage.configure(lazy=True)
+        models.storage.reload()
+        self.assertEqual({}, FileStorage._FileStorage__objects)
+        self.assertEqual(us.id, models.storage.get(User, us.id).id)
+        self.assertEqual(st.id, models.storage.get(State, st.id).id)
+
+    def test_reload_with_journal(self):
+        models.storage.configure(journal=True)
+        us = User()
+        models.storage.save()
+        us.first_name = "Betty"
+        us.save()
+        FileStorage._FileStorage__objects = {}
+        models.storage.reload()
+        self.assertEqual("Betty", models.storage.get(User, us.id).first_name)
+
+    def test_migrates_unsharded_file(self):
+        models.storage.configure(shard=False)
+        us = User()
+        models.storage.save()
+        FileStorage._FileStorage__objects = {}
+        models.storage.configure(shard=True)
+        models.storage.reload()
+        self.assertIsNotNone(models.storage.get(User, us.id))
+        models.storage.save()
+        self.assertTrue(os.path.exists(self.shard("User")))
+        self.assertFalse(os.path.exists(self.path))
+
+
+class TestFileStorage_write_behind(StorageTestCase):
+    """Unittests for testing the write-behind mode of FileStorage."""
+
+    def setUp(self):
+        super().setUp()
+        models.storage.configure(write_behind=True, flush_interval=60)
+
+    def tearDown(self):
+        models.storage.configure(write_behind=False)
+        super().tearDown()
+
+    def saved_keys(self):
+        with open(self.path) as f:
+            return set(json.load(f))
+
+    def test_save_returns_before_writing(self):
+        BaseModel().save()
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_flush_writes_pending_saves(self):
+        bm = BaseModel()
+        bm.save()
+        models.storage.flush()
+        self.assertEqual({"BaseModel." + bm.id}, self.saved_keys())
+        self.assertEqual(0, models.storage.dirty_count())
+
+    def test_saves_are_coalesced(self):
+        bm = BaseModel()
+        for i in range(100):
+            bm.number = i
+            bm.save()
+        models.storage.flush()
+        self.assertEqual(1, models.storage.flush_stats()["dirty"])
+        with open(self.path) as f:
+            self.assertEqual(99, json.load(f)["BaseModel." + bm.id][
+                "number"])
+
+    def test_flush_without_save_is_noop(self):
+        BaseModel()
+        models.storage.flush()
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_interval(self):
+        models.storage.configure(write_behind=False)
+        models.storage.configure(write_behind=True, flush_interval=0.01)
+        BaseModel().save()
+        for i in range(200):
+            if os.path.exists(self.path):
+                break
+            time.sleep(0.01)
+        self.assertTrue(os.path.exists(self.path))
+
+    def test_threshold(self):
+        models.storage.configure(flush_threshold=5)
+        for i in range(5):
+            BaseModel()
+        models.storage.save()
+        for i in range(200):
+            if os.path.exists(self.path):
+                break
+            time.sleep(0.01)
+        self.assertEqual(5, len(self.saved_keys()))
+
+    def test_disabling_flushes(self):
+        bm = BaseModel()
+        bm.save()
+        models.storage.configure(write_behind=False)
+        self.assertEqual({"BaseModel." + bm.id}, self.saved_keys())
+
+    def test_failed_write_is_retried(self):
+        bm = BaseModel()
+        models.storage.configure(flush_threshold=1)
+        with patch("models.engine.file_storage.atomic_open",
+                   side_effect=OSError("disk full")):
+            bm.save()
+            models.storage.save()
+            for i in range(200):
+                if FileStorage._FileStorage__flusher.error is not None:
+                    break
+                time.sleep(0.01)
+        self.assertEqual(1, models.storage.dirty_count())
+        with self.assertRaises(OSError):
+            models.storage.configure(write_behind=False)
+        self.assertEqual({"BaseModel." + bm.id}, self.saved_keys())
+        self.assertEqual(0, models.storage.dirty_count())
+
+    def test_disabling_writes_dirty_objects(self):
+        bm = BaseModel()
+        bm.save()
+        FileStorage._FileStorage__save_pending = False
+        models.storage.configure(write_behind=False)
+        self.assertEqual({"BaseModel." + bm.id}, self.saved_keys())
+
+    def test_console_quit_flushes(self):
+        from console import HBNBCommand
+        bm = BaseModel()
+        bm.save()
+        with patch("sys.stdout", new=StringIO()):
+            self.assertTrue(HBNBCommand().onecmd("quit"))
+        self.assertEqual({"BaseModel." + bm.id}, self.saved_keys())
+
+
+class TestFileStorage_durability(StorageTestCase):
+    """Unittests for testing the durability levels of FileStorage."""
+
+    def test_unknown_durability(self):
+        with self.assertRaises(ValueError):
+            models.storage.configure(durability="sometimes")
+
+    def test_levels(self):
+        for durability in ("none", "flush", "always"):
+            models.storage.configure(durability=durability)
+            for journal in (False, True):
+                models.storage.configure(journal=journal)
+                bm = BaseModel()
+                bm.save()
+                bm.name = durability
+                bm.save()
+                FileStorage._FileStorage__objects = {}
+                models.storage.reload()
+                self.assertEqual(durability, models.storage.get(
+                    BaseModel, bm.id).name)
+
+    def test_save_replaces_file_atomically(self):
+        BaseModel().save()
+        with open(self.path) as f:
+            old = f.read()
+        bm = BaseModel()
+        bm.broken = object()
+        with self.assertRaises(TypeError):
+            models.storage.save()
+        with open(self.path) as f:
+            self.assertEqual(old, f.read())
+        self.assertEqual(["file.json"], os.listdir(self.tmpdir.name))
+
+
 if __name__ == "__main__":
     unittest.main()
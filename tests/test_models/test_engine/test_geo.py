@@ -0,0 +1,90 @@
+#!/usr/bin/python3
+"""Defines unittests for models/engine/geo.py.
+
+Unittest classes:
+    TestGeo_distance
+    TestGeoIndex
+"""
+import models
+import random
+import unittest
+from models.engine.geo import GeoIndex, distance_km
+from models.place import Place
+from test_models.test_engine import StorageTestCase
+
+
+class TestGeo_distance(unittest.TestCase):
+    """Unittests for testing the great-circle distance."""
+
+    def test_same_point(self):
+        self.assertEqual(0, distance_km(48.85, 2.35, 48.85, 2.35))
+
+    def test_paris_london(self):
+        self.assertAlmostEqual(343.5, distance_km(48.8566, 2.3522,
+                                                  51.5074, -0.1278), 0)
+
+    def test_antimeridian(self):
+        self.assertAlmostEqual(22.2, distance_km(0, 179.9, 0, -179.9), 0)
+
+
+class TestGeoIndex(StorageTestCase):
+    """Unittests for testing the grid index of Place."""
+
+    def setUp(self):
+        super().setUp()
+        rand = random.Random(1)
+        self.places = []
+        for i in range(300):
+            place = Place()
+            place.latitude = rand.uniform(-89.9, 89.9)
+            place.longitude = rand.uniform(-180, 180)
+            self.places.append(place)
+        for i in range(100):
+            place = Place()
+            place.latitude = 37.7 + rand.uniform(-0.5, 0.5)
+            place.longitude = -122.4 + rand.uniform(-0.5, 0.5)
+            self.places.append(place)
+        self.geo = models.storage.index(GeoIndex)
+
+    def tearDown(self):
+        models.storage.remove_index(self.geo)
+        super().tearDown()
+
+    def brute(self, lat, lon):
+        return sorted((distance_km(lat, lon, p.latitude, p.longitude), p.id)
+                      for p in self.places)
+
+    def test_index_is_attached_once(self):
+        self.assertIs(self.geo, models.storage.index(GeoIndex))
+
+    def test_nearby(self):
+        for lat, lon, km in ((37.7, -122.4, 20), (0, 0, 2000),
+                             (89, 10, 500), (10, 179.9, 1500)):
+            expected = [pid for dist, pid in self.brute(lat, lon)
+                        if dist <= km]
+            self.assertEqual(expected, [p.id for p in
+                                        self.geo.nearby(lat, lon, km)])
+
+    def test_nearest(self):
+        for lat, lon, n in ((37.7, -122.4, 5), (-60, 30, 3),
+                            (37.7, -122.4, 150), (0, 0, 400)):
+            expected = [pid for dist, pid in self.brute(lat, lon)[:n]]
+            self.assertEqual(expected, [p.id for p in
+                                        self.geo.nearest(lat, lon, n)])
+
+    def test_follows_changes(self):
+        place = self.places[0]
+        place.latitude = 37.7
+        place.longitude = -122.4
+        self.assertEqual(place, self.geo.nearest(37.7, -122.4, 1)[0])
+        models.storage.delete(place)
+        self.assertNotIn(place, self.geo.nearby(37.7, -122.4, 1))
+        place.latitude = "north"
+        other = self.places[1]
+        other.longitude = None
+        self.assertNotIn(other, self.geo.nearby(0, 0, 30000))
+        self.assertEqual(398, len(self.geo.nearby(0, 0, 30000)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,118 @@
+#!/usr/bin/python3
+"""Defines unittests for models/engine/json_stream.py.
+
+Unittest classes:
+    TestRecordReader
+    TestSpanReader
+"""
+import io
+import json
+import unittest
+from models.engine.json_stream import RecordReader, iter_records
+from models.engine.json_stream import iter_spans
+
+
+class TestRecordReader(unittest.TestCase):
+    """Unittests for testing the incremental reader of storage files."""
+
+    def setUp(self):
+        self.records = {
+            "User.1": {"id": "1", "__class__": "User",
+                       "first_name": "Bet}ty, \"B\"", "age": 3},
+            "Place.2": {"id": "2", "__class__": "Place",
+                        "amenity_ids": ["a", "b"], "latitude": 1.5},
+            "State.é": {"id": "é", "__class__": "State",
+                        "nested": {"a": [1, {"b": None}]}},
+        }
+        self.text = json.dumps(self.records)
+
+    def test_reads_all_records(self):
+        got = dict(iter_records(io.StringIO(self.text)))
+        self.assertEqual(self.records, got)
+
+    def test_small_chunks(self):
+        for chunk_size in (1, 2, 3, 7, 16):
+            got = dict(iter_records(io.StringIO(self.text), chunk_size))
+            self.assertEqual(self.records, got)
+
+    def test_numbers_split_across_chunks(self):
+        text = '{"a": 12, "b": 345}'
+        for chunk_size in range(1, len(text) + 1):
+            got = list(iter_records(io.StringIO(text), chunk_size))
+            self.assertEqual([("a", 12), ("b", 345)], got)
+
+    def test_indented_document(self):
+        text = json.dumps(self.records, indent=4)
+        self.assertEqual(self.records,
+                         dict(iter_records(io.StringIO(text), 5)))
+
+    def test_yields_in_file_order(self):
+        keys = [key for key, o in iter_records(io.StringIO(self.text), 4)]
+        self.assertEqual(list(self.records), keys)
+
+    def test_empty_object(self):
+        self.assertEqual([], list(iter_records(io.StringIO(" { } "))))
+
+    def test_empty_file(self):
+        with self.assertRaises(json.JSONDecodeError):
+            list(iter_records(io.StringIO("")))
+
+    def test_not_an_object(self):
+        with self.assertRaises(json.JSONDecodeError):
+            list(iter_records(io.StringIO("[1, 2]")))
+
+    def test_truncated_document(self):
+        with self.assertRaises(json.JSONDecodeError):
+            list(iter_records(io.StringIO(self.text[:-5]), 8))
+
+    def test_buffer_stays_small(self):
+        record = {"id": "x", "text": "y" * 50}
+        text = json.dumps({f"Review.{i}": record for i in range(1000)})
+        reader = RecordReader(io.StringIO(text), 64)
+        longest = 0
+        for key, o in reader:
+            longest = max(longest, len(reader.buf))
+        self.assertLess(longest, 64 + 2 * len(json.dumps(record)))
+
+
+class TestSpanReader(unittest.TestCase):
+    """Unittests for testing the record positions of storage files."""
+
+    def setUp(self):
+        self.records = {
+            "User.1": {"id": "1", "__class__": "User",
+                       "first_name": "Bet}ty, \"B\"", "age": 3},
+            "Place.2": {"id": "2", "__class__": "Place",
+                        "amenity_ids": ["a", "b]"], "latitude": 1.5},
+            "State.\u00e9": {"id": "\u00e9", "__class__": "State",
+                             "nested": {"a": [1, {"b": None}]}},
+        }
+
+    def spans(self, data, chunk_size=65536):
+        """Returns the records found at the spans of data."""
+        file = io.TextIOWrapper(io.BytesIO(data), encoding="latin-1",
+                                newline="")
+        return {key: json.loads(data[offset:offset + length])
+                for key, (offset, length) in iter_spans(file, chunk_size)}
+
+    def test_finds_all_records(self):
+        data = json.dumps(self.records).encode()
+        self.assertEqual(self.records, self.spans(data))
+
+    def test_small_chunks(self):
+        data = json.dumps(self.records).encode()
+        for chunk_size in (1, 2, 3, 7, 16):
+            self.assertEqual(self.records, self.spans(data, chunk_size))
+
+    def test_positions_are_bytes(self):
+        data = json.dumps(self.records, ensure_ascii=False).encode()
+        for chunk_size in (1, 5, 65536):
+            self.assertEqual(self.records, self.spans(data, chunk_size))
+
+    def test_indented_document(self):
+        text = json.dumps(self.records, indent=4).replace("\n", "\r\n")
+        self.assertEqual(self.records, self.spans(text.encode(), 5))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,117 @@
+#!/usr/bin/python3
+"""Defines unittests for models/engine/metrics.py.
+
+Unittest classes:
+    TestHistogram
+    TestMetrics
+"""
+import json
+import os
+import models
+import unittest
+from models.engine.file_storage import FileStorage
+from models.engine.metrics import Histogram, Metrics, measured, metrics
+from models.user import User
+from test_models.test_engine import StorageTestCase
+
+
+class TestHistogram(unittest.TestCase):
+    """Unittests for testing the Histogram class."""
+
+    def test_record(self):
+        histogram = Histogram()
+        for seconds in (0.000003, 0.000005, 0.000006, 0.0009):
+            histogram.record(seconds)
+        data = histogram.to_dict()
+        self.assertEqual(4, data["count"])
+        self.assertAlmostEqual(0.000914, data["total_seconds"])
+        self.assertEqual(0.000003, data["min_seconds"])
+        self.assertEqual(0.0009, data["max_seconds"])
+        self.assertEqual({"4": 1, "8": 2, "1024": 1}, data["histogram_us"])
+        self.assertEqual(0.000008, data["p50_seconds"])
+        self.assertEqual(0.0009, data["p99_seconds"])
+
+    def test_empty(self):
+        data = Histogram().to_dict()
+        self.assertEqual(0, data["count"])
+        self.assertEqual(0.0, data["p90_seconds"])
+        self.assertEqual({}, data["histogram_us"])
+
+
+class TestMetrics(StorageTestCase):
+    """Unittests for testing the recording of the storage metrics."""
+
+    def setUp(self):
+        super().setUp()
+        models.storage.reset_stats()
+
+    def tearDown(self):
+        models.storage.configure(metrics=False)
+        models.storage.reset_stats()
+        super().tearDown()
+
+    def test_measured(self):
+        recorder = Metrics()
+
+        @measured("double")
+        def double(x):
+            return 2 * x
+        self.assertEqual(4, double(2))
+        self.assertEqual({}, metrics.snapshot()["operations"])
+        metrics.enabled = True
+        try:
+            self.assertEqual(6, double(3))
+        finally:
+            metrics.enabled = False
+        self.assertEqual(1, metrics.snapshot()["operations"]["double"]
+                         ["count"])
+        self.assertEqual({"enabled": False, "operations": {},
+                          "bytes": {"written": 0, "read": 0}},
+                         recorder.snapshot())
+
+    def test_disabled(self):
+        User().save()
+        models.storage.reload()
+        stats = models.storage.stats()
+        self.assertFalse(stats["enabled"])
+        self.assertEqual({}, stats["operations"])
+        self.assertEqual({"written": 0, "read": 0}, stats["bytes"])
+
+    def test_storage(self):
+        models.storage.configure(metrics=True)
+        user = User()
+        user.to_dict()
+        models.storage.save()
+        size = os.path.getsize(FileStorage._FileStorage__file_path)
+        FileStorage._FileStorage__objects = {}
+        models.storage.reload()
+        stats = models.storage.stats()
+        self.assertTrue(stats["enabled"])
+        operations = stats["operations"]
+        for name in ("new", "to_dict", "save", "write", "serialize",
+                     "reload", "hydrate", "read_journal"):
+            self.assertIn(name, operations)
+        self.assertEqual(1, operations["new"]["count"])
+        self.assertNotIn("bulk_new", operations)
+        self.assertEqual(1, operations["save"]["count"])
+        self.assertEqual({"written": size, "read": size}, stats["bytes"])
+        json.dumps(stats)
+        models.storage.reset_stats()
+        self.assertEqual({}, models.storage.stats()["operations"])
+
+    def test_journal_bytes(self):
+        models.storage.configure(metrics=True, journal=True)
+        User()
+        models.storage.save()
+        user = User()
+        models.storage.reset_stats()
+        user.first_name = "Betty"
+        models.storage.save()
+        stats = models.storage.stats()
+        self.assertEqual(1, stats["operations"]["append_journal"]["count"])
+        path = FileStorage._FileStorage__file_path + ".journal"
+        self.assertEqual(os.path.getsize(path), stats["bytes"]["written"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+#!/usr/bin/python3
+"""Defines unittests for models/engine/query.py.
+
+Unittest classes:
+    TestQuery
+"""
+import os
+import models
+import unittest
+from models.city import City
+from models.engine import columnar
+from models.engine.columnar import ColumnStore
+from models.engine.query import Query
+from models.place import Place
+from test_models.test_engine import StorageTestCase
+
+
+class TestQuery(StorageTestCase):
+    """Unittests for testing the query language and its planner."""
+
+    def setUp(self):
+        super().setUp()
+        self.cities = [City(), City()]
+        self.places = []
+        for i in range(20):
+            place = Place()
+            place.city_id = self.cities[i % 2].id
+            place.price_by_night = i * 10
+            place.name = f"place {i:02}"
+            self.places.append(place)
+
+    def query(self, text):
+        return Query.parse(models.storage, "Place", text)
+
+    def test_parse(self):
+        query = self.query('price_by_night < 100, name in ["a", "b"], '
+                           'order_by="-name", limit=3')
+        self.assertEqual([("price_by_night", "<", 100),
+                          ("name", "in", ["a", "b"])], query.conditions)
+        self.assertEqual("-name", query.order_by)
+        self.assertEqual(3, query.limit)
+
+    def test_parse_errors(self):
+        for text in ("price_by_night <", "price_by_night", "1 < 2",
+                     "0 < price_by_night < 5", "name == len('a')",
+                     "colour='red'", "limit=-1", "limit='a'", "order_by=1",
+                     "__import__('os')", "name is None",
+                     "name is not None", "name == {[1]}",
+                     "limit={[1]}"):
+            with self.assertRaises(ValueError):
+                self.query(text)
+
+    def test_run(self):
+        objs = self.query(f'price_by_night < 100, city_id == '
+                          f'"{self.cities[0].id}"').run()
+        self.assertEqual(self.places[0:10:2], objs)
+
+    def test_order_and_limit(self):
+        objs = self.query('price_by_night >= 50, order_by="-price_by_night",'
+                          ' limit=3').run()
+        self.assertEqual(self.places[:-4:-1], objs)
+        self.assertEqual(self.places[:2], self.query("limit=2").run())
+        self.assertEqual([], self.query("limit=0").run())
+
+    def test_incompatible_types(self):
+        self.places[0].price_by_night = "free"
+        objs = self.query("price_by_night < 20").run()
+        self.assertEqual([self.places[1]], objs)
+        objs = self.query('order_by="price_by_night"').run()
+        self.assertEqual(self.places[0], objs[-1])
+
+    def test_plans(self):
+        self.assertEqual("class scan", self.query("").explain()["plan"])
+        plan = self.query(f'city_id == "{self.cities[1].id}"').explain()
+        self.assertEqual(f"foreign key index Place.city_id == "
+                         f"'{self.cities[1].id}'", plan["plan"])
+        self.assertEqual(10, plan["cost"])
+        self.assertEqual([("class scan", 20)], plan["alternatives"])
+        plan = self.query(f'id == "{self.places[3].id}"').explain()
+        self.assertEqual(1, plan["cost"])
+        self.assertEqual([self.places[3]],
+                         self.query(f'id == "{self.places[3].id}"').run())
+        self.assertEqual([], self.query('id == "missing"').run())
+
+    @unittest.skipUnless(columnar.numpy, "numpy is not installed")
+    def test_column_plan(self):
+        columns = ColumnStore(models.storage)
+        models.storage.add_index(columns)
+        try:
+            query = self.query("price_by_night > 150, price_by_night <= 180")
+            plan = query.explain()
+            self.assertEqual("column store price_by_night in [150, 180]",
+                             plan["plan"])
+            self.assertEqual(4, plan["cost"])
+            self.assertEqual(self.places[16:19], sorted(
+                query.run(), key=lambda place: place.price_by_night))
+        finally:
+            models.storage.remove_index(columns)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+#!/usr/bin/python3
+"""Defines unittests for models/engine/relations.py.
+
+Unittest classes:
+    TestRelations
+"""
+import models
+import unittest
+from models.city import City
+from models.engine.file_storage import FileStorage
+from models.place import Place
+from models.review import Review
+from models.state import State
+from models.user import User
+from test_models.test_engine import StorageTestCase
+
+
+class TestRelations(StorageTestCase):
+    """Unittests for testing the reverse indexes of the foreign keys."""
+
+    def setUp(self):
+        super().setUp()
+        self.state = State()
+        self.cities = [City(), City()]
+        for city in self.cities:
+            city.state_id = self.state.id
+        self.user = User()
+        self.place = Place()
+        self.place.city_id = self.cities[0].id
+        self.place.user_id = self.user.id
+        self.review = Review()
+        self.review.place_id = self.place.id
+        self.review.user_id = self.user.id
+
+    def test_accessors(self):
+        self.assertEqual(self.cities, self.state.cities)
+        self.assertEqual([self.place], self.cities[0].places)
+        self.assertEqual([], self.cities[1].places)
+        self.assertEqual([self.place], self.user.places)
+        self.assertEqual([self.review], self.user.reviews)
+        self.assertEqual([self.review], self.place.reviews)
+
+    def test_read_only(self):
+        with self.assertRaises(AttributeError):
+            self.state.cities = []
+        self.assertNotIn("cities", self.state.to_dict())
+
+    def test_update(self):
+        self.assertEqual(2, len(self.state.cities))
+        other = State()
+        self.cities[1].state_id = other.id
+        self.assertEqual([self.cities[0]], self.state.cities)
+        self.assertEqual([self.cities[1]], other.cities)
+
+    def test_destroy(self):
+        self.assertEqual([self.review], self.place.reviews)
+        models.storage.delete(self.review)
+        self.assertEqual([], self.place.reviews)
+        self.assertEqual([], self.user.reviews)
+
+    def test_reload(self):
+        models.storage.save()
+        FileStorage._FileStorage__objects = {}
+        models.storage.reload()
+        state = models.storage.get(State, self.state.id)
+        self.assertEqual(sorted(c.id for c in self.cities),
+                         sorted(c.id for c in state.cities))
+        review = models.storage.get(Review, self.review.id)
+        self.assertEqual([review], models.storage.get(
+            Place, self.place.id).reviews)
+
+    def test_lazy_and_compact_reload(self):
+        models.storage.save()
+        models.storage.configure(lazy=True, compact=True)
+        FileStorage._FileStorage__objects = {}
+        models.storage.reload()
+        state = models.storage.get(State, self.state.id)
+        self.assertNotIsInstance(state, State)
+        self.assertEqual(sorted(c.id for c in self.cities),
+                         sorted(c.id for c in state.cities))
+
+    def test_related(self):
+        self.assertEqual([self.place], models.storage.related(
+            "Place", "user_id", self.user.id))
+        self.assertEqual([], models.storage.related(
+            Place, "name", self.user.id))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+#!/usr/bin/python3
+"""Defines unittests for models/engine/serializer.py.
+
+Unittest classes:
+    TestSerializer
+    TestWriteRecords
+"""
+import io
+import json
+import unittest
+from models.compact import compact_classes
+from models.engine.file_storage import FileStorage
+from models.engine.serializer import Serializer, compile_serializers
+from models.engine.serializer import write_records
+from models.place import Place
+from models.user import User
+
+
+class TestSerializer(unittest.TestCase):
+    """Unittests for testing the per-class serializers."""
+
+    def setUp(self):
+        FileStorage._FileStorage__objects = {}
+        self.storage = FileStorage()
+        self.serializers = compile_serializers(self.storage.attributes())
+
+    def tearDown(self):
+        FileStorage._FileStorage__objects = {}
+
+    def assertEncodes(self, obj):
+        text = self.serializers[type(obj).__name__].encode(obj)
+        self.assertEqual(json.dumps(obj.to_dict()), text)
+
+    def test_model(self):
+        place = Place()
+        place.name = "Chez \"Bé\"\n"
+        place.number_rooms = 3
+        place.latitude = 37.5
+        place.amenity_ids = ["a", "b"]
+        self.assertEncodes(place)
+        self.assertEncodes(User())
+
+    def test_unexpected_types(self):
+        place = Place()
+        place.number_rooms = "3"
+        place.max_guest = True
+        place.name = None
+        place.latitude = 2
+        place.longitude = float("nan")
+        place.price_by_night = 1.5
+        self.assertEncodes(place)
+
+    def test_extra_attributes(self):
+        user = User()
+        user.nickname = "bb"
+        user.scores = {"a": [1, 2.5]}
+        self.assertEncodes(user)
+
+    def test_sparse(self):
+        obj = Place.__new__(Place)
+        serializer = self.serializers["Place"]
+        self.assertEqual('{"__class__": "Place"}', serializer.encode(obj))
+        obj.__dict__["id"] = "1"
+        obj.__dict__["__class__"] = "Place"
+        self.assertEqual('{"id": "1", "__class__": "Place"}',
+                         serializer.encode(obj))
+
+    def test_compact(self):
+        compact = compact_classes(self.storage.classes(),
+                                  self.storage.attributes())
+        place = Place()
+        place.name = "Loft"
+        place.price_by_night = 120
+        record = place.to_dict()
+        del record["__class__"]
+        obj = compact["Place"](**record)
+        self.assertEqual(json.dumps(obj.to_dict()),
+                         self.serializers["Place"].encode(obj))
+
+
+class TestWriteRecords(unittest.TestCase):
+    """Unittests for testing the streaming JSON writer."""
+
+    def test_write(self):
+        records = {f"User.{i}": {"id": str(i)} for i in range(25)}
+        for batch in (1, 2, 1000):
+            file = io.StringIO()
+            count = write_records(file, ((key, json.dumps(o))
+                                         for key, o in records.items()),
+                                  batch)
+            self.assertEqual(25, count)
+            self.assertEqual(json.dumps(records), file.getvalue())
+
+    def test_empty(self):
+        file = io.StringIO()
+        self.assertEqual(0, write_records(file, []))
+        self.assertEqual("{}", file.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+#!/usr/bin/python3
+"""Defines unittests for models/engine/text.py.
+
+Unittest classes:
+    TestTextIndex
+"""
+import os
+import models
+import unittest
+from models.engine.file_storage import FileStorage
+from models.engine.text import TextIndex, tokenize
+from models.place import Place
+from models.review import Review
+from test_models.test_engine import StorageTestCase
+
+
+class TestTextIndex(StorageTestCase):
+    """Unittests for testing the full-text index."""
+
+    def setUp(self):
+        super().setUp()
+        self.reviews = []
+        for text in ("Quiet and clean room", "Clean, clean, clean!",
+                     "Noisy street but a clean kitchen", "Lovely host"):
+            review = Review()
+            review.text = text
+            self.reviews.append(review)
+        self.place = Place()
+        self.place.name = "Quiet loft"
+        self.place.description = "Clean and bright"
+        self.index = models.storage.index(TextIndex)
+
+    def tearDown(self):
+        models.storage.remove_index(self.index)
+        super().tearDown()
+
+    def test_tokenize(self):
+        self.assertEqual(["quiet", "clean", "café"],
+                         tokenize("Quiet, CLEAN café!"))
+        self.assertEqual([], tokenize(None))
+
+    def test_ranking(self):
+        found = self.index.search("Review", "quiet clean")
+        self.assertEqual(self.reviews[0], found[0])
+        self.assertEqual(3, len(found))
+        self.assertNotIn(self.reviews[3], found)
+        self.assertEqual(self.reviews[1],
+                         self.index.search("Review", "clean")[0])
+        self.assertEqual([self.place], self.index.search("Place", "quiet"))
+        self.assertEqual([], self.index.search("Review", "pool"))
+        self.assertEqual(1, len(self.index.search("Review", "clean", 1)))
+
+    def test_follows_changes(self):
+        self.assertEqual([], self.index.search("Review", "pool"))
+        self.reviews[3].text = "Lovely pool"
+        models.storage.delete(self.reviews[0])
+        self.assertEqual([self.reviews[3]],
+                         self.index.search("Review", "pool"))
+        self.assertNotIn(self.reviews[0],
+                         self.index.search("Review", "quiet"))
+
+    def test_persisted_next_to_file(self):
+        models.storage.save()
+        models.storage.flush()
+        path = models.storage.index_path("text")
+        self.assertTrue(os.path.exists(path))
+        FileStorage._FileStorage__objects = {}
+        models.storage.reload()
+        index = TextIndex(models.storage)
+        self.assertTrue(index.load())
+        self.assertEqual(self.index.docs, index.docs)
+        review = models.storage.get(Review, self.reviews[0].id)
+        self.assertEqual([review], self.index.search("Review", "quiet"))
+
+    def test_not_loaded_when_stale(self):
+        models.storage.save()
+        models.storage.flush()
+        self.reviews[3].text = "Lovely pool"
+        models.storage.save()
+        index = TextIndex(models.storage)
+        self.assertFalse(index.load())
+        self.reviews[2].text = "pool"
+        self.assertFalse(index.load())
+        models.storage.add_index(index)
+        self.assertEqual(2, len(index.search("Review", "pool")))
+        models.storage.remove_index(index)
+
+
+if __name__ == "__main__":
+    unittest.main()
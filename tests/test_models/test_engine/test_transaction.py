@@ -0,0 +1,120 @@
+#!/usr/bin/python3
+"""Defines unittests for the transactions of FileStorage.
+
+Unittest classes:
+    TestTransaction
+"""
+import models
+import unittest
+from models.engine.file_storage import FileStorage
+from models.city import City
+from models.place import Place
+from models.state import State
+from models.user import User
+from test_models.test_engine import StorageTestCase
+
+
+class TestTransaction(StorageTestCase):
+    """Unittests for testing begin, commit and rollback."""
+
+    def setUp(self):
+        super().setUp()
+        self.user = User()
+        self.user.first_name = "Betty"
+        self.place = Place()
+        self.place.amenity_ids = ["a"]
+        models.storage.save()
+
+    def saved(self):
+        with open(self.path) as f:
+            return f.read()
+
+    def test_commit_saves_once(self):
+        before = self.saved()
+        with models.storage.transaction():
+            state = State()
+            state.name = "CA"
+            models.storage.save()
+            self.user.first_name = "Ada"
+            models.storage.save()
+            models.storage.delete(self.place)
+            models.storage.save()
+            self.assertEqual(before, self.saved())
+        self.assertFalse(models.storage.in_transaction())
+        text = self.saved()
+        self.assertIn(state.id, text)
+        self.assertIn("Ada", text)
+        self.assertNotIn(self.place.id, text)
+        self.assertEqual(0, models.storage.dirty_count())
+
+    def test_rollback(self):
+        models.storage.begin()
+        state = State()
+        self.user.first_name = "Ada"
+        self.user.last_name = "Lovelace"
+        self.place.name = "Loft"
+        self.place.amenity_ids.append("b")
+        models.storage.delete(self.place)
+        models.storage.rollback()
+        self.assertIsNone(models.storage.get("State", state.id))
+        self.assertEqual("Betty", self.user.first_name)
+        self.assertNotIn("last_name", self.user.__dict__)
+        self.assertIs(self.place, models.storage.get("Place", self.place.id))
+        self.assertEqual(["a"], self.place.amenity_ids)
+        self.assertEqual(2, models.storage.count())
+        self.assertEqual(0, models.storage.dirty_count())
+
+    def test_rollback_keeps_earlier_changes(self):
+        self.user.first_name = "Ada"
+        models.storage.begin()
+        self.user.first_name = "Grace"
+        models.storage.rollback()
+        self.assertEqual("Ada", self.user.first_name)
+        self.assertEqual(1, models.storage.dirty_count())
+
+    def test_rollback_on_error(self):
+        with self.assertRaises(KeyError):
+            with models.storage.transaction():
+                self.user.first_name = "Ada"
+                raise KeyError("x")
+        self.assertEqual("Betty", self.user.first_name)
+        self.assertFalse(models.storage.in_transaction())
+
+    def test_rollback_updates_indexes(self):
+        state = State()
+        city = City()
+        city.state_id = state.id
+        self.assertEqual([city], state.cities)
+        models.storage.begin()
+        city.state_id = "other"
+        models.storage.delete(state)
+        self.assertEqual([], state.cities)
+        models.storage.rollback()
+        self.assertEqual([city], state.cities)
+        self.assertIs(state, models.storage.get("State", state.id))
+
+    def test_compact(self):
+        models.storage.configure(compact=True)
+        FileStorage._FileStorage__objects = {}
+        models.storage.reload()
+        user = models.storage.get("User", self.user.id)
+        self.assertIsNot(User, type(user))
+        models.storage.begin()
+        user.first_name = "Ada"
+        user.nickname = "ada"
+        models.storage.rollback()
+        self.assertEqual("Betty", user.first_name)
+        self.assertNotIn("nickname", user.__dict__)
+
+    def test_errors(self):
+        with self.assertRaises(RuntimeError):
+            models.storage.commit()
+        with self.assertRaises(RuntimeError):
+            models.storage.rollback()
+        models.storage.begin()
+        with self.assertRaises(RuntimeError):
+            models.storage.begin()
+
+
+if __name__ == "__main__":
+    unittest.main()